@@ -0,0 +1,98 @@
+"""
+Benchmark generation throughput and memory of the inference backends.
+
+Usage (with the package installed, e.g. ``pip install -e .``):
+    python scripts/benchmark_backends.py --model gpt2 --backends fp32 bf16 int8
+    python scripts/benchmark_backends.py --tiny   # random small model, no download
+"""
+
+import argparse
+import gc
+import io
+import resource
+import tempfile
+import time
+
+import torch
+from transformers import AutoModelForCausalLM, GPT2Config, GPT2LMHeadModel
+
+from skyrun.agents.backends import load_model, resolve_backend
+
+def model_megabytes(model: torch.nn.Module) -> float:
+    """Size of a model's serialized state, including packed int8 weights."""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 1024 / 1024
+
+def rss_megabytes() -> float:
+    """Current resident memory of this process."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 1024 / 1024
+    except OSError:
+        # Peak rather than current usage where /proc isn't available
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def benchmark(model_name: str, backend: str, device: str, args: argparse.Namespace) -> dict:
+    """Load one backend and time greedy generation with it."""
+    gc.collect()
+    rss_before = rss_megabytes()
+    model = load_model(AutoModelForCausalLM, model_name, backend, device)
+    rss_after = rss_megabytes()
+
+    model_device = getattr(model, "device", torch.device(device))
+    input_ids = torch.randint(0, model.config.vocab_size, (args.batch_size, args.prompt_tokens))
+    input_ids = input_ids.to(model_device)
+    generate_kwargs = dict(
+        max_new_tokens=args.new_tokens,
+        min_new_tokens=args.new_tokens,
+        do_sample=False,
+        pad_token_id=0
+    )
+
+    model.generate(input_ids, **generate_kwargs)  # warmup
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        model.generate(input_ids, **generate_kwargs)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "backend": backend,
+        "device": device,
+        "tokens_per_sec": args.repeats * args.batch_size * args.new_tokens / elapsed,
+        "model_mb": model_megabytes(model) if isinstance(model, torch.nn.Module) else float("nan"),
+        "rss_delta_mb": rss_after - rss_before
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="gpt2", help="Model name or path")
+    parser.add_argument("--tiny", action="store_true", help="Benchmark a small random GPT-2 instead")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--backends", nargs="+", default=["fp32", "bf16", "int8"])
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--prompt-tokens", type=int, default=32)
+    parser.add_argument("--new-tokens", type=int, default=64)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=0, help="Torch intra-op threads, 0 keeps the default")
+    args = parser.parse_args()
+
+    if args.threads > 0:
+        torch.set_num_threads(args.threads)
+
+    model_name = args.model
+    if args.tiny:
+        model_name = tempfile.mkdtemp(prefix="skyrun-bench-")
+        GPT2LMHeadModel(GPT2Config(n_layer=4, n_head=4, n_embd=256)).save_pretrained(model_name)
+
+    print(f"{'backend':<12} {'device':<8} {'tokens/s':>10} {'model MB':>10} {'RSS +MB':>10}")
+    for backend in args.backends:
+        backend, device = resolve_backend({"backend": backend, "device": args.device})
+        result = benchmark(model_name, backend, device, args)
+        print(
+            f"{result['backend']:<12} {result['device']:<8} {result['tokens_per_sec']:>10.1f} "
+            f"{result['model_mb']:>10.1f} {result['rss_delta_mb']:>10.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
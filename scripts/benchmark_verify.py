@@ -0,0 +1,65 @@
+"""
+Benchmark bulk signature verification against the number of worker processes.
+
+Usage (with the package installed, e.g. ``pip install -e .``):
+    python scripts/benchmark_verify.py --signatures 20000 --workers 1 2 4 8
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from eth_account import Account
+
+from skyrun.blockchain.signer import sign_message
+from skyrun.blockchain.verifier import SignatureVerifier, recover_address
+
+def make_items(count: int) -> list:
+    """Sign distinct messages with a few accounts."""
+    accounts = [Account.create() for _ in range(4)]
+    items = []
+    for i in range(count):
+        account = accounts[i % len(accounts)]
+        message = f"skyrun creator auth {i}"
+        items.append((message, sign_message(message, account.key), account.address))
+    return items
+
+async def benchmark(items: list, kind: str, workers: int, chunk_size: int) -> float:
+    """Verify all items once with a fresh verifier, returning signatures per second."""
+    verifier = SignatureVerifier(kind=kind, workers=workers, chunk_size=chunk_size, cache_size=0)
+    try:
+        # Start the workers outside the timed run
+        await verifier.verify_batch(items[:workers])
+        start = time.perf_counter()
+        results = await verifier.verify_batch(items)
+        elapsed = time.perf_counter() - start
+    finally:
+        await verifier.close()
+    assert all(result["success"] and result["result"] for result in results)
+    return len(items) / elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signatures", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--kind", default="process", choices=SignatureVerifier.KINDS)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    args = parser.parse_args()
+
+    items = make_items(args.signatures)
+
+    sample = items[:min(len(items), 500)]
+    start = time.perf_counter()
+    for message, signature, _ in sample:
+        recover_address(message, signature)
+    baseline = len(sample) / (time.perf_counter() - start)
+
+    print(f"{'workers':<10} {'sigs/s':>10} {'speedup':>10}")
+    print(f"{'inline':<10} {baseline:>10.1f} {1.0:>10.2f}")
+    for workers in args.workers:
+        rate = asyncio.run(benchmark(items, args.kind, workers, args.chunk_size))
+        print(f"{workers:<10} {rate:>10.1f} {rate / baseline:>10.2f}")
+
+if __name__ == "__main__":
+    main()
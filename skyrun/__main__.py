@@ -8,16 +8,13 @@ from typing import Optional
 
 from .api import APIServer
 from .config import config
+from .core.logging import setup_default_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 async def main() -> None:
     """Main entry point."""
+    setup_default_logging()
     try:
         # Initialize and start API server
         server = APIServer(
@@ -2,9 +2,26 @@
 Multi-agent system for creative content generation and collaboration.
 """
 
-from .base import BaseAgent
-from .creative import CreativeAgent
-from .reviewer import ReviewerAgent
-from .coordinator import CoordinatorAgent
+import importlib
+from typing import Any
 
-__all__ = ['BaseAgent', 'CreativeAgent', 'ReviewerAgent', 'CoordinatorAgent'] 
\ No newline at end of file
+# Agents are imported on first access, so importing the package doesn't load torch
+_LAZY_ATTRS = {
+    'BaseAgent': '.base',
+    'CreativeAgent': '.creative',
+    'ReviewerAgent': '.reviewer',
+    'CoordinatorAgent': '.coordinator',
+    'AgentRegistry': '.registry',
+}
+
+__all__ = ['BaseAgent', 'CreativeAgent', 'ReviewerAgent', 'CoordinatorAgent', 'AgentRegistry']
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,199 @@
+"""
+Inference backends selecting how agent models are loaded and executed.
+"""
+
+from typing import Any, Dict, Sequence, Tuple
+import importlib
+import warnings
+
+import torch
+from transformers.modeling_outputs import SequenceClassifierOutput
+from transformers.pytorch_utils import Conv1D
+
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+BACKENDS = ("fp16", "fp32", "bf16", "int8", "torchscript", "onnx")
+
+_DTYPES = {
+    "fp16": torch.float16,
+    "fp32": torch.float32,
+    "bf16": torch.bfloat16,
+    "int8": torch.float32,
+    "torchscript": torch.float32
+}
+
+# optimum.onnxruntime counterparts of the transformers auto classes
+_ONNX_CLASSES = {
+    "AutoModelForCausalLM": "ORTModelForCausalLM",
+    "AutoModelForSequenceClassification": "ORTModelForSequenceClassification"
+}
+
+def resolve_backend(
+    config: Dict[str, Any],
+    supported: Sequence[str] = BACKENDS
+) -> Tuple[str, str]:
+    """Get the backend and device configured for an agent.
+
+    ``device`` defaults to ``auto``, which picks CUDA when available. The
+    ``auto`` backend, also the default, is ``fp16`` on GPUs and ``fp32`` on
+    CPUs.
+
+    Args:
+        config: Agent configuration with optional ``device`` and ``backend``
+        supported: Backends the agent can run
+
+    Returns:
+        Tuple of backend and device
+
+    Raises:
+        ValueError: If the backend is unknown, unsupported by the agent or
+            unavailable on the device
+    """
+    device = config.get("device") or "auto"
+    if device == "auto":
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+
+    backend = config.get("backend") or "auto"
+    if backend == "auto":
+        backend = "fp32" if device == "cpu" else "fp16"
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {backend}")
+    if backend not in supported:
+        raise ValueError(f"Backend {backend} is not supported here, use one of {', '.join(supported)}")
+    if backend == "int8" and device != "cpu":
+        raise ValueError("Dynamic int8 quantization only runs on the cpu device")
+    if backend == "fp16" and device == "cpu":
+        logger.warning("fp16 inference on cpu is slow; consider the fp32, bf16 or int8 backend")
+    return backend, device
+
+def load_model(
+    model_class: Any,
+    model_name: str,
+    backend: str,
+    device: str,
+    **kwargs: Any
+) -> Any:
+    """Load a pretrained model for a backend.
+
+    ``torchscript`` models are loaded as fp32 here and traced afterwards with
+    ``trace_classifier``, once example inputs are available.
+
+    Args:
+        model_class: Transformers auto class, e.g. ``AutoModelForCausalLM``
+        model_name: Model name or path
+        backend: Backend returned by ``resolve_backend``
+        device: Device returned by ``resolve_backend``
+        **kwargs: Extra ``from_pretrained`` arguments
+
+    Returns:
+        Model in evaluation mode
+    """
+    if backend == "onnx":
+        return _load_onnx(model_class, model_name, device, **kwargs)
+
+    load_kwargs: Dict[str, Any] = {"torch_dtype": _DTYPES[backend]}
+    if device != "cpu":
+        load_kwargs["device_map"] = "auto" if device == "cuda" else device
+    model = model_class.from_pretrained(model_name, **load_kwargs, **kwargs)
+    model.eval()
+
+    if backend == "int8":
+        model = quantize_int8(model)
+    logger.info(f"Loaded {model_name} with the {backend} backend on {device}")
+    return model
+
+def quantize_int8(model: torch.nn.Module) -> torch.nn.Module:
+    """Apply dynamic int8 quantization to the linear layers of a model.
+
+    GPT-2 style ``Conv1D`` layers are converted to equivalent ``Linear``
+    layers first so they are quantized too.
+
+    Args:
+        model: fp32 model on the cpu
+
+    Returns:
+        The quantized model
+    """
+    _conv1d_to_linear(model)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        warnings.simplefilter("ignore", UserWarning)
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def _conv1d_to_linear(module: torch.nn.Module) -> None:
+    """Replace ``Conv1D`` children with ``Linear`` layers, in place."""
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            linear = torch.nn.Linear(child.weight.shape[0], child.weight.shape[1])
+            linear.weight = torch.nn.Parameter(child.weight.data.t().contiguous())
+            linear.bias = child.bias
+            setattr(module, name, linear)
+        else:
+            _conv1d_to_linear(child)
+
+class TracedClassifier(torch.nn.Module):
+    """TorchScript graph of a sequence classifier with the eager call interface."""
+
+    def __init__(self, traced: torch.jit.ScriptModule, input_names: Sequence[str], device: torch.device):
+        """Initialize the wrapper.
+
+        Args:
+            traced: Traced model returning a tuple with the logits first
+            input_names: Keyword inputs the graph was traced with, in order
+            device: Device of the traced weights
+        """
+        super().__init__()
+        self.traced = traced
+        self.input_names = list(input_names)
+        self._device = device
+
+    @property
+    def device(self) -> torch.device:
+        """Device of the traced weights."""
+        return self._device
+
+    def forward(self, **inputs: torch.Tensor) -> SequenceClassifierOutput:
+        logits = self.traced(**{name: inputs[name] for name in self.input_names})[0]
+        return SequenceClassifierOutput(logits=logits)
+
+def trace_classifier(model: torch.nn.Module, example_inputs: Dict[str, torch.Tensor]) -> TracedClassifier:
+    """Trace a sequence classifier into a TorchScript graph.
+
+    The example should contain padding, so that masking is part of the graph.
+
+    Args:
+        model: Eager model in evaluation mode
+        example_inputs: Tokenized example batch
+
+    Returns:
+        Traced classifier
+    """
+    input_names = list(example_inputs.keys())
+    return_dict = model.config.return_dict
+    model.config.return_dict = False
+    try:
+        with torch.no_grad(), warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            traced = torch.jit.trace(model, example_kwarg_inputs=dict(example_inputs), strict=False)
+    finally:
+        model.config.return_dict = return_dict
+    return TracedClassifier(traced, input_names, model.device)
+
+def _load_onnx(model_class: Any, model_name: str, device: str, **kwargs: Any) -> Any:
+    """Export and load a model with ONNX Runtime through ``optimum``."""
+    try:
+        onnxruntime = importlib.import_module("optimum.onnxruntime")
+    except ImportError as e:
+        raise ImportError(
+            "The onnx backend needs optimum with ONNX Runtime: pip install optimum[onnxruntime]"
+        ) from e
+
+    ort_class = getattr(onnxruntime, _ONNX_CLASSES[model_class.__name__])
+    provider = "CPUExecutionProvider" if device == "cpu" else "CUDAExecutionProvider"
+    # ONNX export doesn't take the head-resizing arguments of from_pretrained
+    kwargs.pop("ignore_mismatched_sizes", None)
+    model = ort_class.from_pretrained(model_name, export=True, provider=provider, **kwargs)
+    logger.info(f"Loaded {model_name} with the onnx backend on {device}")
+    return model
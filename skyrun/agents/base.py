@@ -2,8 +2,10 @@
 Base agent implementation for SkyRun.
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
+import asyncio
 
+from .executor import InferenceExecutor
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -21,12 +23,16 @@ class BaseAgent(ABC):
         self.name = name
         self.config = config or {}
         self.logger = get_logger(f"agent.{name}")
-        self.initialize()
+        self.executor: Optional[InferenceExecutor] = None
     
-    def initialize(self) -> None:
-        """Initialize agent resources."""
+    async def initialize(self) -> None:
+        """Initialize agent resources.
+        
+        Models are loaded on a worker thread, so several agents can load
+        concurrently without blocking the event loop.
+        """
         self.logger.info(f"Initializing agent: {self.name}")
-        self._load_models()
+        await asyncio.get_running_loop().run_in_executor(None, self._load_models)
         self._setup_resources()
     
     @abstractmethod
@@ -51,6 +57,27 @@ class BaseAgent(ABC):
         """
         pass
     
+    async def run_in_executor(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run blocking model work on the agent's inference executor.
+        
+        The executor is configured by the ``executor`` config section and
+        created on first use.
+        
+        Args:
+            fn: Blocking callable to run
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+        
+        Returns:
+            Return value of the callable
+        """
+        if self.executor is None:
+            executor_config = self.config.get("executor", {})
+            if executor_config.get("kind", "thread") != "thread":
+                raise ValueError("Agent models live in this process; use a thread executor")
+            self.executor = InferenceExecutor.from_config(executor_config, name=self.name)
+        return await self.executor.run(fn, *args, **kwargs)
+    
     async def validate_input(self, input_data: Dict[str, Any]) -> bool:
         """Validate input data.
         
@@ -62,9 +89,12 @@ class BaseAgent(ABC):
         """
         return True
     
-    def cleanup(self) -> None:
+    async def cleanup(self) -> None:
         """Cleanup agent resources."""
         self.logger.info(f"Cleaning up agent: {self.name}")
+        if self.executor is not None:
+            await self.executor.close()
+            self.executor = None
     
     async def __aenter__(self):
         """Async context manager entry."""
@@ -72,4 +102,4 @@ class BaseAgent(ABC):
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        self.cleanup() 
\ No newline at end of file
+        await self.cleanup() 
\ No newline at end of file
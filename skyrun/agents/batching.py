@@ -0,0 +1,119 @@
+"""
+Dynamic micro-batching for model requests.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Set, Tuple
+import asyncio
+
+from ..core.logging import get_logger
+from ..core.metrics import BATCH_SIZE, track_queue
+
+logger = get_logger(__name__)
+
+# Runs one batch: (items, **params) -> one result per item, in order
+BatchFn = Callable[..., Awaitable[List[Any]]]
+
+class MicroBatcher:
+    """Collects concurrent requests and runs them as a single batch.
+
+    Requests are grouped by their generation parameters, so only requests
+    that can share one model call are batched together. A group is
+    flushed when it reaches ``max_batch_size`` or when the oldest request in
+    it has waited ``max_wait_ms``, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        batch_fn: BatchFn,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        name: str = "batcher"
+    ):
+        """Initialize the batcher.
+
+        Args:
+            batch_fn: Coroutine function running one batch of items
+            max_batch_size: Maximum number of requests per batch
+            max_wait_ms: Maximum time a request waits for others to join
+            name: Batcher name, used to label its metrics
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._pending: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._batch_size = BATCH_SIZE.labels(name)
+        track_queue(f"batcher_{name}", lambda: self.queue_depth)
+
+    async def submit(self, item: Any, **params: Any) -> Any:
+        """Submit one item and wait for its result.
+
+        Args:
+            item: Item to process, e.g. a prompt
+            **params: Model call parameters; requests with equal parameters
+                are batched together
+
+        Returns:
+            Result for this item
+        """
+        loop = asyncio.get_running_loop()
+        key = tuple(sorted(params.items()))
+        future = loop.create_future()
+
+        group = self._pending.setdefault(key, [])
+        group.append((item, future))
+
+        if len(group) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+
+        return await future
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting to be batched."""
+        return sum(len(group) for group in self._pending.values())
+
+    def _flush(self, key: Hashable) -> None:
+        """Start a batch for all pending requests of a parameter group."""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        group = self._pending.pop(key, None)
+        if not group:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._run(dict(key), group))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, params: Dict[str, Any], group: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Run one batch and resolve each caller's future."""
+        # Callers that gave up while waiting don't need a slot in the batch
+        group = [(item, future) for item, future in group if not future.done()]
+        if not group:
+            return
+
+        self._batch_size.set(len(group))
+        try:
+            results = await self.batch_fn([item for item, _ in group], **params)
+        except Exception as e:
+            logger.error(f"Batch of {len(group)} requests failed: {str(e)}")
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(group, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Flush pending requests and wait for running batches."""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,184 @@
+"""
+Content-addressed cache for review results.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+class ReviewCache:
+    """Two-tier LRU/TTL cache for reviewer scores.
+
+    The memory tier holds at most ``max_entries`` results and evicts the least
+    recently used one. The optional disk tier is a SQLite file that survives
+    restarts and is shared by every process pointing at the same path. Both
+    tiers drop entries older than ``ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl: float = 3600,
+        disk_path: Optional[Union[str, Path]] = None
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of results kept in memory
+            ttl: Time to live of an entry in seconds
+            disk_path: Optional SQLite file for the on-disk tier
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = float(ttl)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if disk_path is not None:
+            self._open_disk(Path(disk_path))
+
+    @staticmethod
+    def make_key(content: str, model_name: str, aspects: Iterable[str]) -> str:
+        """Build the cache key for a review.
+
+        Args:
+            content: Reviewed content
+            model_name: Name of the reviewer model
+            aspects: Aspects scored by the model
+
+        Returns:
+            Hex digest identifying the review
+        """
+        payload = json.dumps([model_name, sorted(aspects), content], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached result.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached result, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+            del self._entries[key]
+
+        if self._db is not None:
+            loop = asyncio.get_running_loop()
+            row = await loop.run_in_executor(None, self._disk_get, key)
+            if row is not None:
+                expires_at, value = row
+                self._remember(key, value, expires_at)
+                self._disk_hits += 1
+                return value
+
+        self._misses += 1
+        return None
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a result.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable result
+        """
+        expires_at = time.time() + self.ttl
+        self._remember(key, value, expires_at)
+
+        if self._db is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._disk_set, key, value, expires_at)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters.
+
+        Returns:
+            Dictionary of cache statistics
+        """
+        lookups = self._hits + self._disk_hits + self._misses
+        return {
+            "hits": self._hits,
+            "disk_hits": self._disk_hits,
+            "misses": self._misses,
+            "hit_rate": (self._hits + self._disk_hits) / lookups if lookups else 0.0,
+            "evictions": self._evictions,
+            "size": len(self._entries),
+            "max_entries": self.max_entries
+        }
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        self._entries.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM review_cache")
+                self._db.commit()
+
+    def close(self) -> None:
+        """Close the on-disk tier."""
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+
+    def _remember(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        """Insert into the memory tier, evicting the least recently used entry."""
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _open_disk(self, path: Path) -> None:
+        """Open the SQLite file and drop expired rows."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        with self._db_lock:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS review_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM review_cache WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+        logger.info(f"Review cache disk tier at {path}")
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Read an unexpired row; blocking."""
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM review_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        return row[1], json.loads(row[0])
+
+    def _disk_set(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        """Write a row; blocking."""
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO review_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at)
+            )
+            self._db.commit()
@@ -2,44 +2,79 @@
 Coordinator agent implementation for managing multi-agent collaboration.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
 import asyncio
+from collections import deque
 from datetime import datetime
 
 from .base import BaseAgent
-from .creative import CreativeAgent
-from .reviewer import ReviewerAgent
+from ..core.metrics import timed
+
+if TYPE_CHECKING:
+    from .creative import CreativeAgent
+    from .reviewer import ReviewerAgent
 
 class CoordinatorAgent(BaseAgent):
     """Agent responsible for coordinating the creative and review process."""
     
-    def __init__(self, agent_id: str, config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        agent_id: str,
+        config: Optional[Dict[str, Any]] = None,
+        creative_agent: Optional["CreativeAgent"] = None,
+        reviewer_agent: Optional["ReviewerAgent"] = None
+    ):
         """Initialize the coordinator agent.
         
         Args:
             agent_id: Unique identifier for the agent
             config: Optional configuration dictionary
+            creative_agent: Optional shared, already initialized creative agent
+            reviewer_agent: Optional shared, already initialized reviewer agent
         """
         super().__init__(agent_id, config)
-        self.creative_agent = None
-        self.reviewer_agent = None
-        self.workflow_history: List[Dict[str, Any]] = []
+        self.creative_agent = creative_agent
+        self.reviewer_agent = reviewer_agent
+        # Agents passed in are owned (initialized and cleaned up) by the caller
+        self._owns_creative = creative_agent is None
+        self._owns_reviewer = reviewer_agent is None
+        self.workflow_history: Deque[Dict[str, Any]] = deque(
+            maxlen=self.config.get("history_size", 1000)
+        )
+        
+    def _load_models(self) -> None:
+        """Create the creative and reviewer agents that were not injected."""
+        # Deferred so that importing the coordinator doesn't load torch
+        from .creative import CreativeAgent
+        from .reviewer import ReviewerAgent
+        
+        if self.creative_agent is None:
+            self.creative_agent = CreativeAgent(
+                f"{self.name}_creative",
+                self.config.get("creative_model", "gpt2"),
+                self.config.get("creative_config", {})
+            )
+        if self.reviewer_agent is None:
+            self.reviewer_agent = ReviewerAgent(
+                f"{self.name}_reviewer",
+                self.config.get("reviewer_model", "bert-base-uncased"),
+                self.config.get("reviewer_config", {})
+            )
+            
+    def _setup_resources(self) -> None:
+        """Coordinator has no resources of its own."""
+        pass
         
     async def initialize(self) -> None:
-        """Initialize the creative and reviewer agents."""
-        self.creative_agent = CreativeAgent(
-            f"{self.agent_id}_creative",
-            self.config.get("creative_model", "gpt2"),
-            self.config.get("creative_config", {})
-        )
-        self.reviewer_agent = ReviewerAgent(
-            f"{self.agent_id}_reviewer",
-            self.config.get("reviewer_model", "bert-base-uncased"),
-            self.config.get("reviewer_config", {})
-        )
+        """Initialize the creative and reviewer agents concurrently."""
+        await super().initialize()
         
-        await self.creative_agent.initialize()
-        await self.reviewer_agent.initialize()
+        owned = []
+        if self._owns_creative:
+            owned.append(self.creative_agent.initialize())
+        if self._owns_reviewer:
+            owned.append(self.reviewer_agent.initialize())
+        await asyncio.gather(*owned)
         
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process input data and coordinate the creative workflow.
@@ -59,19 +94,24 @@ class CoordinatorAgent(BaseAgent):
         best_result = None
         best_score = 0
         
+        num_candidates = max(1, int(
+            input_data.get("num_candidates") or self.config.get("num_candidates", 1)
+        ))
+        candidates_generated = 0
+        
         while iteration < max_iterations:
-            # Generate content
-            generation_result = await self.creative_agent.process({
-                "prompt": current_prompt,
-                "max_length": input_data.get("max_length", 200),
-                "temperature": input_data.get("temperature", 0.7)
-            })
-            
-            # Review content
-            review_result = await self.reviewer_agent.process({
-                "content": generation_result["generated_content"],
-                "review_aspects": ["quality", "relevance", "creativity"]
-            })
+            # Generate and review several candidates for the same prompt
+            with timed("coordinator", "iteration"):
+                candidate, review_result, generated = await self._best_candidate(
+                    {
+                        "prompt": current_prompt,
+                        "max_length": input_data.get("max_length", 200),
+                        "temperature": input_data.get("temperature", 0.7)
+                    },
+                    num_candidates,
+                    min_quality_score
+                )
+            candidates_generated += generated
             
             # Calculate overall score
             quality_score = review_result["feedback"]["quality"]["score"]
@@ -80,7 +120,7 @@ class CoordinatorAgent(BaseAgent):
             if quality_score > best_score:
                 best_score = quality_score
                 best_result = {
-                    "content": generation_result["generated_content"],
+                    "content": candidate["generated_content"],
                     "review": review_result["feedback"],
                     "metadata": {
                         "iteration": iteration,
@@ -113,11 +153,66 @@ class CoordinatorAgent(BaseAgent):
             "best_result": best_result,
             "workflow_summary": {
                 "total_iterations": iteration,
+                "candidates_generated": candidates_generated,
                 "best_score": best_score,
                 "quality_threshold_met": best_score >= min_quality_score
             }
         }
         
+    async def _best_candidate(
+        self,
+        generation_params: Dict[str, Any],
+        num_candidates: int,
+        min_quality_score: float
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], int]:
+        """Generate candidates concurrently and review them as they finish.
+        
+        The candidate requests are submitted together, so the creative agent's
+        batcher turns them into a single ``generate`` call when batching is
+        enabled. Finished candidates are reviewed together in one pass, and
+        the remaining candidates are cancelled as soon as one of them clears
+        the quality threshold.
+        
+        Args:
+            generation_params: Parameters for the creative agent
+            num_candidates: Number of candidates to generate
+            min_quality_score: Score at which to stop early
+            
+        Returns:
+            Best candidate, its review and the number of candidates generated
+        """
+        pending = {
+            asyncio.ensure_future(self.creative_agent.process(dict(generation_params)))
+            for _ in range(num_candidates)
+        }
+        best: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None
+        generated = 0
+        
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                candidates = [task.result() for task in done]
+                generated += len(candidates)
+                
+                # Review content; all candidates and aspects in one forward pass
+                reviews = await self.reviewer_agent.process_batch(
+                    [candidate["generated_content"] for candidate in candidates],
+                    ["quality", "relevance", "creativity"]
+                )
+                for candidate, review in zip(candidates, reviews):
+                    score = review["feedback"]["quality"]["score"]
+                    if best is None or score > best[1]["feedback"]["quality"]["score"]:
+                        best = (candidate, review)
+                        
+                if best[1]["feedback"]["quality"]["score"] >= min_quality_score:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+                
+        return best[0], best[1], generated
+        
     def _refine_prompt(self, current_prompt: str, feedback: Dict[str, Any]) -> str:
         """Refine the prompt based on review feedback.
         
@@ -140,7 +235,8 @@ class CoordinatorAgent(BaseAgent):
         
     async def cleanup(self) -> None:
         """Clean up agent resources."""
-        if self.creative_agent:
+        await super().cleanup()
+        if self.creative_agent and self._owns_creative:
             await self.creative_agent.cleanup()
-        if self.reviewer_agent:
+        if self.reviewer_agent and self._owns_reviewer:
             await self.reviewer_agent.cleanup() 
\ No newline at end of file
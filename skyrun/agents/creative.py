@@ -2,15 +2,73 @@
 Creative agent implementation for content generation.
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import threading
+import time
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import (
+    AutoModelForCausalLM,
+    AutoTokenizer,
+    StoppingCriteria,
+    StoppingCriteriaList,
+    TextStreamer
+)
 
+from .backends import load_model, resolve_backend
 from .base import BaseAgent
+from .batching import MicroBatcher
+from .prefix_cache import PrefixCache, crop_cache
+from ..core.metrics import TOKENS, TOKENS_PER_SECOND, observe, timed
+
+class _QueueStreamer(TextStreamer):
+    """Forwards decoded text from the generating thread to an asyncio queue.
+    
+    ``None`` is queued once when the stream ends. ``tokens`` counts the
+    generated tokens, prompt excluded.
+    """
+    
+    def __init__(self, tokenizer: Any, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        super().__init__(tokenizer, skip_prompt=True, skip_special_tokens=True)
+        self.loop = loop
+        self.queue = queue
+        self.closed = False
+        self.tokens = 0
+        
+    def put(self, value: torch.Tensor) -> None:
+        if not self.next_tokens_are_prompt:
+            self.tokens += value.shape[-1]
+        super().put(value)
+        
+    def on_finalized_text(self, text: str, stream_end: bool = False) -> None:
+        if self.closed:
+            return
+        if text:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, text)
+        if stream_end:
+            self.closed = True
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, None)
+
+class _CancelCriteria(StoppingCriteria):
+    """Stops generation once the consumer of a stream has gone away."""
+    
+    def __init__(self, cancelled: threading.Event):
+        self.cancelled = cancelled
+        
+    def __call__(self, input_ids: torch.LongTensor, scores: Any, **kwargs: Any) -> torch.BoolTensor:
+        return torch.full(
+            (input_ids.shape[0],),
+            self.cancelled.is_set(),
+            dtype=torch.bool,
+            device=input_ids.device
+        )
 
 class CreativeAgent(BaseAgent):
     """Agent responsible for creative content generation."""
     
+    # TorchScript graphs can't drive ``generate``
+    BACKENDS = ("fp16", "fp32", "bf16", "int8", "onnx")
+    
     def __init__(self, agent_id: str, model_name: str, config: Optional[Dict[str, Any]] = None):
         """Initialize the creative agent.
         
@@ -23,19 +81,41 @@ class CreativeAgent(BaseAgent):
         self.model_name = model_name
         self.model = None
         self.tokenizer = None
+        self.batcher: Optional[MicroBatcher] = None
+        self.prefix_cache: Optional[PrefixCache] = None
+        self.backend, self.device = resolve_backend(self.config, self.BACKENDS)
         
-    async def initialize(self) -> None:
-        """Initialize the model and tokenizer."""
+    def _load_models(self) -> None:
+        """Load the model and tokenizer for the configured backend."""
         self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-        self.model = AutoModelForCausalLM.from_pretrained(
-            self.model_name,
-            torch_dtype=torch.float16,
-            device_map="auto"
-        )
+        self.model = load_model(AutoModelForCausalLM, self.model_name, self.backend, self.device)
+        
+    def _setup_resources(self) -> None:
+        """Prepare the tokenizer and the generation batcher."""
+        # Batched prompts are left-padded so generation continues from the real text
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        
+        batch_size = self.config.get("batch_size", 1)
+        if batch_size > 1:
+            self.batcher = MicroBatcher(
+                self.process_batch,
+                max_batch_size=batch_size,
+                max_wait_ms=self.config.get("batch_timeout_ms", 10),
+                name=self.name
+            )
+        
+        prefix_cache_mb = self.config.get("prefix_cache_mb", 0)
+        if prefix_cache_mb > 0:
+            self.prefix_cache = PrefixCache(int(prefix_cache_mb * 1024 * 1024))
         
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process input data and generate creative content.
         
+        Concurrent calls are transparently batched when ``batch_size`` is
+        configured above 1.
+        
         Args:
             input_data: Dictionary containing prompt and generation parameters
             
@@ -46,29 +126,247 @@ class CreativeAgent(BaseAgent):
         max_length = input_data.get("max_length", 100)
         temperature = input_data.get("temperature", 0.7)
         
-        inputs = self.tokenizer(prompt, return_tensors="pt").to(self.model.device)
-        outputs = self.model.generate(
-            **inputs,
-            max_length=max_length,
-            temperature=temperature,
-            do_sample=True,
-            pad_token_id=self.tokenizer.eos_token_id
-        )
+        if self.batcher is not None:
+            return await self.batcher.submit(
+                prompt,
+                max_length=max_length,
+                temperature=temperature
+            )
+        
+        results = await self.process_batch([prompt], max_length=max_length, temperature=temperature)
+        return results[0]
+        
+    async def process_batch(
+        self,
+        prompts: List[str],
+        max_length: int = 100,
+        temperature: float = 0.7
+    ) -> List[Dict[str, Any]]:
+        """Generate content for several prompts in one padded ``generate`` call.
+        
+        Args:
+            prompts: Prompts to generate from
+            max_length: Maximum length of each result in tokens, prompt included
+            temperature: Sampling temperature
+            
+        Returns:
+            One result dictionary per prompt, in the same order
+        """
+        texts = await self.run_in_executor(self._generate_batch, prompts, max_length, temperature)
+        
+        return [
+            {
+                "generated_content": text,
+                "metadata": {
+                    "model": self.model_name,
+                    "max_length": max_length,
+                    "temperature": temperature,
+                    "batch_size": len(prompts)
+                }
+            }
+            for text in texts
+        ]
+        
+    async def stream(self, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Generate creative content, yielding text as it is decoded.
+        
+        Yields ``{"type": "token", "text": ...}`` events followed by one
+        ``{"type": "done", ...}`` event carrying the full content and
+        timing metadata, including the time to first token. Closing the
+        iterator early stops the generation.
+        
+        Args:
+            input_data: Dictionary containing prompt and generation parameters
+            
+        Yields:
+            Streaming events
+        """
+        prompt = input_data.get("prompt", "")
+        max_length = input_data.get("max_length", 100)
+        temperature = input_data.get("temperature", 0.7)
         
-        generated_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+        queue: asyncio.Queue = asyncio.Queue()
+        streamer = _QueueStreamer(self.tokenizer, asyncio.get_running_loop(), queue)
+        cancelled = threading.Event()
         
-        return {
-            "generated_content": generated_text,
+        start = time.perf_counter()
+        time_to_first_token = None
+        chunks = []
+        generation = asyncio.ensure_future(self.run_in_executor(
+            self._generate_stream, prompt, max_length, temperature, streamer, cancelled
+        ))
+        # Ends the stream even if the executor rejects the job before the streamer runs
+        generation.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                text = await queue.get()
+                if text is None:
+                    break
+                if time_to_first_token is None:
+                    time_to_first_token = time.perf_counter() - start
+                chunks.append(text)
+                yield {"type": "token", "text": text}
+            
+            await generation
+        finally:
+            cancelled.set()
+            # Retrieves the generation's outcome when the consumer stops early
+            generation.cancel()
+            await asyncio.gather(generation, return_exceptions=True)
+            
+        total_time = time.perf_counter() - start
+        observe("creative", "time_to_first_token", time_to_first_token or total_time)
+        self.logger.debug(
+            f"Streamed {len(chunks)} chunks, first after "
+            f"{(time_to_first_token or total_time) * 1000:.1f} ms"
+        )
+        yield {
+            "type": "done",
+            "generated_content": prompt + "".join(chunks),
             "metadata": {
                 "model": self.model_name,
                 "max_length": max_length,
-                "temperature": temperature
+                "temperature": temperature,
+                "time_to_first_token_ms": (time_to_first_token or total_time) * 1000,
+                "total_time_ms": total_time * 1000
             }
         }
         
+    def _generate_stream(
+        self,
+        prompt: str,
+        max_length: int,
+        temperature: float,
+        streamer: _QueueStreamer,
+        cancelled: threading.Event
+    ) -> None:
+        """Run a streamed ``generate`` call; blocking, runs on the executor.
+        
+        Args:
+            prompt: Prompt to generate from
+            max_length: Maximum length in tokens, prompt included
+            temperature: Sampling temperature
+            streamer: Streamer receiving decoded text
+            cancelled: Set when the consumer no longer wants tokens
+        """
+        try:
+            with timed("creative", "tokenize"):
+                inputs = self.tokenizer(prompt, return_tensors="pt").to(self.model.device)
+            prefix_kwargs = self._prefix_kwargs(inputs) if self.prefix_cache is not None else {}
+            start = time.perf_counter()
+            # Decoding happens inside generate, in the streamer
+            with timed("creative", "generate_stream"):
+                outputs = self.model.generate(
+                    **inputs,
+                    max_length=max_length,
+                    temperature=temperature,
+                    do_sample=True,
+                    pad_token_id=self.tokenizer.pad_token_id,
+                    streamer=streamer,
+                    stopping_criteria=StoppingCriteriaList([_CancelCriteria(cancelled)]),
+                    **prefix_kwargs
+                )
+            self._record_tokens(streamer.tokens, time.perf_counter() - start)
+            if self.prefix_cache is not None:
+                self._store_prefix(inputs, outputs)
+        finally:
+            # Unblocks the consumer even if generate failed before finishing
+            streamer.end()
+        
+    def _generate_batch(self, prompts: List[str], max_length: int, temperature: float) -> List[str]:
+        """Run one padded ``generate`` call; blocking, runs on the executor.
+        
+        Args:
+            prompts: Prompts to generate from
+            max_length: Maximum length of each result in tokens, prompt included
+            temperature: Sampling temperature
+            
+        Returns:
+            Decoded text for each prompt
+        """
+        with timed("creative", "tokenize"):
+            inputs = self.tokenizer(prompts, return_tensors="pt", padding=True).to(self.model.device)
+        
+        # Every row gets its full max_length budget beyond its own left padding
+        padded_length = inputs["input_ids"].shape[1]
+        prompt_lengths = inputs["attention_mask"].sum(dim=1).tolist()
+        
+        # Unpadded single prompts can resume from a cached prompt prefix
+        use_prefix_cache = self.prefix_cache is not None and len(prompts) == 1
+        prefix_kwargs = self._prefix_kwargs(inputs) if use_prefix_cache else {}
+        
+        start = time.perf_counter()
+        with timed("creative", "generate"):
+            outputs = self.model.generate(
+                **inputs,
+                max_length=max_length + padded_length - min(prompt_lengths),
+                temperature=temperature,
+                do_sample=True,
+                pad_token_id=self.tokenizer.pad_token_id,
+                **prefix_kwargs
+            )
+        generate_time = time.perf_counter() - start
+        if use_prefix_cache:
+            outputs = self._store_prefix(inputs, outputs)
+        self._record_tokens((outputs.shape[1] - padded_length) * len(prompts), generate_time)
+        
+        texts = []
+        with timed("creative", "decode"):
+            for row, prompt_length in zip(outputs, prompt_lengths):
+                tokens = row[padded_length - prompt_length:][:max_length]
+                texts.append(self.tokenizer.decode(tokens, skip_special_tokens=True))
+        return texts
+        
+    def _record_tokens(self, new_tokens: int, seconds: float) -> None:
+        """Count the tokens of a ``generate`` call and its throughput.
+        
+        Args:
+            new_tokens: Tokens generated, over all rows
+            seconds: Duration of the call
+        """
+        TOKENS.labels(self.name).inc(new_tokens)
+        if seconds > 0:
+            TOKENS_PER_SECOND.labels(self.name).set(new_tokens / seconds)
+        
+    def _prefix_kwargs(self, inputs: Dict[str, torch.Tensor]) -> Dict[str, Any]:
+        """Build ``generate`` arguments that reuse a cached prompt prefix.
+        
+        Args:
+            inputs: Tokenized single, unpadded prompt
+            
+        Returns:
+            Extra keyword arguments for ``generate``
+        """
+        _, past_key_values = self.prefix_cache.lookup(inputs["input_ids"][0].tolist())
+        kwargs: Dict[str, Any] = {"return_dict_in_generate": True}
+        if past_key_values is not None:
+            kwargs["past_key_values"] = past_key_values
+        return kwargs
+        
+    def _store_prefix(self, inputs: Dict[str, torch.Tensor], outputs: Any) -> torch.Tensor:
+        """Keep the prompt part of a generation's cache for later prompts.
+        
+        Args:
+            inputs: Tokenized single, unpadded prompt
+            outputs: ``generate`` output with ``return_dict_in_generate`` set
+            
+        Returns:
+            Generated sequences
+        """
+        token_ids = inputs["input_ids"][0].tolist()
+        past_key_values = getattr(outputs, "past_key_values", None)
+        if past_key_values is not None and hasattr(past_key_values, "crop"):
+            self.prefix_cache.put(token_ids, crop_cache(past_key_values, len(token_ids)))
+        return outputs.sequences
+        
     async def cleanup(self) -> None:
         """Clean up model resources."""
-        if self.model is not None:
-            del self.model
-        if self.tokenizer is not None:
-            del self.tokenizer 
\ No newline at end of file
+        if self.batcher is not None:
+            await self.batcher.close()
+            self.batcher = None
+        if self.prefix_cache is not None:
+            self.prefix_cache.clear()
+            self.prefix_cache = None
+        await super().cleanup()
+        self.model = None
+        self.tokenizer = None 
\ No newline at end of file
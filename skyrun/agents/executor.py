@@ -0,0 +1,144 @@
+"""
+Dedicated executors for running model inference off the event loop.
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import functools
+
+from ..core.logging import get_logger
+from ..core.metrics import track_queue
+
+logger = get_logger(__name__)
+
+class InferenceQueueFullError(RuntimeError):
+    """Raised when an executor already has ``max_queue_size`` jobs pending."""
+
+def _init_worker(torch_threads: int) -> None:
+    """Configure torch in a freshly started worker."""
+    if torch_threads > 0:
+        import torch
+        torch.set_num_threads(torch_threads)
+
+class InferenceExecutor:
+    """Bounded pool of workers that runs blocking inference calls.
+
+    ``thread`` executors share the models already loaded in this process and
+    are what the agents use. ``process`` executors need picklable, self
+    contained callables and suit CPU-bound work that doesn't touch a model.
+
+    Note that torch's intra-op thread count is process wide, so for a thread
+    executor ``torch_threads`` applies to the whole API process.
+    """
+
+    KINDS = ("thread", "process")
+
+    def __init__(
+        self,
+        name: str = "inference",
+        kind: str = "thread",
+        workers: int = 1,
+        max_queue_size: int = 64,
+        torch_threads: int = 0
+    ):
+        """Initialize the executor.
+
+        Args:
+            name: Executor name, used for thread names and logging
+            kind: ``thread`` or ``process``
+            workers: Number of worker threads or processes
+            max_queue_size: Maximum number of running plus waiting jobs
+            torch_threads: Torch intra-op threads per worker, 0 keeps the default
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown executor kind: {kind}")
+
+        self.name = name
+        self.kind = kind
+        self.workers = max(1, int(workers))
+        self.max_queue_size = max(1, int(max_queue_size))
+        self.torch_threads = int(torch_threads or 0)
+        self._pending = 0
+        self._pool: Optional[Executor] = None
+        track_queue(f"executor_{name}", lambda: self._pending)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], name: str = "inference") -> "InferenceExecutor":
+        """Create an executor from a configuration dictionary.
+
+        Args:
+            config: Dictionary with optional ``kind``, ``workers``,
+                ``max_queue_size`` and ``torch_threads`` keys
+            name: Executor name
+
+        Returns:
+            InferenceExecutor instance
+        """
+        return cls(
+            name=name,
+            kind=config.get("kind", "thread"),
+            workers=config.get("workers", 1),
+            max_queue_size=config.get("max_queue_size", 64),
+            torch_threads=config.get("torch_threads", 0)
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs running or waiting for a worker."""
+        return self._pending
+
+    def _get_pool(self) -> Executor:
+        """Create the underlying pool on first use."""
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_worker,
+                    initargs=(self.torch_threads,)
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix=self.name,
+                    initializer=_init_worker,
+                    initargs=(self.torch_threads,)
+                )
+            logger.info(f"Started {self.kind} executor {self.name} with {self.workers} workers")
+        return self._pool
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking callable on the executor and await its result.
+
+        Args:
+            fn: Callable to run
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            Return value of the callable
+
+        Raises:
+            InferenceQueueFullError: If the queue is already full
+        """
+        if self._pending >= self.max_queue_size:
+            raise InferenceQueueFullError(
+                f"Executor {self.name} has {self._pending} pending jobs"
+            )
+
+        loop = asyncio.get_running_loop()
+        future = self._get_pool().submit(functools.partial(fn, *args, **kwargs))
+        self._pending += 1
+        # Counted until the job itself is done: a cancelled caller doesn't stop a running job
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._job_done))
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _job_done(self) -> None:
+        """Free the queue slot of a finished or cancelled job."""
+        self._pending -= 1
+
+    async def close(self) -> None:
+        """Wait for running jobs to finish and stop the workers."""
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.get_running_loop().run_in_executor(None, pool.shutdown)
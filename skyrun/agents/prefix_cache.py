@@ -0,0 +1,153 @@
+"""
+Prompt-prefix key/value cache for causal language models.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+import copy
+import threading
+
+import torch
+
+def _cache_tensors(past_key_values: Any) -> Iterator[torch.Tensor]:
+    """Iterate over the key and value tensors of a model cache."""
+    if hasattr(past_key_values, "layers"):
+        for layer in past_key_values.layers:
+            for tensor in (getattr(layer, "keys", None), getattr(layer, "values", None)):
+                if isinstance(tensor, torch.Tensor):
+                    yield tensor
+    elif hasattr(past_key_values, "key_cache"):
+        yield from past_key_values.key_cache
+        yield from past_key_values.value_cache
+
+def _common_prefix_length(a: Sequence[int], b: Sequence[int], limit: int) -> int:
+    """Length of the common prefix of two token sequences, at most ``limit``."""
+    length = 0
+    for x, y in zip(a[:limit], b[:limit]):
+        if x != y:
+            break
+        length += 1
+    return length
+
+def crop_cache(past_key_values: Any, length: int) -> Any:
+    """Drop cached positions beyond ``length``, in place.
+
+    Args:
+        past_key_values: Model cache supporting ``crop``
+        length: Number of positions to keep
+
+    Returns:
+        The cropped cache
+    """
+    drop = past_key_values.get_seq_length() - length
+    if drop > 0:
+        past_key_values.crop(-drop)
+    return past_key_values
+
+class PrefixCache:
+    """LRU cache of past key/values for recently seen prompt prefixes.
+
+    Entries are keyed by prompt token IDs. A lookup returns a private copy of
+    the cache for the longest prefix shared with a stored prompt, so
+    generation only has to prefill the tokens that follow it. The total size
+    of the stored tensors is kept under ``max_bytes`` by evicting the least
+    recently used entries.
+    """
+
+    def __init__(self, max_bytes: int):
+        """Initialize the prefix cache.
+
+        Args:
+            max_bytes: Memory budget for the stored key/value tensors
+        """
+        self.max_bytes = int(max_bytes)
+        self._entries: "OrderedDict[Tuple[int, ...], Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reused_tokens = 0
+
+    @property
+    def size_bytes(self) -> int:
+        """Memory used by the stored tensors."""
+        return self._bytes
+
+    def lookup(self, token_ids: Sequence[int]) -> Tuple[int, Optional[Any]]:
+        """Find the cached entry sharing the longest prefix with a prompt.
+
+        At least one prompt token is always left uncached, since generation
+        needs an input to produce the first new token from.
+
+        Args:
+            token_ids: Prompt token IDs
+
+        Returns:
+            Number of cached tokens and a copy of their cache, or ``(0, None)``
+        """
+        token_ids = tuple(token_ids)
+        limit = len(token_ids) - 1
+        with self._lock:
+            best_key: Optional[Tuple[int, ...]] = None
+            length = 0
+            for key in self._entries:
+                shared = _common_prefix_length(key, token_ids, limit)
+                if shared > length:
+                    best_key, length = key, shared
+            if best_key is None:
+                self.misses += 1
+                return 0, None
+
+            self._entries.move_to_end(best_key)
+            past_key_values = copy.deepcopy(self._entries[best_key][0])
+
+        self.hits += 1
+        self.reused_tokens += length
+        return length, crop_cache(past_key_values, length)
+
+    def put(self, token_ids: Sequence[int], past_key_values: Any) -> None:
+        """Store the cache of a prompt.
+
+        Args:
+            token_ids: Prompt token IDs
+            past_key_values: Cache covering exactly these tokens; owned by the
+                prefix cache afterwards
+        """
+        size = sum(tensor.numel() * tensor.element_size() for tensor in _cache_tensors(past_key_values))
+        if size > self.max_bytes:
+            return
+
+        key = tuple(token_ids)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            # A stored prefix of this prompt is redundant now
+            for other in [k for k in self._entries if len(k) < len(key) and key[:len(k)] == k]:
+                self._bytes -= self._entries.pop(other)[1]
+
+            self._entries[key] = (past_key_values, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary of cache statistics
+        """
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "reused_tokens": self.reused_tokens
+        }
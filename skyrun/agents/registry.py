@@ -0,0 +1,170 @@
+"""
+Process-wide registry of long-lived agent instances.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Optional
+import asyncio
+import time
+
+from .coordinator import CoordinatorAgent
+from ..core.logging import get_logger
+
+if TYPE_CHECKING:
+    from .creative import CreativeAgent
+    from .reviewer import ReviewerAgent
+
+logger = get_logger(__name__)
+
+class AgentRegistry:
+    """Owns the shared agents so each model is loaded once per process.
+
+    The registry is tied to the application lifecycle: ``initialize`` and
+    ``warmup`` are called on startup and ``cleanup`` on shutdown. Requests
+    only ever borrow the already warmed instances.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize the registry.
+
+        Args:
+            config: Optional configuration dictionary, in the same format as
+                the ``CoordinatorAgent`` configuration
+        """
+        self.config = config or {}
+        self.creative_agent: Optional["CreativeAgent"] = None
+        self.reviewer_agent: Optional["ReviewerAgent"] = None
+        self.coordinator: Optional[CoordinatorAgent] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self.warmed_up = False
+        self.startup_error: Optional[str] = None
+        self.load_time: Optional[float] = None
+        self.warmup_time: Optional[float] = None
+
+    @property
+    def is_initialized(self) -> bool:
+        """Whether the shared agents have been loaded."""
+        return self.coordinator is not None
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the shared agents are loaded and warmed up."""
+        return self.is_initialized and self.warmed_up
+
+    def readiness(self) -> Dict[str, Any]:
+        """Describe the startup state of the shared agents.
+
+        Returns:
+            Dictionary with a ``status`` of ``loading``, ``warming_up``,
+            ``ready`` or ``failed`` and the load and warmup durations
+        """
+        if self.startup_error is not None:
+            status = "failed"
+        elif self.is_ready:
+            status = "ready"
+        elif self.is_initialized:
+            status = "warming_up"
+        else:
+            status = "loading"
+        return {
+            "status": status,
+            "error": self.startup_error,
+            "load_time": self.load_time,
+            "warmup_time": self.warmup_time
+        }
+
+    async def initialize(self) -> None:
+        """Load the shared agents.
+
+        Safe to call concurrently and repeatedly; models are only loaded by
+        the first caller.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self.is_initialized:
+                return
+
+            # Deferred so that importing the registry doesn't load torch
+            from .creative import CreativeAgent
+            from .reviewer import ReviewerAgent
+
+            name = self.config.get("name", "main_coordinator")
+            logger.info("Loading shared agents")
+            started_at = time.perf_counter()
+
+            creative_agent = CreativeAgent(
+                f"{name}_creative",
+                self.config.get("creative_model", "gpt2"),
+                self.config.get("creative_config", {})
+            )
+            reviewer_agent = ReviewerAgent(
+                f"{name}_reviewer",
+                self.config.get("reviewer_model", "bert-base-uncased"),
+                self.config.get("reviewer_config", {})
+            )
+            await asyncio.gather(creative_agent.initialize(), reviewer_agent.initialize())
+
+            coordinator = CoordinatorAgent(
+                name,
+                self.config,
+                creative_agent=creative_agent,
+                reviewer_agent=reviewer_agent
+            )
+            await coordinator.initialize()
+
+            self.creative_agent = creative_agent
+            self.reviewer_agent = reviewer_agent
+            self.coordinator = coordinator
+            self.load_time = time.perf_counter() - started_at
+            logger.info(f"Loaded shared agents in {self.load_time:.1f}s")
+
+    async def warmup(self) -> None:
+        """Run the configured warmup prompts through both agents.
+
+        The first calls pay for lazy kernel setup, allocator growth and
+        tokenizer caches; doing them here keeps that cost off real requests.
+        The prompts run concurrently so batched code paths are warmed too.
+        """
+        warmup_config = self.config.get("warmup", {})
+        prompts = warmup_config.get("prompts", [])
+        max_length = warmup_config.get("max_length", 32)
+        started_at = time.perf_counter()
+
+        await self.initialize()
+        generated = await asyncio.gather(*(
+            self.creative_agent.process({"prompt": prompt, "max_length": max_length})
+            for prompt in prompts
+        ))
+        await asyncio.gather(*(
+            self.reviewer_agent.process({"content": result["generated_content"]})
+            for result in generated
+        ))
+
+        self.warmup_time = time.perf_counter() - started_at
+        self.warmed_up = self.is_initialized
+        logger.info(f"Warmed up shared agents with {len(prompts)} prompts in {self.warmup_time:.1f}s")
+
+    async def get_coordinator(self) -> CoordinatorAgent:
+        """Get the shared coordinator agent, loading it on first use.
+
+        Returns:
+            Shared coordinator agent
+        """
+        if not self.is_initialized:
+            await self.initialize()
+        return self.coordinator
+
+    async def cleanup(self) -> None:
+        """Release the shared agents and their models."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            for agent in (self.coordinator, self.creative_agent, self.reviewer_agent):
+                if agent is not None:
+                    await agent.cleanup()
+            self.coordinator = None
+            self.creative_agent = None
+            self.reviewer_agent = None
+            self.warmed_up = False
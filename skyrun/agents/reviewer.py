@@ -6,10 +6,20 @@ from typing import Any, Dict, List, Optional
 import torch
 from transformers import AutoModelForSequenceClassification, AutoTokenizer
 
+from .backends import load_model, resolve_backend, trace_classifier
 from .base import BaseAgent
+from .batching import MicroBatcher
+from .cache import ReviewCache
+from ..core.metrics import timed
+
+DEFAULT_ASPECTS = ["quality", "relevance", "creativity"]
 
 class ReviewerAgent(BaseAgent):
-    """Agent responsible for reviewing and providing feedback on content."""
+    """Agent responsible for reviewing and providing feedback on content.
+    
+    The classification head has one output per configured aspect, so every
+    aspect of every content in a batch is scored by a single forward pass.
+    """
     
     def __init__(self, agent_id: str, model_name: str, config: Optional[Dict[str, Any]] = None):
         """Initialize the reviewer agent.
@@ -23,19 +33,58 @@ class ReviewerAgent(BaseAgent):
         self.model_name = model_name
         self.model = None
         self.tokenizer = None
+        self.aspects: List[str] = list(self.config.get("aspects", DEFAULT_ASPECTS))
+        self.batcher: Optional[MicroBatcher] = None
+        self.cache: Optional[ReviewCache] = None
+        self.backend, self.device = resolve_backend(self.config)
         
-    async def initialize(self) -> None:
-        """Initialize the model and tokenizer."""
+    def _load_models(self) -> None:
+        """Load the model and tokenizer for the configured backend."""
         self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-        self.model = AutoModelForSequenceClassification.from_pretrained(
+        self.model = load_model(
+            AutoModelForSequenceClassification,
             self.model_name,
-            torch_dtype=torch.float16,
-            device_map="auto"
+            self.backend,
+            self.device,
+            num_labels=len(self.aspects),
+            problem_type="multi_label_classification",
+            ignore_mismatched_sizes=True
         )
+        if self.backend == "torchscript":
+            # Differing lengths make the example padded, so masking is traced too
+            example = self.tokenizer(
+                ["Example content.", "A longer example of content to review."],
+                return_tensors="pt",
+                padding=True
+            ).to(self.model.device)
+            self.model = trace_classifier(self.model, dict(example))
+        
+    def _setup_resources(self) -> None:
+        """Prepare the cross-request review batcher and the review cache."""
+        
+        batch_size = self.config.get("batch_size", 1)
+        if batch_size > 1:
+            self.batcher = MicroBatcher(
+                self._score_contents,
+                max_batch_size=batch_size,
+                max_wait_ms=self.config.get("batch_timeout_ms", 10),
+                name=self.name
+            )
+        
+        cache_config = self.config.get("cache")
+        if cache_config:
+            self.cache = ReviewCache(
+                max_entries=cache_config.get("max_entries", 10000),
+                ttl=cache_config.get("ttl", 3600),
+                disk_path=cache_config.get("disk_path")
+            )
         
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process input data and provide review feedback.
         
+        Concurrent calls are transparently batched when ``batch_size`` is
+        configured above 1.
+        
         Args:
             input_data: Dictionary containing content to review and review parameters
             
@@ -43,31 +92,144 @@ class ReviewerAgent(BaseAgent):
             Dictionary containing review feedback and metadata
         """
         content = input_data.get("content", "")
-        review_aspects = input_data.get("review_aspects", ["quality", "relevance", "creativity"])
+        review_aspects = input_data.get("review_aspects", self.aspects)
+        self._check_aspects(review_aspects)
+        
+        scores = await self._cache_get(content)
+        if scores is None:
+            if self.batcher is not None:
+                scores = await self.batcher.submit(content)
+            else:
+                scores = (await self._score_contents([content]))[0]
+        return self._build_review(scores, review_aspects)
+        
+    async def process_batch(
+        self,
+        contents: List[str],
+        review_aspects: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Review several contents with a single forward pass.
+        
+        Args:
+            contents: Contents to review
+            review_aspects: Aspects to report, defaults to all configured aspects
+            
+        Returns:
+            One review dictionary per content, in the same order
+        """
+        review_aspects = review_aspects or self.aspects
+        self._check_aspects(review_aspects)
+        
+        scores = [await self._cache_get(content) for content in contents]
+        missing = [index for index, content_scores in enumerate(scores) if content_scores is None]
+        if missing:
+            computed = await self._score_contents([contents[index] for index in missing])
+            for index, content_scores in zip(missing, computed):
+                scores[index] = content_scores
+        
+        return [
+            self._build_review(content_scores, review_aspects)
+            for content_scores in scores
+        ]
+        
+    async def _score_contents(self, contents: List[str]) -> List[Dict[str, float]]:
+        """Score every configured aspect of each content and cache the results.
+        
+        Args:
+            contents: Contents to score
+            
+        Returns:
+            Aspect scores for each content
+        """
+        scores = await self.run_in_executor(self._score, contents)
+        results = [
+            dict(zip(self.aspects, row))
+            for row in scores.tolist()
+        ]
+        
+        if self.cache is not None:
+            for content, content_scores in zip(contents, results):
+                await self.cache.set(self._cache_key(content), content_scores)
+        return results
+        
+    async def _cache_get(self, content: str) -> Optional[Dict[str, float]]:
+        """Look up cached aspect scores for a content.
         
-        inputs = self.tokenizer(content, return_tensors="pt", truncation=True, max_length=512)
-        inputs = {k: v.to(self.model.device) for k, v in inputs.items()}
+        Args:
+            content: Content to look up
+            
+        Returns:
+            Cached scores, or None if caching is off or on a miss
+        """
+        if self.cache is None:
+            return None
+        return await self.cache.get(self._cache_key(content))
+        
+    def _cache_key(self, content: str) -> str:
+        """Cache key of a content for this model and aspect set."""
+        return ReviewCache.make_key(content, self.model_name, self.aspects)
+        
+    def _score(self, contents: List[str]) -> torch.Tensor:
+        """Run the classification forward pass; blocking, runs on the executor.
         
-        with torch.no_grad():
+        Args:
+            contents: Contents to score, padded to the longest one
+            
+        Returns:
+            Per-aspect probabilities, one row per content
+        """
+        with timed("reviewer", "tokenize"):
+            inputs = self.tokenizer(
+                contents,
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=512
+            )
+            inputs = {k: v.to(self.model.device) for k, v in inputs.items()}
+        
+        with torch.no_grad(), timed("reviewer", "forward"):
             outputs = self.model(**inputs)
-            scores = torch.softmax(outputs.logits, dim=1)
+            return torch.sigmoid(outputs.logits.float())
             
+    def _build_review(self, scores: Dict[str, float], review_aspects: List[str]) -> Dict[str, Any]:
+        """Build the review result for the requested aspects.
+        
+        Args:
+            scores: Scores for every configured aspect
+            review_aspects: Aspects to include
+            
+        Returns:
+            Dictionary containing review feedback and metadata
+        """
         feedback = {}
         for aspect in review_aspects:
-            aspect_score = float(scores[0][0])  # Assuming binary classification
             feedback[aspect] = {
-                "score": aspect_score,
-                "comment": self._generate_feedback(aspect, aspect_score)
+                "score": scores[aspect],
+                "comment": self._generate_feedback(aspect, scores[aspect])
             }
             
         return {
             "feedback": feedback,
             "metadata": {
                 "model": self.model_name,
-                "review_aspects": review_aspects
+                "review_aspects": list(review_aspects)
             }
         }
         
+    def _check_aspects(self, review_aspects: List[str]) -> None:
+        """Ensure every requested aspect has an output in the model head.
+        
+        Args:
+            review_aspects: Requested aspects
+            
+        Raises:
+            ValueError: If an aspect is not configured
+        """
+        unknown = [aspect for aspect in review_aspects if aspect not in self.aspects]
+        if unknown:
+            raise ValueError(f"Unsupported review aspects: {', '.join(unknown)}")
+            
     def _generate_feedback(self, aspect: str, score: float) -> str:
         """Generate human-readable feedback based on score.
         
@@ -89,7 +251,12 @@ class ReviewerAgent(BaseAgent):
             
     async def cleanup(self) -> None:
         """Clean up model resources."""
-        if self.model is not None:
-            del self.model
-        if self.tokenizer is not None:
-            del self.tokenizer 
\ No newline at end of file
+        if self.batcher is not None:
+            await self.batcher.close()
+            self.batcher = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+        await super().cleanup()
+        self.model = None
+        self.tokenizer = None 
\ No newline at end of file
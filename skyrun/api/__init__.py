@@ -2,24 +2,44 @@
 API module for the SkyRun platform.
 """
 
-from .server import APIServer
-from .routes import router
-from .models import (
-    ContentRequest,
-    ContentResponse,
-    ReviewRequest,
-    ReviewResponse,
-    TransactionRequest,
-    TransactionResponse
-)
+import importlib
+from typing import Any
+
+# Attributes are imported on first access, so importing the package stays cheap
+_LAZY_ATTRS = {
+    'APIServer': '.server',
+    'router': '.routes',
+    'ContentRequest': '.models',
+    'ContentResponse': '.models',
+    'JobResponse': '.models',
+    'ReviewRequest': '.models',
+    'ReviewResponse': '.models',
+    'BatchReviewRequest': '.models',
+    'BatchReviewResponse': '.models',
+    'TransactionRequest': '.models',
+    'TransactionResponse': '.models',
+}
 
 __all__ = [
     'APIServer',
     'router',
     'ContentRequest',
     'ContentResponse',
+    'JobResponse',
     'ReviewRequest',
     'ReviewResponse',
+    'BatchReviewRequest',
+    'BatchReviewResponse',
     'TransactionRequest',
     'TransactionResponse'
-] 
\ No newline at end of file
+]
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
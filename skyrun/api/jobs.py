@@ -0,0 +1,340 @@
+"""
+Asynchronous generation jobs backed by a persistent SQLite job store.
+"""
+
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Returned for a job that was cancelled before a worker could start it
+_SKIPPED = object()
+
+def sqlite_path(database_url: str) -> str:
+    """Get the file path from a ``sqlite:///`` database URL.
+
+    Args:
+        database_url: Database URL, e.g. ``sqlite:///skyrun.db``
+
+    Returns:
+        Path of the SQLite file
+
+    Raises:
+        ValueError: If the URL is not a SQLite URL
+    """
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise ValueError(f"Job store needs a sqlite:/// database URL, got {database_url}")
+    return database_url[len(prefix):]
+
+class JobStore:
+    """Durable table of generation jobs."""
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize the job store.
+
+        Args:
+            path: SQLite file path, or ``:memory:``
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, "
+                "status TEXT NOT NULL, "
+                "request TEXT NOT NULL, "
+                "result TEXT, "
+                "error TEXT, "
+                "iterations INTEGER, "
+                "created_at REAL NOT NULL, "
+                "started_at REAL, "
+                "finished_at REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+            self._db.commit()
+
+    def create(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a new queued job.
+
+        Args:
+            request: Coordinator input for the job
+
+        Returns:
+            The new job
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, request, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(request), time.time())
+            )
+            self._db.commit()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Job dictionary, or None if unknown
+        """
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def update(self, job_id: str, expected_status: Optional[str] = None, **fields: Any) -> bool:
+        """Update columns of a job.
+
+        Args:
+            job_id: Job identifier
+            expected_status: If given, only update the job while it has
+                this status
+            **fields: Columns to set; ``result`` is stored as JSON
+
+        Returns:
+            True if the job was updated
+        """
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"])
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        where, params = "id = ?", [job_id]
+        if expected_status is not None:
+            where += " AND status = ?"
+            params.append(expected_status)
+        with self._lock:
+            cursor = self._db.execute(
+                f"UPDATE jobs SET {columns} WHERE {where}",
+                (*fields.values(), *params)
+            )
+            self._db.commit()
+        return cursor.rowcount == 1
+
+    def cancel_if_queued(self, job_id: str) -> bool:
+        """Atomically cancel a job that hasn't started.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            True if the job was queued and is now cancelled
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?",
+                (CANCELLED, time.time(), job_id, QUEUED)
+            )
+            self._db.commit()
+        return cursor.rowcount == 1
+
+    def requeue_interrupted(self) -> List[str]:
+        """Put jobs left running by a previous process back in the queue.
+
+        Returns:
+            Identifiers of all queued jobs, oldest first
+        """
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?",
+                (QUEUED, RUNNING)
+            )
+            self._db.commit()
+            rows = self._db.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at",
+                (QUEUED,)
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a row to a job dictionary with derived timings."""
+        job = dict(row)
+        job["request"] = json.loads(job["request"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["queue_time"] = (
+            job["started_at"] - job["created_at"] if job["started_at"] else None
+        )
+        job["run_time"] = (
+            job["finished_at"] - job["started_at"]
+            if job["finished_at"] and job["started_at"] else None
+        )
+        return job
+
+class JobManager:
+    """Runs queued generation jobs on a pool of worker tasks.
+
+    Jobs are persisted before they are acknowledged, so queued jobs and jobs
+    interrupted by a shutdown are picked up again by the next process.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        run_job: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        workers: int = 4
+    ):
+        """Initialize the job manager.
+
+        Args:
+            store: Job store
+            run_job: Coroutine function running one job's coordinator input
+            workers: Number of jobs run concurrently
+        """
+        self.store = store
+        self.run_job = run_job
+        self.workers = max(1, int(workers))
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._stopping = False
+
+    async def start(self) -> None:
+        """Recover persisted jobs and start the workers."""
+        self._queue = asyncio.Queue()
+        self._stopping = False
+        for job_id in await self._call(self.store.requeue_interrupted):
+            self._queue.put_nowait(job_id)
+        if self._queue.qsize():
+            logger.info(f"Recovered {self._queue.qsize()} queued jobs")
+
+        self._workers = [
+            asyncio.ensure_future(self._worker()) for _ in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Stop the workers; interrupted jobs stay queued for the next start."""
+        self._stopping = True
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist and enqueue a new job.
+
+        Args:
+            request: Coordinator input for the job
+
+        Returns:
+            The new job
+        """
+        job = await self._call(self.store.create, request)
+        self._queue.put_nowait(job["id"])
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Job dictionary, or None if unknown
+        """
+        return await self._call(self.store.get, job_id)
+
+    async def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a queued or running job.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            The job after cancellation, or None if unknown
+        """
+        if not await self._call(self.store.cancel_if_queued, job_id):
+            task = self._running.get(job_id)
+            if task is not None and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                await self._finish(job_id, status=CANCELLED)
+        return await self.get(job_id)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize() if self._queue else 0
+
+    async def _worker(self) -> None:
+        """Take jobs off the queue and run them."""
+        while True:
+            job_id = await self._queue.get()
+            job = await self._call(self.store.get, job_id)
+            if job is None or job["status"] != QUEUED:
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        """Run one job and record its outcome."""
+        job_id = job["id"]
+        # Registered before the job is marked running, so a cancel always finds it
+        task = asyncio.ensure_future(self._start(job))
+        self._running[job_id] = task
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._stopping:
+                # Shutting down: leave the job for the next process
+                task.cancel()
+                await self._call(self.store.update, job_id, status=QUEUED, started_at=None)
+                raise
+            await self._finish(job_id, status=CANCELLED)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            await self._finish(job_id, status=FAILED, error=str(e))
+        else:
+            if result is not _SKIPPED:
+                await self._finish(
+                    job_id,
+                    status=SUCCEEDED,
+                    result=result,
+                    iterations=result.get("workflow_summary", {}).get("total_iterations")
+                )
+        finally:
+            self._running.pop(job_id, None)
+
+    async def _start(self, job: Dict[str, Any]) -> Any:
+        """Mark a job running and run it, unless it was cancelled while queued."""
+        started = await self._call(
+            self.store.update, job["id"],
+            expected_status=QUEUED, status=RUNNING, started_at=time.time()
+        )
+        if not started:
+            return _SKIPPED
+        return await self.run_job(job["request"])
+
+    async def _finish(self, job_id: str, **fields: Any) -> None:
+        """Record the outcome of a running job; the first outcome recorded wins."""
+        await self._call(
+            self.store.update, job_id,
+            expected_status=RUNNING, finished_at=time.time(), **fields
+        )
+
+    async def _call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking store call off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: fn(*args, **kwargs))
@@ -2,7 +2,7 @@
 API models for request/response handling.
 """
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -11,6 +11,8 @@ class ContentRequest(BaseModel):
     prompt: str = Field(..., description="Prompt for content generation")
     max_length: Optional[int] = Field(200, description="Maximum length of generated content")
     temperature: Optional[float] = Field(0.7, description="Temperature for generation")
+    num_candidates: Optional[int] = Field(1, ge=1, le=16,
+                                          description="Candidates generated and reviewed per iteration")
     metadata: Optional[Dict] = Field(default_factory=dict, description="Additional metadata")
 
 class ContentResponse(BaseModel):
@@ -19,6 +21,19 @@ class ContentResponse(BaseModel):
     metadata: Dict = Field(..., description="Generation metadata")
     timestamp: datetime = Field(default_factory=datetime.now, description="Generation timestamp")
 
+class JobResponse(BaseModel):
+    """Response model for an asynchronous generation job."""
+    task_id: str = Field(..., description="Job identifier")
+    status: str = Field(..., description="Job status (queued/running/succeeded/failed/cancelled)")
+    created_at: datetime = Field(..., description="Submission time")
+    started_at: Optional[datetime] = Field(None, description="Time a worker picked the job up")
+    finished_at: Optional[datetime] = Field(None, description="Completion time")
+    queue_time: Optional[float] = Field(None, description="Seconds spent waiting for a worker")
+    run_time: Optional[float] = Field(None, description="Seconds spent running")
+    iterations: Optional[int] = Field(None, description="Coordinator iterations used")
+    result: Optional[ContentResponse] = Field(None, description="Generated content once succeeded")
+    error: Optional[str] = Field(None, description="Failure reason")
+
 class ReviewRequest(BaseModel):
     """Request model for content review."""
     content: str = Field(..., description="Content to review")
@@ -27,10 +42,20 @@ class ReviewRequest(BaseModel):
 
 class ReviewResponse(BaseModel):
     """Response model for content review."""
-    feedback: Dict[str, Dict[str, float]] = Field(..., description="Review feedback by aspect")
+    feedback: Dict[str, Dict[str, Any]] = Field(..., description="Review feedback by aspect")
     overall_score: float = Field(..., description="Overall review score")
     timestamp: datetime = Field(default_factory=datetime.now, description="Review timestamp")
 
+class BatchReviewRequest(BaseModel):
+    """Request model for reviewing several contents at once."""
+    contents: List[str] = Field(..., description="Contents to review")
+    aspects: List[str] = Field(default_factory=lambda: ["quality", "relevance", "creativity"],
+                             description="Aspects to review")
+
+class BatchReviewResponse(BaseModel):
+    """Response model for batch content review."""
+    reviews: List[ReviewResponse] = Field(..., description="Reviews in request order")
+
 class TransactionRequest(BaseModel):
     """Request model for blockchain transaction."""
     content_hash: str = Field(..., description="Hash of the content")
@@ -42,4 +67,107 @@ class TransactionResponse(BaseModel):
     tx_hash: str = Field(..., description="Transaction hash")
     status: str = Field(..., description="Transaction status")
     timestamp: datetime = Field(default_factory=datetime.now, description="Transaction timestamp")
-    metadata: Optional[Dict] = Field(default_factory=dict, description="Transaction metadata") 
\ No newline at end of file
+    metadata: Optional[Dict] = Field(default_factory=dict, description="Transaction metadata")
+
+class BulkOwnershipRequest(BaseModel):
+    """Request model for looking up the owners of many contents."""
+    content_hashes: List[str] = Field(..., min_items=1, max_items=10000,
+                                      description="Content hashes, as given at registration")
+    address: Optional[str] = Field(None, description="Address to verify ownership for")
+    include_metadata: bool = Field(False, description="Also fetch the registered metadata")
+
+class ContentOwnership(BaseModel):
+    """Ownership of one content in a bulk lookup."""
+    content_hash: str = Field(..., description="Content hash as requested")
+    owner: Optional[str] = Field(None, description="Owner address")
+    verified: Optional[bool] = Field(None, description="Whether the requested address is the owner")
+    metadata: Optional[str] = Field(None, description="Registered metadata")
+    error: Optional[str] = Field(None, description="Why the lookup failed")
+
+class BulkOwnershipResponse(BaseModel):
+    """Response model for a bulk ownership lookup."""
+    results: List[ContentOwnership] = Field(..., description="Lookups in request order")
+    failed: int = Field(..., description="Number of failed lookups")
+
+class OwnershipEvent(BaseModel):
+    """Indexed registration or transfer of a content."""
+    event: str = Field(..., description="ContentRegistered or OwnershipTransferred")
+    content_hash: str = Field(..., description="Content hash as stored on chain")
+    owner: Optional[str] = Field(None, description="Owner after the event")
+    previous_owner: Optional[str] = Field(None, description="Owner before a transfer")
+    metadata: Optional[str] = Field(None, description="Metadata given at registration")
+    block_number: int = Field(..., description="Block of the event")
+    tx_hash: str = Field(..., description="Transaction hash")
+
+class OwnedContentResponse(BaseModel):
+    """Response model for the contents owned by an address."""
+    address: str = Field(..., description="Owner address")
+    contents: List[OwnershipEvent] = Field(..., description="Latest event of every owned content")
+    synced_block: Optional[int] = Field(None, description="Last block included in the index")
+
+class OwnershipHistoryResponse(BaseModel):
+    """Response model for the ownership history of a content."""
+    content_hash: str = Field(..., description="Content hash as requested")
+    events: List[OwnershipEvent] = Field(..., description="Events, oldest first")
+    synced_block: Optional[int] = Field(None, description="Last block included in the index")
+
+class AnchorRequest(BaseModel):
+    """Request model for queueing content hashes for batched anchoring."""
+    content_hashes: List[str] = Field(..., min_items=1, max_items=10000,
+                                      description="Content hashes, as given at registration")
+
+class AnchorResponse(BaseModel):
+    """Response model for queued content hashes."""
+    accepted: int = Field(..., description="Content hashes queued by this request")
+    queued: int = Field(..., description="Content hashes waiting for the next batches")
+
+class AnchorProof(BaseModel):
+    """Inclusion proof of a content hash in an anchored batch."""
+    batch_id: int = Field(..., description="Batch identifier")
+    root: str = Field(..., description="Merkle root, registered as a content hash")
+    leaf_index: int = Field(..., description="Position of the content hash in the batch")
+    proof: List[str] = Field(..., description="Sibling hashes from the leaf up")
+    size: int = Field(..., description="Content hashes in the batch")
+    tx_hash: str = Field(..., description="Transaction registering the root")
+
+class AnchorProofResponse(BaseModel):
+    """Response model for the inclusion proofs of a content hash."""
+    content_hash: str = Field(..., description="Content hash as requested")
+    proofs: List[AnchorProof] = Field(..., description="Proofs of every batch including it, oldest first")
+
+class VerifyAnchorRequest(BaseModel):
+    """Request model for checking an inclusion proof."""
+    content_hash: str = Field(..., description="Content hash, as given at registration")
+    proof: Optional[List[str]] = Field(None, description="Sibling hashes; the stored proof if omitted")
+    root: Optional[str] = Field(None, description="Merkle root; the stored root if omitted")
+
+class VerifyAnchorResponse(BaseModel):
+    """Response model for a checked inclusion proof."""
+    content_hash: str = Field(..., description="Content hash as requested")
+    root: str = Field(..., description="Merkle root checked against")
+    valid: bool = Field(..., description="Whether the proof leads to the root")
+    anchored: bool = Field(..., description="Whether the root is registered on chain")
+    owner: Optional[str] = Field(None, description="Address that registered the root")
+
+class SignedMessage(BaseModel):
+    """A message with its signature and claimed signer."""
+    message: str = Field(..., description="Original message")
+    signature: Dict[str, int] = Field(..., description="Signature components r, s and v")
+    address: str = Field(..., description="Address expected to have signed the message")
+
+class VerifySignaturesRequest(BaseModel):
+    """Request model for verifying signed messages in bulk."""
+    items: List[SignedMessage] = Field(..., min_items=1, max_items=10000,
+                                       description="Signed messages to verify")
+
+class SignatureResult(BaseModel):
+    """Verification result of one signed message."""
+    valid: bool = Field(False, description="Whether the address signed the message")
+    signer: Optional[str] = Field(None, description="Address recovered from the signature")
+    error: Optional[str] = Field(None, description="Why the signature couldn't be recovered")
+
+class VerifySignaturesResponse(BaseModel):
+    """Response model for signed messages verified in bulk."""
+    results: List[SignatureResult] = Field(..., description="Results in request order")
+    invalid: int = Field(..., description="Signatures recovered to another address")
+    failed: int = Field(..., description="Signatures that couldn't be recovered")
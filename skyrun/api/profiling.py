@@ -0,0 +1,214 @@
+"""
+On-demand sampling profiler for individual API requests.
+"""
+
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from types import FrameType
+import asyncio
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+from fastapi import Request, Response
+
+from ..core.logging import get_logger, request_id_var
+
+logger = get_logger(__name__)
+
+# Threads parked in these modules are waiting for work, not doing any for the request
+_IDLE_MODULES = ("threading", "queue", "selectors")
+_IDLE_FRAMES = ("concurrent.futures.thread:_worker",)
+
+def _frame_name(frame: FrameType) -> str:
+    """Name of a frame as ``module:qualified.function``."""
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}".replace(";", ":")
+
+class _Sampler(threading.Thread):
+    """Samples the stacks of every thread until stopped.
+
+    Stacks are counted in collapsed form, root first, under the name of the
+    thread they were sampled from. Threads other than the event loop's are
+    skipped while idle, so executor threads only show up while they run
+    something.
+    """
+
+    def __init__(self, loop_thread: int, interval: float, max_seconds: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.loop_thread = loop_thread
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._names: Dict[int, str] = {}
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        deadline = time.monotonic() + self.max_seconds
+        own = threading.get_ident()
+        while not self._stopped.wait(self.interval) and time.monotonic() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = self._collapse(frame)
+                if ident != self.loop_thread and stack[-1].startswith(_IDLE_MODULES + _IDLE_FRAMES):
+                    continue
+                self.stacks[";".join([self._thread_name(ident)] + stack)] += 1
+            self.samples += 1
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the last sample."""
+        self._stopped.set()
+        self.join()
+
+    def _thread_name(self, ident: int) -> str:
+        """Name of a thread, looked up again only for threads not seen before."""
+        if ident not in self._names:
+            self._names = {thread.ident: thread.name for thread in threading.enumerate()}
+        return self._names.get(ident, str(ident)).replace(";", ":")
+
+    @staticmethod
+    def _collapse(frame: FrameType) -> List[str]:
+        """Frame names of a stack, outermost first."""
+        stack = []
+        current: Optional[FrameType] = frame
+        while current is not None:
+            stack.append(_frame_name(current))
+            current = current.f_back
+        stack.reverse()
+        return stack
+
+class RequestProfiler:
+    """Middleware profiling selected requests into collapsed-stack files.
+
+    A request is profiled when it carries ``X-Profile`` set to the
+    configured token, or otherwise with probability ``sample_rate``. While
+    it runs, a sampler thread records the stacks of every thread, executor
+    threads included, every ``interval_ms``; the counts are written as one
+    ``<stack> <count>`` line per stack to ``<path>/<time>-<request id>.folded``,
+    the input format of ``flamegraph.pl``, speedscope and inferno.
+
+    Only one request is profiled at a time, and threads are not tied to
+    requests, so concurrent requests may show up in the same profile. The
+    response carries the profile's file name in ``X-Profile``.
+    """
+
+    HEADER = "X-Profile"
+
+    def __init__(
+        self,
+        path: str,
+        token: str = "",
+        sample_rate: float = 0.0,
+        interval_ms: float = 5.0,
+        max_seconds: float = 60.0
+    ):
+        """Initialize the profiler.
+
+        Args:
+            path: Directory of the profiles
+            token: Value of ``X-Profile`` that requests a profile; empty
+                disables the header
+            sample_rate: Fraction of other requests profiled
+            interval_ms: Interval between stack samples
+            max_seconds: Longest a profile keeps sampling
+        """
+        self.path = path
+        self.token = token
+        self.sample_rate = max(0.0, min(1.0, float(sample_rate)))
+        self.interval = max(0.1, float(interval_ms)) / 1000.0
+        self.max_seconds = float(max_seconds)
+        self._sampler: Optional[_Sampler] = None
+        self._profiles = 0
+        self._skipped = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], storage_path: str, token: str = "") -> "RequestProfiler":
+        """Create a profiler from the ``profiling`` configuration.
+
+        Args:
+            config: Dictionary with optional ``sample_rate``, ``interval_ms``,
+                ``max_seconds`` and ``path`` keys
+            storage_path: Storage directory, holding ``profiles`` unless
+                ``path`` is set
+            token: Value of ``X-Profile`` that requests a profile
+
+        Returns:
+            RequestProfiler instance
+        """
+        return cls(
+            path=config.get("path") or os.path.join(storage_path, "profiles"),
+            token=token,
+            sample_rate=config.get("sample_rate", 0.0),
+            interval_ms=config.get("interval_ms", 5.0),
+            max_seconds=config.get("max_seconds", 60.0)
+        )
+
+    @property
+    def active(self) -> bool:
+        """Whether any request can be profiled."""
+        return bool(self.token) or self.sample_rate > 0
+
+    async def middleware(
+        self,
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        """Profile the request if it is selected."""
+        if not self._selected(request):
+            return await call_next(request)
+        if self._sampler is not None and self._sampler.is_alive():
+            self._skipped += 1
+            return await call_next(request)
+
+        request_id = request_id_var.get() or f"{time.time_ns():x}"
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{re.sub(r'[^A-Za-z0-9_.-]', '_', request_id)}.folded"
+        sampler = _Sampler(threading.get_ident(), self.interval, self.max_seconds)
+        self._sampler = sampler
+        sampler.start()
+        try:
+            response = await call_next(request)
+        finally:
+            await asyncio.get_running_loop().run_in_executor(None, self._finish, sampler, name, request)
+        response.headers[self.HEADER] = name
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        """Get profiler statistics.
+
+        Returns:
+            Dictionary of profiler statistics
+        """
+        return {
+            "path": self.path,
+            "sample_rate": self.sample_rate,
+            "profiles": self._profiles,
+            "skipped": self._skipped
+        }
+
+    def _selected(self, request: Request) -> bool:
+        """Whether a request asked for a profile or was sampled."""
+        header = request.headers.get(self.HEADER)
+        # Headers are decoded as latin-1; compare_digest only takes ASCII strings
+        if header and self.token and hmac.compare_digest(header.encode("latin-1"), self.token.encode()):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _finish(self, sampler: _Sampler, name: str, request: Request) -> None:
+        """Stop sampling and write the profile; blocking, runs on the executor."""
+        sampler.stop()
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, name), "w") as f:
+            for stack, count in sorted(sampler.stacks.items()):
+                f.write(f"{stack} {count}\n")
+        self._profiles += 1
+        logger.info(
+            f"Profiled {request.method} {request.url.path}: "
+            f"{sampler.samples} samples written to {name}"
+        )
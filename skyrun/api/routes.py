@@ -2,46 +2,163 @@
 API routes for handling requests.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict, List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Any, AsyncIterator, Dict, List, Optional
+from datetime import datetime
+import asyncio
 import hashlib
+import json
 
 from .models import (
     ContentRequest,
     ContentResponse,
+    JobResponse,
     ReviewRequest,
     ReviewResponse,
+    BatchReviewRequest,
+    BatchReviewResponse,
     TransactionRequest,
-    TransactionResponse
+    TransactionResponse,
+    BulkOwnershipRequest,
+    BulkOwnershipResponse,
+    ContentOwnership,
+    OwnedContentResponse,
+    OwnershipEvent,
+    OwnershipHistoryResponse,
+    AnchorRequest,
+    AnchorResponse,
+    AnchorProof,
+    AnchorProofResponse,
+    VerifyAnchorRequest,
+    VerifyAnchorResponse,
+    VerifySignaturesRequest,
+    VerifySignaturesResponse,
+    SignatureResult
 )
-from ..agents import CoordinatorAgent
+from ..agents.registry import AgentRegistry
+from ..agents.coordinator import CoordinatorAgent
+from ..agents.executor import InferenceQueueFullError
+from .jobs import JobManager
 from ..blockchain import ContentRegistry, Wallet, Transaction
+from ..blockchain.anchor import ContentAnchor
+from ..blockchain.bulk import BulkReader
+from ..blockchain.indexer import EventIndexer
+from ..blockchain.nonce import TransactionSubmitter
+from ..blockchain.provider import Web3Provider
+from ..blockchain.read_cache import ContentReadCache
+from ..blockchain.receipts import ReceiptTracker
+from ..blockchain.signer import Signer
+from ..blockchain.verifier import SignatureVerifier
+from ..config import config
+from ..core.config import get_config
 
 router = APIRouter()
 
 # Dependency injection
-async def get_coordinator() -> CoordinatorAgent:
-    """Get the coordinator agent instance."""
-    # In a real implementation, this would be properly initialized and managed
-    coordinator = CoordinatorAgent("main_coordinator")
-    await coordinator.initialize()
-    return coordinator
-
-async def get_registry() -> ContentRegistry:
-    """Get the content registry contract instance."""
-    # In a real implementation, this would be properly initialized
-    from web3 import Web3
-    web3 = Web3(Web3.HTTPProvider('http://localhost:8545'))
-    contract_address = "0x..."  # Would be properly configured
-    contract_abi = []  # Would be properly loaded
-    return ContentRegistry(web3, contract_address, contract_abi)
-
-async def get_wallet() -> Wallet:
-    """Get the wallet instance."""
-    # In a real implementation, this would be properly initialized
-    from web3 import Web3
-    web3 = Web3(Web3.HTTPProvider('http://localhost:8545'))
-    return Wallet(web3)
+async def get_agent_registry(request: Request) -> AgentRegistry:
+    """Get the process-wide agent registry attached to the application."""
+    registry = getattr(request.app.state, "agent_registry", None)
+    if registry is None:
+        raise HTTPException(status_code=503, detail="Agent registry is not available")
+    return registry
+
+async def get_coordinator(
+    registry: AgentRegistry = Depends(get_agent_registry)
+) -> CoordinatorAgent:
+    """Get the shared coordinator agent instance."""
+    return await registry.get_coordinator()
+
+async def get_job_manager(request: Request) -> JobManager:
+    """Get the job manager attached to the application."""
+    manager = getattr(request.app.state, "job_manager", None)
+    if manager is None:
+        raise HTTPException(status_code=503, detail="Job manager is not available")
+    return manager
+
+async def get_web3_provider(request: Request) -> Web3Provider:
+    """Get the shared Web3 provider attached to the application."""
+    provider = getattr(request.app.state, "web3_provider", None)
+    if provider is None:
+        raise HTTPException(status_code=503, detail="Web3 provider is not available")
+    return provider
+
+async def get_submitter(request: Request) -> Optional[TransactionSubmitter]:
+    """Get the shared transaction submitter, which owns the local nonces."""
+    return getattr(request.app.state, "tx_submitter", None)
+
+async def get_signer(request: Request) -> Optional[Signer]:
+    """Get the shared signer, which signs off the event loop."""
+    return getattr(request.app.state, "signer", None)
+
+async def get_verifier(request: Request) -> SignatureVerifier:
+    """Get the shared verifier, which recovers signers on a process pool."""
+    verifier = getattr(request.app.state, "signature_verifier", None)
+    if verifier is None:
+        raise HTTPException(status_code=503, detail="Signature verifier is not available")
+    return verifier
+
+async def get_receipt_tracker(request: Request) -> Optional[ReceiptTracker]:
+    """Get the shared receipt tracker, which watches blocks for all waiters."""
+    return getattr(request.app.state, "receipt_tracker", None)
+
+async def get_bulk_reader(request: Request) -> Optional[BulkReader]:
+    """Get the shared bulk reader, which batches read calls."""
+    return getattr(request.app.state, "bulk_reader", None)
+
+async def get_read_cache(request: Request) -> Optional[ContentReadCache]:
+    """Get the shared read cache of ContentRegistry view calls."""
+    return getattr(request.app.state, "read_cache", None)
+
+async def get_indexer(request: Request) -> EventIndexer:
+    """Get the local index of ContentRegistry events."""
+    indexer = getattr(request.app.state, "event_indexer", None)
+    if indexer is None:
+        raise HTTPException(status_code=503, detail="Event indexer is not available")
+    return indexer
+
+async def get_anchor(request: Request) -> ContentAnchor:
+    """Get the service anchoring content hashes in Merkle batches."""
+    anchor = getattr(request.app.state, "content_anchor", None)
+    if anchor is None:
+        raise HTTPException(status_code=503, detail="Content anchoring is not available")
+    return anchor
+
+async def get_registry(
+    provider: Web3Provider = Depends(get_web3_provider),
+    submitter: Optional[TransactionSubmitter] = Depends(get_submitter),
+    reader: Optional[BulkReader] = Depends(get_bulk_reader),
+    cache: Optional[ContentReadCache] = Depends(get_read_cache)
+) -> ContentRegistry:
+    """Get the content registry contract on the shared async client."""
+    web3 = await provider.connect()
+    return ContentRegistry(
+        web3,
+        config["CONTRACT_ADDRESS"],
+        config["CONTRACT_ABI"],
+        submitter=submitter,
+        reader=reader,
+        cache=cache
+    )
+
+async def get_wallet(
+    provider: Web3Provider = Depends(get_web3_provider),
+    submitter: Optional[TransactionSubmitter] = Depends(get_submitter),
+    reader: Optional[BulkReader] = Depends(get_bulk_reader),
+    signer: Optional[Signer] = Depends(get_signer)
+) -> Wallet:
+    """Get the wallet instance on the shared async client."""
+    web3 = await provider.connect()
+    return Wallet(web3, submitter=submitter, reader=reader, signer=signer)
+
+@router.get("/ready")
+async def readiness(registry: AgentRegistry = Depends(get_agent_registry)) -> JSONResponse:
+    """Report whether the models are loaded and warmed up.
+    
+    Responds with 503 until then, so load balancers hold traffic back.
+    """
+    state = registry.readiness()
+    return JSONResponse(state, status_code=200 if state["status"] == "ready" else 503)
 
 @router.post("/content/generate", response_model=ContentResponse)
 async def generate_content(
@@ -54,6 +171,7 @@ async def generate_content(
             "prompt": request.prompt,
             "max_length": request.max_length,
             "temperature": request.temperature,
+            "num_candidates": request.num_candidates,
             "metadata": request.metadata
         })
         
@@ -62,9 +180,114 @@ async def generate_content(
             metadata=result["best_result"]["metadata"],
             timestamp=result["best_result"]["metadata"]["timestamp"]
         )
+    except InferenceQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/content/jobs", response_model=JobResponse, status_code=202)
+async def submit_generation_job(
+    request: ContentRequest,
+    manager: JobManager = Depends(get_job_manager)
+) -> JobResponse:
+    """Queue a generation job and return its task ID immediately."""
+    job = await manager.submit({
+        "prompt": request.prompt,
+        "max_length": request.max_length,
+        "temperature": request.temperature,
+        "num_candidates": request.num_candidates,
+        "metadata": request.metadata
+    })
+    return _to_job_response(job)
+
+@router.get("/content/jobs/{task_id}", response_model=JobResponse)
+async def get_generation_job(
+    task_id: str,
+    manager: JobManager = Depends(get_job_manager)
+) -> JobResponse:
+    """Get the status, timings and result of a generation job."""
+    job = await manager.get(task_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown task: {task_id}")
+    return _to_job_response(job)
+
+@router.delete("/content/jobs/{task_id}", response_model=JobResponse)
+async def cancel_generation_job(
+    task_id: str,
+    manager: JobManager = Depends(get_job_manager)
+) -> JobResponse:
+    """Cancel a queued or running generation job."""
+    job = await manager.cancel(task_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown task: {task_id}")
+    return _to_job_response(job)
+
+def _to_job_response(job: Dict) -> JobResponse:
+    """Build a job response from a stored job."""
+    result = None
+    best_result = (job["result"] or {}).get("best_result")
+    if best_result:
+        result = ContentResponse(
+            content=best_result["content"],
+            metadata=best_result["metadata"],
+            timestamp=best_result["metadata"]["timestamp"]
+        )
+    
+    return JobResponse(
+        task_id=job["id"],
+        status=job["status"],
+        created_at=datetime.fromtimestamp(job["created_at"]),
+        started_at=datetime.fromtimestamp(job["started_at"]) if job["started_at"] else None,
+        finished_at=datetime.fromtimestamp(job["finished_at"]) if job["finished_at"] else None,
+        queue_time=job["queue_time"],
+        run_time=job["run_time"],
+        iterations=job["iterations"],
+        result=result,
+        error=job["error"]
+    )
+
+@router.post("/content/generate/stream")
+async def generate_content_stream(
+    request: ContentRequest,
+    coordinator: CoordinatorAgent = Depends(get_coordinator)
+) -> StreamingResponse:
+    """Stream generated content as server-sent events.
+    
+    Emits ``token`` events while decoding, then a ``review`` event with the
+    verdict on the full content and a final ``done`` event with metadata.
+    """
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event in coordinator.creative_agent.stream({
+                "prompt": request.prompt,
+                "max_length": request.max_length,
+                "temperature": request.temperature
+            }):
+                if event["type"] == "token":
+                    yield _sse("token", {"text": event["text"]})
+                    continue
+                
+                review = await coordinator.reviewer_agent.process({
+                    "content": event["generated_content"]
+                })
+                yield _sse("review", json.loads(_to_review_response(review).json()))
+                yield _sse("done", {
+                    "content": event["generated_content"],
+                    "metadata": event["metadata"]
+                })
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _sse(event: str, data: Dict) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @router.post("/content/review", response_model=ReviewResponse)
 async def review_content(
     request: ReviewRequest,
@@ -77,23 +300,70 @@ async def review_content(
             "review_aspects": request.aspects
         })
         
-        # Calculate overall score
-        scores = [review["score"] for review in result["feedback"].values()]
-        overall_score = sum(scores) / len(scores)
+        return _to_review_response(result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except InferenceQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/content/review/batch", response_model=BatchReviewResponse)
+async def review_content_batch(
+    request: BatchReviewRequest,
+    coordinator: CoordinatorAgent = Depends(get_coordinator)
+) -> BatchReviewResponse:
+    """Review several contents with a single model call."""
+    try:
+        results = await coordinator.reviewer_agent.process_batch(
+            request.contents,
+            request.aspects
+        )
         
-        return ReviewResponse(
-            feedback=result["feedback"],
-            overall_score=overall_score,
-            timestamp=datetime.now()
+        return BatchReviewResponse(
+            reviews=[_to_review_response(result) for result in results]
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except InferenceQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/content/generate/cache")
+async def prefix_cache_stats(
+    coordinator: CoordinatorAgent = Depends(get_coordinator)
+) -> Dict:
+    """Get statistics of the creative agent's prompt-prefix cache."""
+    cache = coordinator.creative_agent.prefix_cache
+    return {"enabled": cache is not None, **(cache.stats() if cache else {})}
+
+@router.get("/content/review/cache")
+async def review_cache_stats(
+    coordinator: CoordinatorAgent = Depends(get_coordinator)
+) -> Dict:
+    """Get hit/miss statistics of the review cache."""
+    cache = coordinator.reviewer_agent.cache
+    return {"enabled": cache is not None, **(cache.stats() if cache else {})}
+
+def _to_review_response(result: Dict) -> ReviewResponse:
+    """Build a review response from a reviewer agent result."""
+    # Calculate overall score
+    scores = [review["score"] for review in result["feedback"].values()]
+    overall_score = sum(scores) / len(scores)
+    
+    return ReviewResponse(
+        feedback=result["feedback"],
+        overall_score=overall_score,
+        timestamp=datetime.now()
+    )
+
 @router.post("/content/register", response_model=TransactionResponse)
 async def register_content(
     request: TransactionRequest,
     registry: ContentRegistry = Depends(get_registry),
-    wallet: Wallet = Depends(get_wallet)
+    wallet: Wallet = Depends(get_wallet),
+    tracker: Optional[ReceiptTracker] = Depends(get_receipt_tracker)
 ) -> TransactionResponse:
     """Register content on the blockchain."""
     try:
@@ -101,22 +371,14 @@ async def register_content(
         content_hash = hashlib.sha256(request.content_hash.encode()).hexdigest()
         
         # Register content
-        tx_hash = registry.register_content(
+        tx_hash = await registry.register_content_async(
             content_hash=content_hash,
             owner=wallet.account.address,
-            metadata=request.metadata
+            metadata=request.metadata,
+            private_key=wallet.account.key
         )
         
-        # Create transaction object
-        tx = Transaction(wallet.web3, tx_hash)
-        receipt = tx.wait_for_receipt()
-        
-        return TransactionResponse(
-            tx_hash=tx_hash,
-            status=tx.get_status(),
-            timestamp=datetime.now(),
-            metadata=request.metadata
-        )
+        return await _transaction_response(tx_hash, wallet.web3, tracker, request.metadata)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -124,7 +386,8 @@ async def register_content(
 async def transfer_content(
     request: TransactionRequest,
     registry: ContentRegistry = Depends(get_registry),
-    wallet: Wallet = Depends(get_wallet)
+    wallet: Wallet = Depends(get_wallet),
+    tracker: Optional[ReceiptTracker] = Depends(get_receipt_tracker)
 ) -> TransactionResponse:
     """Transfer content ownership on the blockchain."""
     try:
@@ -132,21 +395,248 @@ async def transfer_content(
         content_hash = hashlib.sha256(request.content_hash.encode()).hexdigest()
         
         # Transfer ownership
-        tx_hash = registry.transfer_ownership(
+        tx_hash = await registry.transfer_ownership_async(
             content_hash=content_hash,
             from_address=wallet.account.address,
-            to_address=request.metadata.get("to_address")
+            to_address=request.metadata.get("to_address"),
+            private_key=wallet.account.key
         )
         
-        # Create transaction object
-        tx = Transaction(wallet.web3, tx_hash)
-        receipt = tx.wait_for_receipt()
+        return await _transaction_response(tx_hash, wallet.web3, tracker, request.metadata)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) 
+
+@router.post("/content/ownership/bulk", response_model=BulkOwnershipResponse)
+async def get_content_ownership_bulk(
+    request: BulkOwnershipRequest,
+    registry: ContentRegistry = Depends(get_registry)
+) -> BulkOwnershipResponse:
+    """Look up the owners of many contents with batched reads."""
+    try:
+        # Contents are registered under the hash of the given hash
+        hashes = [hashlib.sha256(content_hash.encode()).hexdigest() for content_hash in request.content_hashes]
+        lookups = [registry.get_content_owner_bulk_async(hashes)]
+        if request.include_metadata:
+            lookups.append(registry.get_content_metadata_bulk_async(hashes))
+        owners, *metadata = await asyncio.gather(*lookups)
+        
+        results = []
+        for i, content_hash in enumerate(request.content_hashes):
+            owner = owners[i]
+            result = ContentOwnership(content_hash=content_hash)
+            if owner["success"]:
+                result.owner = owner["result"]
+                if request.address is not None:
+                    result.verified = owner["result"].lower() == request.address.lower()
+            else:
+                result.error = owner["error"]
+            if metadata:
+                if metadata[0][i]["success"]:
+                    result.metadata = metadata[0][i]["result"]
+                else:
+                    result.error = result.error or metadata[0][i]["error"]
+            results.append(result)
         
-        return TransactionResponse(
-            tx_hash=tx_hash,
-            status=tx.get_status(),
-            timestamp=datetime.now(),
-            metadata=request.metadata
+        return BulkOwnershipResponse(
+            results=results,
+            failed=sum(1 for result in results if result.error is not None)
         )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/content/owned/{address}", response_model=OwnedContentResponse)
+async def get_owned_content(
+    address: str,
+    indexer: EventIndexer = Depends(get_indexer)
+) -> OwnedContentResponse:
+    """List the contents an address owns, from the local event index."""
+    try:
+        events = indexer.owned_by(address)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return OwnedContentResponse(
+        address=address,
+        contents=[OwnershipEvent(**event) for event in events],
+        synced_block=indexer.synced_block
+    )
+
+@router.get("/content/history/{content_hash}", response_model=OwnershipHistoryResponse)
+async def get_ownership_history(
+    content_hash: str,
+    indexer: EventIndexer = Depends(get_indexer)
+) -> OwnershipHistoryResponse:
+    """Get the registration and transfers of a content, from the local event index."""
+    # Contents are registered under the hash of the given hash
+    events = indexer.history(hashlib.sha256(content_hash.encode()).hexdigest())
+    return OwnershipHistoryResponse(
+        content_hash=content_hash,
+        events=[OwnershipEvent(**event) for event in events],
+        synced_block=indexer.synced_block
+    )
+
+@router.get("/blockchain/indexer")
+async def event_indexer_stats(
+    indexer: EventIndexer = Depends(get_indexer)
+) -> Dict:
+    """Get the sync state of the local event index."""
+    return indexer.stats()
+
+@router.post("/content/anchor", response_model=AnchorResponse, status_code=202)
+async def anchor_content(
+    request: AnchorRequest,
+    anchor: ContentAnchor = Depends(get_anchor)
+) -> AnchorResponse:
+    """Queue content hashes to be registered under a shared Merkle root."""
+    # Contents are registered under the hash of the given hash
+    hashes = [hashlib.sha256(content_hash.encode()).hexdigest() for content_hash in request.content_hashes]
+    queued = anchor.add(hashes)
+    return AnchorResponse(accepted=len(hashes), queued=queued)
+
+@router.get("/content/anchor/{content_hash}", response_model=AnchorProofResponse)
+async def get_anchor_proofs(
+    content_hash: str,
+    anchor: ContentAnchor = Depends(get_anchor)
+) -> AnchorProofResponse:
+    """Get the inclusion proofs of an anchored content hash."""
+    records = anchor.proofs(hashlib.sha256(content_hash.encode()).hexdigest())
+    return AnchorProofResponse(
+        content_hash=content_hash,
+        proofs=[AnchorProof(**record) for record in records]
+    )
+
+@router.post("/content/anchor/verify", response_model=VerifyAnchorResponse)
+async def verify_anchor(
+    request: VerifyAnchorRequest,
+    anchor: ContentAnchor = Depends(get_anchor)
+) -> VerifyAnchorResponse:
+    """Check an inclusion proof against its root and the root's registration."""
+    content_hash = hashlib.sha256(request.content_hash.encode()).hexdigest()
+    proof, root = request.proof, request.root
+    if proof is None or root is None:
+        records = anchor.proofs(content_hash)
+        if not records:
+            raise HTTPException(status_code=404, detail="Content hash has not been anchored")
+        proof = records[-1]["proof"] if proof is None else proof
+        root = records[-1]["root"] if root is None else root
+    try:
+        result = await anchor.verify(content_hash, proof, root)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return VerifyAnchorResponse(**{**result, "content_hash": request.content_hash})
+
+@router.get("/blockchain/anchor")
+async def anchor_stats(
+    anchor: ContentAnchor = Depends(get_anchor)
+) -> Dict:
+    """Get anchoring statistics."""
+    return anchor.stats()
+
+@router.get("/blockchain/bulk")
+async def bulk_reader_stats(
+    reader: Optional[BulkReader] = Depends(get_bulk_reader),
+    provider: Web3Provider = Depends(get_web3_provider)
+) -> Dict:
+    """Get statistics of batched reads."""
+    if reader is None:
+        raise HTTPException(status_code=503, detail="Bulk reader is not available")
+    return {**reader.stats(), "provider": provider.stats()}
+
+@router.get("/blockchain/read-cache")
+async def read_cache_stats(
+    cache: Optional[ContentReadCache] = Depends(get_read_cache)
+) -> Dict:
+    """Get hit rates of the ContentRegistry read cache."""
+    if cache is None:
+        raise HTTPException(status_code=503, detail="Read cache is not available")
+    return cache.stats()
+
+async def _transaction_response(
+    tx_hash: str,
+    web3: Any,
+    tracker: Optional[ReceiptTracker],
+    metadata: Optional[Dict]
+) -> TransactionResponse:
+    """Wait a bounded time for a receipt; a slower transaction is reported as pending."""
+    tx = Transaction(web3, tx_hash, tracker=tracker)
+    wait_timeout = get_config().get("blockchain", {}).get("receipts", {}).get("wait_timeout", 30)
+    try:
+        await tx.wait_for_receipt_async(timeout=wait_timeout)
+    except asyncio.TimeoutError:
+        pass
+    
+    return TransactionResponse(
+        tx_hash=tx_hash,
+        status=tx.get_status(),
+        timestamp=datetime.now(),
+        metadata=metadata
+    )
+
+@router.get("/blockchain/transactions/{tx_hash}")
+async def get_transaction_status(
+    tx_hash: str,
+    web3_provider: Web3Provider = Depends(get_web3_provider)
+) -> Dict:
+    """Get the status of a transaction, e.g. one reported as pending."""
+    try:
+        tx = Transaction(web3_provider.web3, tx_hash)
+        await tx.get_receipt_async()
+        # Logs hold raw bytes; they're indexed separately
+        return {key: value for key, value in tx.to_dict().items() if key != "logs"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/blockchain/receipts")
+async def receipt_tracker_stats(
+    tracker: Optional[ReceiptTracker] = Depends(get_receipt_tracker)
+) -> Dict:
+    """Get statistics of the shared receipt tracker."""
+    if tracker is None:
+        raise HTTPException(status_code=503, detail="Receipt tracker is not available")
+    return tracker.stats()
+
+@router.get("/blockchain/fees")
+async def fee_stats(
+    submitter: Optional[TransactionSubmitter] = Depends(get_submitter)
+) -> Dict:
+    """Get the cached fees and how gas limits compare with gas used."""
+    if submitter is None:
+        raise HTTPException(status_code=503, detail="Transaction submitter is not available")
+    return {**submitter.fees.stats(), "submitter": submitter.stats()}
+
+@router.get("/blockchain/signer")
+async def signer_stats(
+    signer: Optional[Signer] = Depends(get_signer)
+) -> Dict:
+    """Get the signer's unlocked keys and signing counters."""
+    if signer is None:
+        raise HTTPException(status_code=503, detail="Signer is not available")
+    return signer.stats()
+
+@router.post("/blockchain/signatures/verify", response_model=VerifySignaturesResponse)
+async def verify_signatures(
+    request: VerifySignaturesRequest,
+    verifier: SignatureVerifier = Depends(get_verifier)
+) -> VerifySignaturesResponse:
+    """Check that many messages were signed by their claimed addresses."""
+    items = await verifier.verify_batch([
+        (item.message, item.signature, item.address) for item in request.items
+    ])
+    results = [
+        SignatureResult(valid=item["result"], signer=item["signer"])
+        if item["success"] else SignatureResult(error=item["error"])
+        for item in items
+    ]
+    return VerifySignaturesResponse(
+        results=results,
+        invalid=sum(1 for result in results if result.signer is not None and not result.valid),
+        failed=sum(1 for result in results if result.error is not None)
+    )
+
+@router.get("/blockchain/signatures")
+async def verifier_stats(
+    verifier: SignatureVerifier = Depends(get_verifier)
+) -> Dict:
+    """Get signature verification counters and cache hits."""
+    return verifier.stats()
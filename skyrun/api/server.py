@@ -2,12 +2,36 @@
 API server implementation.
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
+import os
+import uuid
 import uvicorn
-from typing import Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
 
+from .jobs import JobManager, JobStore, sqlite_path
+from .profiling import RequestProfiler
 from .routes import router
+from ..agents.registry import AgentRegistry
+from ..blockchain.anchor import AnchorStore, ContentAnchor
+from ..blockchain.bulk import BulkReader
+from ..blockchain.contracts import ContentRegistry
+from ..blockchain.fees import FeeOracle
+from ..blockchain.indexer import EventIndexer, EventStore
+from ..blockchain.nonce import TransactionSubmitter
+from ..blockchain.provider import Web3Provider
+from ..blockchain.read_cache import ContentReadCache
+from ..blockchain.receipts import ReceiptTracker
+from ..blockchain.signer import Signer
+from ..blockchain.verifier import SignatureVerifier
+from ..config import config
+from ..core.config import get_config
+from ..core.logging import get_logger, request_id_var
+from ..core.metrics import start_metrics_server, track_queue
+
+logger = get_logger(__name__)
 
 class APIServer:
     """API server for the SkyRun platform."""
@@ -19,7 +43,8 @@ class APIServer:
         debug: bool = False,
         title: str = "SkyRun API",
         description: str = "API for the SkyRun decentralized AI creative platform",
-        version: str = "0.1.0"
+        version: str = "0.1.0",
+        agent_registry: Optional[AgentRegistry] = None
     ):
         """Initialize the API server.
         
@@ -30,16 +55,31 @@ class APIServer:
             title: API title
             description: API description
             version: API version
+            agent_registry: Optional agent registry, created from the global
+                configuration if not provided
         """
         self.host = host
         self.port = port
         self.debug = debug
+        self.agent_registry = agent_registry or AgentRegistry(self._agent_config())
         
         self.app = FastAPI(
             title=title,
             description=description,
-            version=version
+            version=version,
+            lifespan=self._lifespan
         )
+        self.app.state.agent_registry = self.agent_registry
+        self.job_manager: Optional[JobManager] = None
+        self.receipt_tracker: Optional[ReceiptTracker] = None
+        self.read_cache: Optional[ContentReadCache] = None
+        self.event_indexer: Optional[EventIndexer] = None
+        self.content_anchor: Optional[ContentAnchor] = None
+        self.signer: Optional[Signer] = None
+        self.signature_verifier: Optional[SignatureVerifier] = None
+        self.web3_provider = Web3Provider.from_config(get_config().get("blockchain", {}))
+        self.app.state.web3_provider = self.web3_provider
+        self._startup_task: Optional[asyncio.Task] = None
         
         # Add CORS middleware
         self.app.add_middleware(
@@ -50,16 +90,235 @@ class APIServer:
             allow_headers=["*"],
         )
         
+        # Only installed when enabled, so unprofiled deployments pay nothing per request
+        profiling_config = get_config().get("profiling", {})
+        self.profiler = RequestProfiler.from_config(
+            profiling_config, config["STORAGE_PATH"], config["PROFILE_TOKEN"]
+        )
+        if profiling_config.get("enabled", False) and self.profiler.active:
+            self.app.middleware("http")(self.profiler.middleware)
+            self.app.state.profiler = self.profiler
+        
+        # Added last so it runs first and profiles see the request ID
+        self.app.middleware("http")(self._assign_request_id)
+        
         # Include routers
         self.app.include_router(router, prefix="/api/v1")
         
+    @staticmethod
+    async def _assign_request_id(
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        """Tag the request's log records with its ``X-Request-ID``, generated if absent."""
+        request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        try:
+            response = await call_next(request)
+        finally:
+            request_id_var.reset(token)
+        response.headers["X-Request-ID"] = request_id
+        return response
+        
+    @staticmethod
+    def _agent_config() -> Dict[str, Any]:
+        """Build the shared agent configuration from the global settings.
+        
+        Returns:
+            Configuration dictionary for the agent registry
+        """
+        runtime_config = get_config()
+        models_config = runtime_config.get("models", {})
+        cache_config = runtime_config.get("cache", {})
+        
+        reviewer_config = dict(models_config.get("reviewer", {}))
+        reviewer_config["cache"] = {
+            "ttl": cache_config.get("ttl", 3600),
+            "max_entries": cache_config.get("max_entries", 10000),
+            "disk_path": (
+                os.path.join(config["STORAGE_PATH"], "review_cache.db")
+                if cache_config.get("disk", False) else None
+            )
+        }
+        
+        return {
+            "creative_model": config["CREATIVE_MODEL"],
+            "reviewer_model": config["REVIEWER_MODEL"],
+            "creative_config": models_config.get("creative", {}),
+            "reviewer_config": reviewer_config,
+            "warmup": runtime_config.get("warmup", {})
+        }
+        
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI) -> AsyncIterator[None]:
+        """Load shared resources on startup and release them on shutdown.
+        
+        Models load and warm up in the background, so the server answers
+        ``/ready`` (with 503) while they do.
+        
+        Args:
+            app: FastAPI application instance
+        """
+        self._startup_task = asyncio.ensure_future(self._load_agents())
+        
+        runtime_config = get_config()
+        monitoring_config = runtime_config.get("monitoring", {})
+        if monitoring_config.get("enabled", False):
+            start_metrics_server(int(monitoring_config.get("prometheus_port", 9090)))
+        
+        web3 = await self.web3_provider.connect()
+        blockchain_config = runtime_config.get("blockchain", {})
+        fee_oracle = FeeOracle.from_config(web3, blockchain_config.get("fees", {}))
+        self.signer = Signer.from_config(blockchain_config.get("signer", {}))
+        app.state.signer = self.signer
+        self.signature_verifier = SignatureVerifier.from_config(blockchain_config.get("verifier", {}))
+        await self.signature_verifier.start()
+        app.state.signature_verifier = self.signature_verifier
+        app.state.tx_submitter = TransactionSubmitter.from_config(
+            web3, blockchain_config.get("submitter", {}), fee_oracle=fee_oracle, signer=self.signer
+        )
+        self.receipt_tracker = ReceiptTracker.from_config(
+            web3, blockchain_config, on_receipt=fee_oracle.observe
+        )
+        await self.receipt_tracker.start()
+        app.state.receipt_tracker = self.receipt_tracker
+        track_queue("receipts", lambda: self.receipt_tracker.stats()["pending"] if self.receipt_tracker else 0)
+        app.state.bulk_reader = BulkReader.from_config(self.web3_provider, blockchain_config.get("bulk", {}))
+        await self._start_read_cache(app, web3, blockchain_config.get("read_cache", {}))
+        await self._start_indexer(app, web3, blockchain_config.get("indexer", {}))
+        await self._start_anchor(app, web3, blockchain_config.get("anchor", {}))
+        
+        jobs_config = runtime_config.get("jobs", {})
+        database_url = runtime_config.get("database", {}).get("url", "sqlite:///skyrun.db")
+        self.job_manager = JobManager(
+            JobStore(sqlite_path(database_url)),
+            self._run_job,
+            workers=jobs_config.get("workers", 4)
+        )
+        await self.job_manager.start()
+        app.state.job_manager = self.job_manager
+        track_queue("jobs", lambda: self.job_manager.queue_depth if self.job_manager else 0)
+        try:
+            yield
+        finally:
+            await self.cleanup()
+        
+    async def _start_read_cache(self, app: FastAPI, web3: Any, cache_config: Dict[str, Any]) -> None:
+        """Start the shared ContentRegistry read cache, if enabled and a contract is configured."""
+        if not cache_config.get("enabled", True) or not config["CONTRACT_ABI"]:
+            return
+        try:
+            self.read_cache = ContentReadCache.from_config(
+                web3, config["CONTRACT_ADDRESS"], config["CONTRACT_ABI"], cache_config
+            )
+        except Exception as e:
+            logger.warning(f"Read cache disabled: {str(e)}")
+            return
+        await self.read_cache.start()
+        app.state.read_cache = self.read_cache
+        
+    async def _start_indexer(self, app: FastAPI, web3: Any, indexer_config: Dict[str, Any]) -> None:
+        """Start syncing the local ContentRegistry event index, if enabled and a contract is configured."""
+        if not indexer_config.get("enabled", True) or not config["CONTRACT_ABI"]:
+            return
+        store = EventStore(indexer_config.get("path") or os.path.join(config["STORAGE_PATH"], "events.db"))
+        try:
+            self.event_indexer = EventIndexer.from_config(
+                web3, config["CONTRACT_ADDRESS"], config["CONTRACT_ABI"], store, indexer_config
+            )
+        except Exception as e:
+            logger.warning(f"Event indexer disabled: {str(e)}")
+            store.close()
+            return
+        await self.event_indexer.start()
+        app.state.event_indexer = self.event_indexer
+        
+    async def _start_anchor(self, app: FastAPI, web3: Any, anchor_config: Dict[str, Any]) -> None:
+        """Start the Merkle batch anchoring service, if enabled and an owner is configured."""
+        if not anchor_config.get("enabled", True) or not config["CONTRACT_ABI"]:
+            return
+        private_key = config["ANCHOR_PRIVATE_KEY"] or None
+        if private_key:
+            from eth_account import Account
+            owner = Account.from_key(private_key).address
+        else:
+            owner = anchor_config.get("owner")
+        if not owner:
+            logger.warning("Content anchoring disabled: set ANCHOR_PRIVATE_KEY or blockchain.anchor.owner")
+            return
+        try:
+            registry = ContentRegistry(
+                web3,
+                config["CONTRACT_ADDRESS"],
+                config["CONTRACT_ABI"],
+                submitter=app.state.tx_submitter,
+                reader=app.state.bulk_reader,
+                cache=self.read_cache
+            )
+        except Exception as e:
+            logger.warning(f"Content anchoring disabled: {str(e)}")
+            return
+        store = AnchorStore(anchor_config.get("path") or os.path.join(config["STORAGE_PATH"], "anchors.db"))
+        self.content_anchor = ContentAnchor.from_config(registry, store, owner, private_key, anchor_config)
+        await self.content_anchor.start()
+        app.state.content_anchor = self.content_anchor
+        
+    async def _load_agents(self) -> None:
+        """Load both models concurrently, then run the warmup prompts."""
+        try:
+            await self.agent_registry.initialize()
+            await self.agent_registry.warmup()
+        except Exception as e:
+            logger.error(f"Error starting agents: {str(e)}")
+            self.agent_registry.startup_error = str(e)
+        
+    async def _run_job(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one queued generation job on the shared coordinator."""
+        coordinator = await self.agent_registry.get_coordinator()
+        return await coordinator.process(request)
+        
+    async def cleanup(self) -> None:
+        """Release shared resources held by the server."""
+        if self._startup_task is not None:
+            self._startup_task.cancel()
+            await asyncio.gather(self._startup_task, return_exceptions=True)
+            self._startup_task = None
+        if self.job_manager is not None:
+            await self.job_manager.stop()
+            self.job_manager.store.close()
+            self.job_manager = None
+        if self.receipt_tracker is not None:
+            await self.receipt_tracker.stop()
+            self.receipt_tracker = None
+        if self.read_cache is not None:
+            await self.read_cache.stop()
+            self.read_cache = None
+        if self.content_anchor is not None:
+            await self.content_anchor.stop()
+            self.content_anchor.store.close()
+            self.content_anchor = None
+        if self.event_indexer is not None:
+            await self.event_indexer.stop()
+            self.event_indexer.store.close()
+            self.event_indexer = None
+        if self.signer is not None:
+            await self.signer.close()
+            self.signer = None
+        if self.signature_verifier is not None:
+            await self.signature_verifier.close()
+            self.signature_verifier = None
+        await self.web3_provider.close()
+        await self.agent_registry.cleanup()
+        
     def start(self) -> None:
         """Start the API server."""
+        # Without a log config uvicorn's loggers go through the root logger's queue
         uvicorn.run(
             self.app,
             host=self.host,
             port=self.port,
-            debug=self.debug
+            debug=self.debug,
+            log_config=None
         )
         
     def get_app(self) -> FastAPI:
@@ -2,8 +2,58 @@
 Blockchain integration for content ownership and value authentication.
 """
 
-from .contracts import ContentRegistry
-from .wallet import Wallet
-from .transaction import Transaction
+import importlib
+from typing import Any
 
-__all__ = ['ContentRegistry', 'Wallet', 'Transaction'] 
\ No newline at end of file
+# Classes are imported on first access, so importing the package doesn't load web3
+_LAZY_ATTRS = {
+    'ContentRegistry': '.contracts',
+    'Wallet': '.wallet',
+    'Transaction': '.transaction',
+    'Web3Provider': '.provider',
+    'RPCTimeoutError': '.provider',
+    'NonceManager': '.nonce',
+    'TransactionSubmitter': '.nonce',
+    'FeeOracle': '.fees',
+    'ReceiptTracker': '.receipts',
+    'BulkReader': '.bulk',
+    'RPCError': '.provider',
+    'ContentReadCache': '.read_cache',
+    'EventStore': '.indexer',
+    'EventIndexer': '.indexer',
+    'AnchorStore': '.anchor',
+    'ContentAnchor': '.anchor',
+    'Signer': '.signer',
+    'SignatureVerifier': '.verifier',
+}
+
+__all__ = [
+    'ContentRegistry',
+    'Wallet',
+    'Transaction',
+    'Web3Provider',
+    'RPCTimeoutError',
+    'NonceManager',
+    'TransactionSubmitter',
+    'FeeOracle',
+    'ReceiptTracker',
+    'BulkReader',
+    'RPCError',
+    'ContentReadCache',
+    'EventStore',
+    'EventIndexer',
+    'AnchorStore',
+    'ContentAnchor',
+    'Signer',
+    'SignatureVerifier'
+]
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
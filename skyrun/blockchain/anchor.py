@@ -0,0 +1,463 @@
+"""
+Merkle-batched anchoring of content hashes through ContentRegistry.
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+
+from ..core.logging import get_logger
+
+if TYPE_CHECKING:
+    from .contracts import ContentRegistry
+
+logger = get_logger(__name__)
+
+ZERO_ADDRESS = "0x" + "00" * 20
+
+def _keccak(data: bytes) -> bytes:
+    """Keccak-256 digest."""
+    from eth_utils import keccak
+    return keccak(data)
+
+def _from_hex(value: str) -> bytes:
+    """Bytes of a hex string, with or without ``0x``."""
+    return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+
+def merkle_leaf(content_hash: str) -> bytes:
+    """Hash a content hash into a tree leaf.
+
+    Leaves and inner nodes get different prefixes, so an inner node can't be
+    passed off as a leaf.
+
+    Args:
+        content_hash: Content hash
+
+    Returns:
+        Leaf hash
+    """
+    return _keccak(b"\x00" + content_hash.encode())
+
+def _parent(left: bytes, right: bytes) -> bytes:
+    """Hash two nodes in sorted order, so proofs need no left/right flags."""
+    return _keccak(b"\x01" + min(left, right) + max(left, right))
+
+def build_merkle_tree(content_hashes: Sequence[str]) -> Tuple[bytes, List[List[bytes]]]:
+    """Build a Merkle tree over content hashes.
+
+    A node without a sibling is carried up to the next level unchanged.
+
+    Args:
+        content_hashes: Content hashes, at least one
+
+    Returns:
+        Root, and the inclusion proof of every content hash in order
+    """
+    if not content_hashes:
+        raise ValueError("Cannot build a Merkle tree without leaves")
+
+    level = [merkle_leaf(content_hash) for content_hash in content_hashes]
+    # Position of every leaf in the current level
+    positions = list(range(len(level)))
+    proofs: List[List[bytes]] = [[] for _ in level]
+    while len(level) > 1:
+        for leaf, position in enumerate(positions):
+            sibling = position ^ 1
+            if sibling < len(level):
+                proofs[leaf].append(level[sibling])
+            positions[leaf] = position // 2
+        level = [
+            _parent(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ]
+    return level[0], proofs
+
+def verify_merkle_proof(content_hash: str, proof: Sequence[bytes], root: bytes) -> bool:
+    """Check that a content hash is a leaf of the tree with a given root.
+
+    Args:
+        content_hash: Content hash
+        proof: Sibling hashes from the leaf up
+        root: Merkle root
+
+    Returns:
+        True if the proof leads to the root
+    """
+    node = merkle_leaf(content_hash)
+    for sibling in proof:
+        node = _parent(node, sibling)
+    return node == root
+
+class AnchorStore:
+    """Durable table of queued and anchored content hashes with their proofs."""
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize the anchor store.
+
+        Args:
+            path: SQLite file path, or ``:memory:``
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS batches ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "root TEXT NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "tx_hash TEXT, "
+                "created_at REAL NOT NULL)"
+            )
+            # Items without a batch are queued
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "content_hash TEXT NOT NULL, "
+                "batch_id INTEGER, "
+                "leaf_index INTEGER, "
+                "proof TEXT, "
+                "created_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS items_content ON items (content_hash)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS items_batch ON items (batch_id, id)")
+            self._db.commit()
+
+    def enqueue(self, content_hashes: Sequence[str]) -> None:
+        """Queue content hashes for the next batch.
+
+        Args:
+            content_hashes: Content hashes
+        """
+        now = time.time()
+        with self._lock:
+            with self._db:
+                self._db.executemany(
+                    "INSERT INTO items (content_hash, created_at) VALUES (?, ?)",
+                    [(content_hash, now) for content_hash in content_hashes]
+                )
+
+    def queued(self, limit: int) -> List[Tuple[int, str]]:
+        """Get the oldest queued items.
+
+        Args:
+            limit: Maximum number of items
+
+        Returns:
+            Item IDs and content hashes, oldest first
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, content_hash FROM items WHERE batch_id IS NULL ORDER BY id LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [(row["id"], row["content_hash"]) for row in rows]
+
+    def queued_count(self) -> int:
+        """Get the number of queued items."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM items WHERE batch_id IS NULL").fetchone()[0]
+
+    def create_batch(self, root: str, items: List[Tuple[int, List[str]]]) -> int:
+        """Assign queued items to a new batch with their proofs.
+
+        Args:
+            root: Hex Merkle root
+            items: Item ID and hex proof of every leaf, in leaf order
+
+        Returns:
+            Batch ID
+        """
+        with self._lock:
+            with self._db:
+                cursor = self._db.execute(
+                    "INSERT INTO batches (root, size, created_at) VALUES (?, ?, ?)",
+                    (root, len(items), time.time())
+                )
+                batch_id = cursor.lastrowid
+                self._db.executemany(
+                    "UPDATE items SET batch_id = ?, leaf_index = ?, proof = ? WHERE id = ?",
+                    [(batch_id, index, json.dumps(proof), item_id) for index, (item_id, proof) in enumerate(items)]
+                )
+        return batch_id
+
+    def set_tx_hash(self, batch_id: int, tx_hash: str) -> None:
+        """Record the transaction that anchored a batch's root.
+
+        Args:
+            batch_id: Batch ID
+            tx_hash: Transaction hash
+        """
+        with self._lock:
+            with self._db:
+                self._db.execute("UPDATE batches SET tx_hash = ? WHERE id = ?", (tx_hash, batch_id))
+
+    def release_unsent(self) -> int:
+        """Queue the items of batches whose root was never sent again.
+
+        Returns:
+            Number of items queued again
+        """
+        with self._lock:
+            with self._db:
+                cursor = self._db.execute(
+                    "UPDATE items SET batch_id = NULL, leaf_index = NULL, proof = NULL "
+                    "WHERE batch_id IN (SELECT id FROM batches WHERE tx_hash IS NULL)"
+                )
+                self._db.execute("DELETE FROM batches WHERE tx_hash IS NULL")
+        return cursor.rowcount
+
+    def proofs(self, content_hash: str) -> List[Dict[str, Any]]:
+        """Get the anchored batches including a content hash.
+
+        Args:
+            content_hash: Content hash
+
+        Returns:
+            Proof records, oldest first
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT items.content_hash, items.batch_id, items.leaf_index, items.proof, "
+                "batches.root, batches.size, batches.tx_hash, batches.created_at "
+                "FROM items JOIN batches ON batches.id = items.batch_id "
+                "WHERE items.content_hash = ? AND batches.tx_hash IS NOT NULL ORDER BY items.id",
+                (content_hash,)
+            ).fetchall()
+        records = [dict(row) for row in rows]
+        for record in records:
+            record["proof"] = json.loads(record["proof"])
+        return records
+
+    def counts(self) -> Dict[str, int]:
+        """Get the numbers of batches and anchored items."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM batches WHERE tx_hash IS NOT NULL"
+            ).fetchone()
+        return {"batches": row[0], "anchored": row[1]}
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+class ContentAnchor:
+    """Registers many content hashes with one transaction per Merkle root.
+
+    Hashes are queued in the store and anchored in batches of up to
+    ``batch_size``: once a full batch is queued, or every ``flush_interval``
+    seconds for whatever is queued. Only the root is registered, as the
+    content hash of a ``ContentRegistry`` entry whose metadata describes the
+    batch; each item keeps its inclusion proof in the store.
+
+    A batch whose transaction fails goes back to the queue, as do batches
+    left unsent by a previous process.
+    """
+
+    def __init__(
+        self,
+        registry: "ContentRegistry",
+        store: AnchorStore,
+        owner: str,
+        private_key: Optional[bytes] = None,
+        batch_size: int = 1000,
+        flush_interval: float = 10.0
+    ):
+        """Initialize the anchor service.
+
+        Args:
+            registry: Content registry on an async client
+            store: Anchor store
+            owner: Address registering the roots
+            private_key: Key of the owner; if omitted the node signs for an
+                account it manages
+            batch_size: Maximum content hashes per root
+            flush_interval: Seconds between anchoring partial batches
+        """
+        self.registry = registry
+        self.store = store
+        self.owner = owner
+        self.private_key = private_key
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._full: Optional[asyncio.Event] = None
+        self._transactions = 0
+        self._failures = 0
+
+    @classmethod
+    def from_config(
+        cls,
+        registry: "ContentRegistry",
+        store: AnchorStore,
+        owner: str,
+        private_key: Optional[bytes],
+        config: Dict[str, Any]
+    ) -> "ContentAnchor":
+        """Create an anchor service from the ``blockchain.anchor`` configuration.
+
+        Args:
+            registry: Content registry on an async client
+            store: Anchor store
+            owner: Address registering the roots
+            private_key: Key of the owner, or None to let the node sign
+            config: Dictionary with optional ``batch_size`` and
+                ``flush_interval`` keys
+
+        Returns:
+            ContentAnchor instance
+        """
+        return cls(
+            registry,
+            store,
+            owner,
+            private_key=private_key,
+            batch_size=config.get("batch_size", 1000),
+            flush_interval=config.get("flush_interval", 10.0)
+        )
+
+    async def start(self) -> None:
+        """Requeue unsent batches and start anchoring in the background."""
+        released = self.store.release_unsent()
+        if released:
+            logger.info(f"Requeued {released} content hashes of unsent batches")
+        if self._task is None:
+            self._full = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop anchoring; queued hashes stay in the store."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def add(self, content_hashes: Sequence[str]) -> int:
+        """Queue content hashes for anchoring.
+
+        Args:
+            content_hashes: Content hashes
+
+        Returns:
+            Number of hashes queued in total
+        """
+        self.store.enqueue(content_hashes)
+        queued = self.store.queued_count()
+        if queued >= self.batch_size and self._full is not None:
+            self._full.set()
+        return queued
+
+    async def flush(self) -> List[Dict[str, Any]]:
+        """Anchor queued hashes now, in as many batches as needed.
+
+        Returns:
+            Root, size and transaction hash of every batch sent
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            batches = []
+            while True:
+                items = self.store.queued(self.batch_size)
+                if not items:
+                    return batches
+                batches.append(await self._anchor(items))
+
+    def proofs(self, content_hash: str) -> List[Dict[str, Any]]:
+        """Get the inclusion proofs of an anchored content hash.
+
+        Args:
+            content_hash: Content hash
+
+        Returns:
+            Proof records with ``root``, ``proof``, ``batch_id`` and
+            ``tx_hash``, oldest first
+        """
+        return self.store.proofs(content_hash)
+
+    async def verify(
+        self,
+        content_hash: str,
+        proof: Sequence[str],
+        root: str
+    ) -> Dict[str, Any]:
+        """Check a proof against a root, and that the root is anchored on chain.
+
+        Args:
+            content_hash: Content hash
+            proof: Hex sibling hashes from the leaf up
+            root: Hex Merkle root
+
+        Returns:
+            Dictionary with ``valid`` (the proof leads to the root),
+            ``anchored`` (the root is registered) and the root's ``owner``
+        """
+        valid = verify_merkle_proof(content_hash, [_from_hex(node) for node in proof], _from_hex(root))
+        owner = await self.registry.get_content_owner_async(_from_hex(root).hex())
+        anchored = owner != ZERO_ADDRESS
+        return {
+            "content_hash": content_hash,
+            "root": root,
+            "valid": valid,
+            "anchored": anchored,
+            "owner": owner if anchored else None
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Get anchoring statistics.
+
+        Returns:
+            Dictionary of anchor statistics
+        """
+        return {
+            **self.store.counts(),
+            "queued": self.store.queued_count(),
+            "transactions": self._transactions,
+            "failures": self._failures,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval
+        }
+
+    async def _run(self) -> None:
+        """Flush when a batch fills up or the interval passes, until stopped."""
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Anchoring failed: {str(e)}")
+
+    async def _anchor(self, items: List[Tuple[int, str]]) -> Dict[str, Any]:
+        """Build the tree of queued items and register its root."""
+        root, proofs = build_merkle_tree([content_hash for _, content_hash in items])
+        # Roots are registered like any content hash: 64 hex characters
+        root_hex = root.hex()
+        batch_id = self.store.create_batch(
+            root_hex,
+            [(item_id, ["0x" + node.hex() for node in proof]) for (item_id, _), proof in zip(items, proofs)]
+        )
+        metadata = json.dumps({"type": "merkle_batch", "size": len(items)})
+        try:
+            tx_hash = await self.registry.register_content_async(root_hex, self.owner, metadata, self.private_key)
+        except Exception:
+            self._failures += 1
+            self.store.release_unsent()
+            raise
+        self.store.set_tx_hash(batch_id, tx_hash)
+        self._transactions += 1
+        logger.info(f"Anchored {len(items)} content hashes under root {root_hex} in {tx_hash}")
+        return {"batch_id": batch_id, "root": root_hex, "size": len(items), "tx_hash": tx_hash}
@@ -0,0 +1,253 @@
+"""
+Bulk contract and balance reads over JSON-RPC batches or Multicall3.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+import asyncio
+
+if TYPE_CHECKING:
+    from web3 import AsyncWeb3
+    from web3.contract import AsyncContract
+    from .provider import Web3Provider
+
+# The aggregate3 and getEthBalance functions of Multicall3, deployed at
+# 0xcA11bde05977b3631167028862bE2a173976CA11 on most chains
+MULTICALL3_ABI = [
+    {
+        "name": "aggregate3",
+        "type": "function",
+        "stateMutability": "payable",
+        "inputs": [{
+            "name": "calls",
+            "type": "tuple[]",
+            "components": [
+                {"name": "target", "type": "address"},
+                {"name": "allowFailure", "type": "bool"},
+                {"name": "callData", "type": "bytes"}
+            ]
+        }],
+        "outputs": [{
+            "name": "returnData",
+            "type": "tuple[]",
+            "components": [
+                {"name": "success", "type": "bool"},
+                {"name": "returnData", "type": "bytes"}
+            ]
+        }]
+    },
+    {
+        "name": "getEthBalance",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [{"name": "addr", "type": "address"}],
+        "outputs": [{"name": "balance", "type": "uint256"}]
+    }
+]
+
+def _to_bytes(value: Any) -> bytes:
+    """Raw ``eth_call`` result as bytes, whether hex string or bytes."""
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    return bytes(value)
+
+def _to_int(value: Any) -> int:
+    """Raw quantity as an integer, whether hex string or already decoded."""
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+class BulkReader:
+    """Reads many contract views or balances with few requests.
+
+    Without a multicall contract, each item is one ``eth_call`` or
+    ``eth_getBalance`` and they are sent together as JSON-RPC batches by the
+    shared provider. With ``multicall_address`` set, items are grouped into
+    ``aggregate3`` calls of ``chunk_size`` items each, and those calls are
+    batched in turn.
+
+    Every item gets a result dictionary with ``success`` and either
+    ``result`` or ``error``, so one failing item doesn't fail the rest.
+    """
+
+    def __init__(
+        self,
+        web3: "AsyncWeb3",
+        provider: Optional["Web3Provider"] = None,
+        multicall_address: Optional[str] = None,
+        chunk_size: int = 100
+    ):
+        """Initialize the bulk reader.
+
+        Args:
+            web3: AsyncWeb3 instance
+            provider: Optional shared provider, needed for JSON-RPC batches;
+                without it the calls are sent concurrently one by one
+            multicall_address: Optional address of a Multicall3 deployment
+            chunk_size: Items per ``aggregate3`` call
+        """
+        self.web3 = web3
+        self.provider = provider
+        self.chunk_size = max(1, int(chunk_size))
+        self.multicall: Optional["AsyncContract"] = None
+        if multicall_address:
+            self.multicall = web3.eth.contract(
+                address=web3.to_checksum_address(multicall_address),
+                abi=MULTICALL3_ABI
+            )
+        self._items = 0
+        self._calls = 0
+        self._rpc_calls = 0
+        self._failures = 0
+
+    @classmethod
+    def from_config(cls, provider: "Web3Provider", config: Dict[str, Any]) -> "BulkReader":
+        """Create a bulk reader from the ``blockchain.bulk`` configuration.
+
+        Args:
+            provider: Connected shared provider
+            config: Dictionary with optional ``multicall_address`` and
+                ``chunk_size`` keys
+
+        Returns:
+            BulkReader instance
+        """
+        return cls(
+            provider.web3,
+            provider=provider,
+            multicall_address=config.get("multicall_address") or None,
+            chunk_size=config.get("chunk_size", 100)
+        )
+
+    async def call(
+        self,
+        contract: "AsyncContract",
+        fn_name: str,
+        args_list: Sequence[Sequence[Any]]
+    ) -> List[Dict[str, Any]]:
+        """Call one view function of a contract with many argument tuples.
+
+        Args:
+            contract: Contract to call
+            fn_name: Name of a view function
+            args_list: Arguments of every call
+
+        Returns:
+            Result dictionary of every call, in order; ``result`` is the
+            decoded return value
+        """
+        abi = contract.get_function_by_name(fn_name).abi
+        output_types = [self._abi_type(output) for output in abi["outputs"]]
+        calls = [(contract.address, contract.encode_abi(fn_name=fn_name, args=list(args))) for args in args_list]
+        self._items += len(calls)
+
+        raw_results = await self._eth_calls(calls)
+        return [
+            self._decode(raw, output_types) if raw["success"] else raw
+            for raw in raw_results
+        ]
+
+    async def get_balances(self, addresses: Sequence[str]) -> List[Dict[str, Any]]:
+        """Get the balances of many addresses.
+
+        Args:
+            addresses: Addresses to look up
+
+        Returns:
+            Result dictionary of every address, in order; ``result`` is the
+            balance in wei
+        """
+        addresses = [self.web3.to_checksum_address(address) for address in addresses]
+        self._items += len(addresses)
+        if self.multicall is not None:
+            calls = [
+                (self.multicall.address, self.multicall.encode_abi(fn_name="getEthBalance", args=[address]))
+                for address in addresses
+            ]
+            raw_results = await self._eth_calls(calls)
+            return [self._decode(raw, ["uint256"]) if raw["success"] else raw for raw in raw_results]
+
+        replies = await self._batch([("eth_getBalance", [address, "latest"]) for address in addresses])
+        return [self._result(lambda: _to_int(reply), reply) for reply in replies]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get bulk read statistics.
+
+        Returns:
+            Dictionary of reader statistics
+        """
+        return {
+            "items": self._items,
+            "calls": self._calls,
+            "rpc_calls": self._rpc_calls,
+            "failures": self._failures,
+            "multicall": self.multicall.address if self.multicall is not None else None,
+            "chunk_size": self.chunk_size
+        }
+
+    async def _eth_calls(self, calls: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Run ``eth_call`` for every (target, calldata), returning raw return data."""
+        if self.multicall is None:
+            replies = await self._batch([("eth_call", [{"to": to, "data": data}, "latest"]) for to, data in calls])
+            return [self._result(lambda: _to_bytes(reply), reply) for reply in replies]
+
+        chunks = [calls[i:i + self.chunk_size] for i in range(0, len(calls), self.chunk_size)]
+        aggregate_calls = [
+            ("eth_call", [{
+                "to": self.multicall.address,
+                "data": self.multicall.encode_abi(
+                    fn_name="aggregate3",
+                    args=[[(to, True, _to_bytes(data)) for to, data in chunk]]
+                )
+            }, "latest"])
+            for chunk in chunks
+        ]
+        replies = await self._batch(aggregate_calls)
+
+        results: List[Dict[str, Any]] = []
+        for chunk, reply in zip(chunks, replies):
+            if isinstance(reply, Exception):
+                results.extend(self._result(None, reply) for _ in chunk)
+                continue
+            (entries,) = self.web3.codec.decode(["(bool,bytes)[]"], _to_bytes(reply))
+            for success, return_data in entries:
+                if success:
+                    results.append({"success": True, "result": bytes(return_data)})
+                else:
+                    results.append(self._result(None, Exception("execution reverted")))
+        return results
+
+    async def _batch(self, calls: List[Tuple[str, Any]]) -> List[Any]:
+        """Send raw JSON-RPC calls through the provider's batches."""
+        # An aggregate3 call counts once, and a batch of calls is one request to the node
+        self._calls += len(calls)
+        if self.provider is not None:
+            self._rpc_calls += self.provider.round_trips(len(calls))
+            return await self.provider.batch(calls)
+        self._rpc_calls += len(calls)
+        return await asyncio.gather(
+            *(self.web3.manager.coro_request(method, params) for method, params in calls),
+            return_exceptions=True
+        )
+
+    def _result(self, convert: Any, reply: Any) -> Dict[str, Any]:
+        """Wrap one raw reply, or the exception in its place."""
+        if isinstance(reply, Exception):
+            self._failures += 1
+            return {"success": False, "error": str(reply) or type(reply).__name__}
+        return {"success": True, "result": convert()}
+
+    def _decode(self, raw: Dict[str, Any], output_types: List[str]) -> Dict[str, Any]:
+        """Decode the return data of a successful call."""
+        try:
+            values = list(self.web3.codec.decode(output_types, raw["result"]))
+        except Exception as e:
+            self._failures += 1
+            return {"success": False, "error": f"Undecodable return data: {str(e)}"}
+        for i, output_type in enumerate(output_types):
+            if output_type == "address":
+                values[i] = self.web3.to_checksum_address(values[i])
+        return {"success": True, "result": values[0] if len(values) == 1 else tuple(values)}
+
+    @staticmethod
+    def _abi_type(output: Dict[str, Any]) -> str:
+        """ABI type string of an output, with tuples spelled out."""
+        from eth_utils.abi import collapse_if_tuple
+        return collapse_if_tuple(output)
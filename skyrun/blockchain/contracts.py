@@ -2,24 +2,51 @@
 Smart contract for content ownership and rights management.
 """
 
-from typing import Dict, List, Optional
-from web3 import Web3
-from web3.contract import Contract
-from eth_account import Account
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+from ..core.metrics import timed
+from .bulk import BulkReader
+from .nonce import TransactionSubmitter
+from .read_cache import ContentReadCache
+
+if TYPE_CHECKING:
+    from web3 import AsyncWeb3, Web3
+    from web3.contract import AsyncContract, Contract
 
 class ContentRegistry:
-    """Smart contract for managing content ownership and rights."""
+    """Smart contract for managing content ownership and rights.
+    
+    Built on a ``Web3`` instance, the blocking methods are available; built
+    on an ``AsyncWeb3`` instance, the ``*_async`` methods are.
+    """
     
-    def __init__(self, web3: Web3, contract_address: str, contract_abi: List[Dict]):
+    def __init__(
+        self,
+        web3: Union["Web3", "AsyncWeb3"],
+        contract_address: str,
+        contract_abi: List[Dict],
+        submitter: Optional[TransactionSubmitter] = None,
+        reader: Optional[BulkReader] = None,
+        cache: Optional[ContentReadCache] = None
+    ):
         """Initialize the content registry contract.
         
         Args:
-            web3: Web3 instance
+            web3: Web3 or AsyncWeb3 instance
             contract_address: Address of the deployed contract
             contract_abi: Contract ABI
+            submitter: Optional shared transaction submitter for the async
+                methods, so nonces are allocated across instances
+            reader: Optional shared bulk reader for the ``*_bulk_async``
+                methods
+            cache: Optional shared read cache for the async ownership and
+                metadata reads
         """
         self.web3 = web3
-        self.contract: Contract = web3.eth.contract(
+        self.submitter = submitter
+        self.reader = reader
+        self.cache = cache
+        self.contract: Union["Contract", "AsyncContract"] = web3.eth.contract(
             address=contract_address,
             abi=contract_abi
         )
@@ -109,4 +136,209 @@ class ContentRegistry:
         Returns:
             True if the address owns the content, False otherwise
         """
-        return self.contract.functions.verifyOwnership(content_hash, address).call() 
\ No newline at end of file
+        return self.contract.functions.verifyOwnership(content_hash, address).call()
+        
+    async def register_content_async(
+        self,
+        content_hash: str,
+        owner: str,
+        metadata: Dict,
+        private_key: Optional[bytes] = None
+    ) -> str:
+        """Register new content on the blockchain without blocking.
+        
+        Args:
+            content_hash: Hash of the content
+            owner: Address of the content owner
+            metadata: Additional metadata about the content
+            private_key: Key of the owner; if omitted the node signs for an
+                account it manages
+            
+        Returns:
+            Transaction hash
+        """
+        function = self.contract.functions.registerContent(content_hash, owner, metadata)
+        return await self._transact_async(function, owner, private_key, content_hash)
+        
+    async def get_content_owner_async(self, content_hash: str) -> str:
+        """Get the owner of registered content without blocking.
+        
+        Args:
+            content_hash: Hash of the content
+            
+        Returns:
+            Address of the content owner
+        """
+        return await self._read_async("getContentOwner", content_hash)
+        
+    async def get_content_metadata_async(self, content_hash: str) -> Dict:
+        """Get metadata for registered content without blocking.
+        
+        Args:
+            content_hash: Hash of the content
+            
+        Returns:
+            Content metadata dictionary
+        """
+        return await self._read_async("getContentMetadata", content_hash)
+        
+    async def transfer_ownership_async(
+        self,
+        content_hash: str,
+        from_address: str,
+        to_address: str,
+        private_key: Optional[bytes] = None
+    ) -> str:
+        """Transfer content ownership to another address without blocking.
+        
+        Args:
+            content_hash: Hash of the content
+            from_address: Current owner's address
+            to_address: New owner's address
+            private_key: Key of the current owner; if omitted the node signs
+                for an account it manages
+            
+        Returns:
+            Transaction hash
+        """
+        function = self.contract.functions.transferOwnership(content_hash, to_address)
+        return await self._transact_async(function, from_address, private_key, content_hash)
+        
+    async def verify_ownership_async(self, content_hash: str, address: str) -> bool:
+        """Verify if an address owns specific content without blocking.
+        
+        Args:
+            content_hash: Hash of the content
+            address: Address to verify
+            
+        Returns:
+            True if the address owns the content, False otherwise
+        """
+        return await self._read_async("verifyOwnership", content_hash, address)
+        
+    async def get_content_owner_bulk_async(self, content_hashes: List[str]) -> List[Dict[str, Any]]:
+        """Get the owners of many contents in batched requests.
+        
+        Args:
+            content_hashes: Hashes of the contents
+            
+        Returns:
+            For every hash, in order, a dictionary with ``success`` and
+            either the owner address as ``result`` or an ``error``
+        """
+        return await self._read_bulk_async(
+            "getContentOwner", [(content_hash,) for content_hash in content_hashes]
+        )
+        
+    async def get_content_metadata_bulk_async(self, content_hashes: List[str]) -> List[Dict[str, Any]]:
+        """Get the metadata of many contents in batched requests.
+        
+        Args:
+            content_hashes: Hashes of the contents
+            
+        Returns:
+            For every hash, in order, a dictionary with ``success`` and
+            either the metadata as ``result`` or an ``error``
+        """
+        return await self._read_bulk_async(
+            "getContentMetadata", [(content_hash,) for content_hash in content_hashes]
+        )
+        
+    async def verify_ownership_bulk_async(self, content_hashes: List[str], address: str) -> List[Dict[str, Any]]:
+        """Verify if an address owns each of many contents in batched requests.
+        
+        Args:
+            content_hashes: Hashes of the contents
+            address: Address to verify
+            
+        Returns:
+            For every hash, in order, a dictionary with ``success`` and
+            either a boolean ``result`` or an ``error``
+        """
+        return await self._read_bulk_async(
+            "verifyOwnership", [(content_hash, address) for content_hash in content_hashes]
+        )
+        
+    async def _read_async(self, fn_name: str, *args: Any) -> Any:
+        """Call a view function, through the read cache when there is one."""
+        with timed("registry", fn_name):
+            if self.cache is None:
+                return await self.contract.functions[fn_name](*args).call()
+                
+            hit, value = self.cache.get(fn_name, args)
+            if hit:
+                return value
+            token = self.cache.begin()
+            value = await self.contract.functions[fn_name](*args).call()
+            self.cache.put(fn_name, args, value, token)
+            return value
+        
+    async def _read_bulk_async(self, fn_name: str, args_list: List[tuple]) -> List[Dict[str, Any]]:
+        """Call a view function for many arguments, batching the cache misses."""
+        with timed("registry", f"{fn_name}_bulk"):
+            return await self._read_bulk_cached(fn_name, args_list)
+            
+    async def _read_bulk_cached(self, fn_name: str, args_list: List[tuple]) -> List[Dict[str, Any]]:
+        """Bulk read of ``_read_bulk_async``, without the timing."""
+        if self.reader is None:
+            self.reader = BulkReader(self.web3)
+        if self.cache is None:
+            return await self.reader.call(self.contract, fn_name, args_list)
+            
+        results: List[Optional[Dict[str, Any]]] = [None] * len(args_list)
+        misses = []
+        for i, args in enumerate(args_list):
+            hit, value = self.cache.get(fn_name, args)
+            if hit:
+                results[i] = {"success": True, "result": value}
+            else:
+                misses.append(i)
+                
+        if misses:
+            token = self.cache.begin()
+            fetched = await self.reader.call(self.contract, fn_name, [args_list[i] for i in misses])
+            for i, result in zip(misses, fetched):
+                results[i] = result
+                if result["success"]:
+                    self.cache.put(fn_name, args_list[i], result["result"], token)
+        return results
+        
+    async def _transact_async(
+        self,
+        function: Any,
+        sender: str,
+        private_key: Optional[bytes],
+        content_hash: str
+    ) -> str:
+        """Encode a contract function call and hand it to the submitter.
+        
+        Only the calldata is built here; the submitter adds the nonce, the
+        cached fees and a memoized gas limit.
+        
+        Args:
+            function: Bound contract function
+            sender: Sending address
+            private_key: Key of the sender, or None to let the node sign
+            content_hash: Hash of the content the call changes
+            
+        Returns:
+            Transaction hash
+        """
+        tx = {
+            'from': sender,
+            'to': self.contract.address,
+            'data': self.contract.encode_abi(
+                fn_name=function.fn_name,
+                args=function.args,
+                kwargs=function.kwargs
+            )
+        }
+        
+        if self.submitter is None:
+            self.submitter = TransactionSubmitter(self.web3)
+        with timed("registry", function.fn_name):
+            tx_hash = await self.submitter.submit(tx, private_key)
+        if self.cache is not None:
+            # The event will invalidate it again once mined
+            self.cache.invalidate(content_hash)
+        return tx_hash
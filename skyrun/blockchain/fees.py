@@ -0,0 +1,281 @@
+"""
+Cached fee and gas estimates for outgoing transactions.
+"""
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+import asyncio
+import statistics
+import time
+
+from ..core.logging import get_logger
+
+if TYPE_CHECKING:
+    from web3 import AsyncWeb3
+
+logger = get_logger(__name__)
+
+_FEE_FIELDS = ("gasPrice", "maxFeePerGas", "maxPriorityFeePerGas")
+
+def _data_bytes(data: Any) -> bytes:
+    """Transaction data as bytes, whether given as bytes or a hex string."""
+    if not data:
+        return b""
+    if isinstance(data, str):
+        return bytes.fromhex(data[2:] if data.startswith("0x") else data)
+    return bytes(data)
+
+class FeeOracle:
+    """App-scoped source of fee fields and gas limits.
+
+    Fees are refreshed at most once per ``ttl`` seconds and shared by every
+    transaction built in that window. On EIP-1559 chains they come from
+    ``eth_feeHistory``: the tip is the median reward at
+    ``priority_percentile`` over the last ``history_blocks`` blocks and the
+    fee cap leaves room for the base fee to grow by ``base_fee_multiplier``.
+    Other chains get a legacy ``gasPrice``.
+
+    Gas estimates are memoized per target, function selector and calldata
+    length and padded by ``gas_margin``. Receipts passed to ``observe`` are
+    compared with the gas limit that was sent, and an out-of-gas failure
+    drops the memoized estimate.
+    """
+
+    def __init__(
+        self,
+        web3: "AsyncWeb3",
+        ttl: float = 3.0,
+        gas_margin: float = 1.2,
+        history_blocks: int = 5,
+        priority_percentile: float = 50.0,
+        base_fee_multiplier: float = 2.0,
+        max_estimates: int = 256
+    ):
+        """Initialize the fee oracle.
+
+        Args:
+            web3: AsyncWeb3 instance
+            ttl: Seconds a fee estimate is reused
+            gas_margin: Factor applied to ``eth_estimateGas`` results
+            history_blocks: Blocks of fee history to take the tip from
+            priority_percentile: Reward percentile used as the tip
+            base_fee_multiplier: Base fee growth the fee cap allows for
+            max_estimates: Number of memoized gas estimates kept
+        """
+        self.web3 = web3
+        self.ttl = float(ttl)
+        self.gas_margin = max(1.0, float(gas_margin))
+        self.history_blocks = max(1, int(history_blocks))
+        self.priority_percentile = float(priority_percentile)
+        self.base_fee_multiplier = max(1.0, float(base_fee_multiplier))
+        self.max_estimates = max(1, int(max_estimates))
+        self._fees: Optional[Dict[str, int]] = None
+        self._fees_expire = 0.0
+        self._fees_lock: Optional[asyncio.Lock] = None
+        self._chain_id: Optional[int] = None
+        self._estimates: "OrderedDict[Tuple, int]" = OrderedDict()
+        # Sent transactions awaiting a receipt: hash -> (estimate key, gas limit)
+        self._pending: "OrderedDict[str, Tuple[Tuple, int]]" = OrderedDict()
+        self._fee_refreshes = 0
+        self._fee_hits = 0
+        self._estimate_calls = 0
+        self._estimate_hits = 0
+        self._observed = 0
+        self._out_of_gas = 0
+        self._used_ratios: List[float] = []
+
+    @classmethod
+    def from_config(cls, web3: "AsyncWeb3", config: Dict[str, Any]) -> "FeeOracle":
+        """Create a fee oracle from the ``blockchain.fees`` configuration.
+
+        Args:
+            web3: AsyncWeb3 instance
+            config: Dictionary with optional ``ttl``, ``gas_margin``,
+                ``history_blocks``, ``priority_percentile`` and
+                ``base_fee_multiplier`` keys
+
+        Returns:
+            FeeOracle instance
+        """
+        return cls(
+            web3,
+            ttl=config.get("ttl", 3.0),
+            gas_margin=config.get("gas_margin", 1.2),
+            history_blocks=config.get("history_blocks", 5),
+            priority_percentile=config.get("priority_percentile", 50.0),
+            base_fee_multiplier=config.get("base_fee_multiplier", 2.0)
+        )
+
+    async def fee_fields(self) -> Dict[str, int]:
+        """Get the current fee fields, refreshing them once the TTL is up.
+
+        Concurrent callers after expiry share a single refresh.
+
+        Returns:
+            Either ``maxFeePerGas`` and ``maxPriorityFeePerGas``, or ``gasPrice``
+        """
+        if self._fees is not None and time.monotonic() < self._fees_expire:
+            self._fee_hits += 1
+            return dict(self._fees)
+
+        if self._fees_lock is None:
+            self._fees_lock = asyncio.Lock()
+        async with self._fees_lock:
+            if self._fees is None or time.monotonic() >= self._fees_expire:
+                self._fees = await self._fetch_fees()
+                self._fees_expire = time.monotonic() + self.ttl
+                self._fee_refreshes += 1
+            else:
+                self._fee_hits += 1
+            return dict(self._fees)
+
+    async def chain_id(self) -> int:
+        """Get the chain ID, fetched once."""
+        if self._chain_id is None:
+            self._chain_id = await self.web3.eth.chain_id
+        return self._chain_id
+
+    async def estimate_gas(self, tx: Dict[str, Any]) -> int:
+        """Get a padded gas limit for a transaction.
+
+        Args:
+            tx: Transaction with ``from`` and optionally ``to``, ``data`` and
+                ``value``
+
+        Returns:
+            Gas limit
+        """
+        key = self._estimate_key(tx)
+        if key in self._estimates:
+            self._estimates.move_to_end(key)
+            self._estimate_hits += 1
+            return self._estimates[key]
+
+        call = {field: tx[field] for field in ("from", "to", "data", "value") if tx.get(field)}
+        estimate = await self.web3.eth.estimate_gas(call)
+        self._estimate_calls += 1
+
+        gas = int(estimate * self.gas_margin)
+        self._estimates[key] = gas
+        while len(self._estimates) > self.max_estimates:
+            self._estimates.popitem(last=False)
+        return gas
+
+    async def prepare(self, tx: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in the chain ID, fee fields and gas limit a transaction lacks.
+
+        Args:
+            tx: Transaction fields
+
+        Returns:
+            Completed copy of the transaction
+        """
+        tx = dict(tx)
+        if "chainId" not in tx:
+            tx["chainId"] = await self.chain_id()
+        if not any(field in tx for field in _FEE_FIELDS):
+            tx.update(await self.fee_fields())
+        if "gas" not in tx:
+            tx["gas"] = await self.estimate_gas(tx)
+        return tx
+
+    def track(self, tx_hash: str, tx: Dict[str, Any]) -> None:
+        """Remember the gas limit of a sent transaction until its receipt is observed.
+
+        Args:
+            tx_hash: Transaction hash
+            tx: Transaction as sent
+        """
+        self._pending[tx_hash.lower()] = (self._estimate_key(tx), int(tx["gas"]))
+        while len(self._pending) > 4 * self.max_estimates:
+            self._pending.popitem(last=False)
+
+    def observe(self, receipt: Any) -> None:
+        """Compare the gas used by a mined transaction with its gas limit.
+
+        Args:
+            receipt: Receipt of a transaction passed to ``track``
+        """
+        tx_hash = receipt["transactionHash"]
+        if not isinstance(tx_hash, str):
+            tx_hash = "0x" + bytes(tx_hash).hex()
+        pending = self._pending.pop(tx_hash.lower(), None)
+        if pending is None:
+            return
+
+        key, gas_limit = pending
+        gas_used = receipt["gasUsed"]
+        self._observed += 1
+        self._used_ratios.append(gas_used / gas_limit)
+        if len(self._used_ratios) > 1000:
+            del self._used_ratios[:500]
+        if receipt.get("status") == 0 and gas_used >= gas_limit:
+            # The memoized limit was too low for these arguments
+            self._out_of_gas += 1
+            self._estimates.pop(key, None)
+            logger.warning(f"Transaction {tx_hash} ran out of gas at {gas_limit}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get oracle statistics.
+
+        ``gas_used_ratio`` is gas used over the gas limit sent, over recent
+        observed receipts; one minus it is the share of gas over-reserved.
+
+        Returns:
+            Dictionary of oracle statistics
+        """
+        ratios = self._used_ratios
+        return {
+            "fees": dict(self._fees) if self._fees else None,
+            "fee_refreshes": self._fee_refreshes,
+            "fee_cache_hits": self._fee_hits,
+            "gas_estimates": self._estimate_calls,
+            "gas_estimate_cache_hits": self._estimate_hits,
+            "observed_receipts": self._observed,
+            "out_of_gas": self._out_of_gas,
+            "gas_used_ratio": {
+                "mean": statistics.fmean(ratios) if ratios else None,
+                "min": min(ratios) if ratios else None,
+                "max": max(ratios) if ratios else None
+            }
+        }
+
+    async def _fetch_fees(self) -> Dict[str, int]:
+        """Ask the node for fee fields."""
+        try:
+            history = await self.web3.eth.fee_history(
+                self.history_blocks, "latest", [self.priority_percentile]
+            )
+        except Exception as e:
+            # Nodes without EIP-1559 support may not implement eth_feeHistory
+            logger.debug(f"eth_feeHistory unavailable: {str(e)}")
+            history = {}
+        base_fees = history.get("baseFeePerGas") or []
+        if base_fees:
+            # The last entry is the base fee of the next block
+            base_fee = base_fees[-1]
+        else:
+            base_fee = (await self.web3.eth.get_block("latest")).get("baseFeePerGas")
+        if base_fee is None:
+            return {"gasPrice": await self.web3.eth.gas_price}
+
+        rewards = [reward[0] for reward in history.get("reward") or [] if reward]
+        if rewards:
+            priority_fee = int(statistics.median(rewards))
+        else:
+            priority_fee = await self.web3.eth.max_priority_fee
+        return {
+            "maxFeePerGas": int(base_fee * self.base_fee_multiplier) + priority_fee,
+            "maxPriorityFeePerGas": priority_fee
+        }
+
+    @staticmethod
+    def _estimate_key(tx: Dict[str, Any]) -> Tuple:
+        """Memoization key: the target, function selector and calldata length.
+
+        Dynamic arguments such as strings mostly change the cost through
+        their length, which the key includes.
+        """
+        data = _data_bytes(tx.get("data"))
+        to = tx.get("to")
+        return (to.lower() if to else None, data[:4], len(data))
@@ -0,0 +1,449 @@
+"""
+Local SQLite index of ContentRegistry ownership events.
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+import asyncio
+import json
+import sqlite3
+import threading
+
+from ..core.logging import get_logger
+
+if TYPE_CHECKING:
+    from web3 import AsyncWeb3
+
+logger = get_logger(__name__)
+
+INDEXED_EVENTS = ("ContentRegistered", "OwnershipTransferred")
+
+class EventStore:
+    """Durable table of ownership events, with the block hashes they were synced at."""
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize the event store.
+
+        Args:
+            path: SQLite file path, or ``:memory:``
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                "block_number INTEGER NOT NULL, "
+                "log_index INTEGER NOT NULL, "
+                "block_hash TEXT NOT NULL, "
+                "tx_hash TEXT NOT NULL, "
+                "event TEXT NOT NULL, "
+                "content_hash TEXT NOT NULL, "
+                "owner TEXT, "
+                "previous_owner TEXT, "
+                "metadata TEXT, "
+                "PRIMARY KEY (block_number, log_index))"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS events_content ON events (content_hash, block_number, log_index)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS events_owner ON events (owner)")
+            # Hashes of synced blocks, to detect reorgs below the synced block
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "block_number INTEGER PRIMARY KEY, "
+                "block_hash TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    def add(self, events: List[Dict[str, Any]], checkpoint: Tuple[int, str]) -> None:
+        """Store the events of a block range and the hash of its last block at once.
+
+        Args:
+            events: Event rows
+            checkpoint: Number and hash of the last block of the range
+        """
+        with self._lock:
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO events (block_number, log_index, block_hash, tx_hash, event, "
+                    "content_hash, owner, previous_owner, metadata) VALUES (:block_number, :log_index, "
+                    ":block_hash, :tx_hash, :event, :content_hash, :owner, :previous_owner, :metadata)",
+                    events
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO checkpoints (block_number, block_hash) VALUES (?, ?)",
+                    checkpoint
+                )
+
+    def last_block(self) -> Optional[int]:
+        """Get the last synced block, or None before the first sync."""
+        with self._lock:
+            row = self._db.execute("SELECT MAX(block_number) AS number FROM checkpoints").fetchone()
+        return row["number"]
+
+    def checkpoints(self) -> List[Tuple[int, str]]:
+        """Get the stored block hashes, newest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT block_number, block_hash FROM checkpoints ORDER BY block_number DESC"
+            ).fetchall()
+        return [(row["block_number"], row["block_hash"]) for row in rows]
+
+    def rollback(self, block_number: int) -> int:
+        """Forget everything synced after a block.
+
+        Args:
+            block_number: Last block to keep
+
+        Returns:
+            Number of events removed
+        """
+        with self._lock:
+            with self._db:
+                cursor = self._db.execute("DELETE FROM events WHERE block_number > ?", (block_number,))
+                self._db.execute("DELETE FROM checkpoints WHERE block_number > ?", (block_number,))
+        return cursor.rowcount
+
+    def prune_checkpoints(self, block_number: int) -> None:
+        """Drop block hashes older than a block, keeping the newest of them.
+
+        Args:
+            block_number: Oldest block a reorg can still reach
+        """
+        with self._lock:
+            with self._db:
+                self._db.execute(
+                    "DELETE FROM checkpoints WHERE block_number < "
+                    "(SELECT MAX(block_number) FROM checkpoints WHERE block_number <= ?)",
+                    (block_number,)
+                )
+
+    def owned_by(self, owner: str) -> List[Dict[str, Any]]:
+        """Get the contents whose latest event gave them to an owner.
+
+        Args:
+            owner: Checksummed owner address
+
+        Returns:
+            Latest event of every owned content, oldest first
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM events AS e WHERE e.owner = ? AND NOT EXISTS ("
+                "SELECT 1 FROM events AS later WHERE later.content_hash = e.content_hash "
+                "AND (later.block_number, later.log_index) > (e.block_number, e.log_index)) "
+                "ORDER BY e.block_number, e.log_index",
+                (owner,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def history(self, content_hash: str) -> List[Dict[str, Any]]:
+        """Get every event of a content.
+
+        Args:
+            content_hash: Content hash
+
+        Returns:
+            Events, oldest first
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM events WHERE content_hash = ? ORDER BY block_number, log_index",
+                (content_hash,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self) -> int:
+        """Get the number of stored events."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+class EventIndexer:
+    """Keeps an ``EventStore`` in sync with the ContentRegistry events on chain.
+
+    Logs are fetched with ``eth_getLogs`` over ranges of ``chunk_size``
+    blocks, and a range the node refuses is split in half. Each range is
+    stored together with the hash of its last block, so a restart resumes
+    after the last stored range.
+
+    Before syncing, the hash of the last synced block is compared with the
+    chain. On a mismatch the index is rolled back to the newest stored block
+    hash that is still canonical; hashes are kept for ``reorg_depth`` blocks,
+    and a deeper reorg rebuilds the index from ``start_block``.
+    """
+
+    def __init__(
+        self,
+        web3: "AsyncWeb3",
+        contract_address: str,
+        contract_abi: List[Dict],
+        store: EventStore,
+        start_block: int = 0,
+        chunk_size: int = 2000,
+        reorg_depth: int = 12,
+        poll_interval: float = 2.0
+    ):
+        """Initialize the event indexer.
+
+        Args:
+            web3: AsyncWeb3 instance
+            contract_address: Address of the deployed contract
+            contract_abi: Contract ABI with the indexed events
+            store: Event store
+            start_block: First block to index, e.g. the deployment block
+            chunk_size: Blocks per ``eth_getLogs`` request
+            reorg_depth: Deepest reorg rolled back block by block
+            poll_interval: Seconds between syncs
+        """
+        from eth_utils import event_abi_to_log_topic
+
+        self.web3 = web3
+        self.contract = web3.eth.contract(address=contract_address, abi=contract_abi)
+        self.store = store
+        self.start_block = max(0, int(start_block))
+        self.chunk_size = max(1, int(chunk_size))
+        self.reorg_depth = max(1, int(reorg_depth))
+        self.poll_interval = float(poll_interval)
+
+        self._events: Dict[bytes, Any] = {}
+        for abi in contract_abi:
+            if abi.get("type") == "event" and abi.get("name") in INDEXED_EVENTS:
+                self._events[event_abi_to_log_topic(abi)] = self.contract.events[abi["name"]]()
+        if not self._events:
+            raise ValueError(f"Contract ABI has none of the events {', '.join(INDEXED_EVENTS)}")
+
+        self._head: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._ranges = 0
+        self._splits = 0
+        self._indexed = 0
+        self._reorgs = 0
+        self._rolled_back = 0
+
+    @classmethod
+    def from_config(
+        cls,
+        web3: "AsyncWeb3",
+        contract_address: str,
+        contract_abi: List[Dict],
+        store: EventStore,
+        config: Dict[str, Any]
+    ) -> "EventIndexer":
+        """Create an indexer from the ``blockchain.indexer`` configuration.
+
+        Args:
+            web3: AsyncWeb3 instance
+            contract_address: Address of the deployed contract
+            contract_abi: Contract ABI with the indexed events
+            store: Event store
+            config: Dictionary with optional ``start_block``, ``chunk_size``,
+                ``reorg_depth`` and ``poll_interval`` keys
+
+        Returns:
+            EventIndexer instance
+        """
+        return cls(
+            web3,
+            contract_address,
+            contract_abi,
+            store,
+            start_block=config.get("start_block", 0),
+            chunk_size=config.get("chunk_size", 2000),
+            reorg_depth=config.get("reorg_depth", 12),
+            poll_interval=config.get("poll_interval", 2.0)
+        )
+
+    @property
+    def synced_block(self) -> Optional[int]:
+        """Last block whose events are in the index."""
+        return self.store.last_block()
+
+    async def start(self) -> None:
+        """Start syncing in the background."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop syncing."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def sync(self) -> int:
+        """Index the events up to the current head once.
+
+        Returns:
+            Number of events indexed
+        """
+        head = await self.web3.eth.block_number
+        self._head = head
+        last = self.store.last_block()
+        if last is None:
+            last = self.start_block - 1
+        else:
+            last = await self._check_reorg(min(last, head))
+
+        indexed = 0
+        while last < head:
+            to_block = min(last + self.chunk_size, head)
+            block_hash = await self._block_hash(to_block)
+            logs = await self._get_logs(last + 1, to_block)
+            if to_block > head - self.reorg_depth and await self._block_hash(to_block) != block_hash:
+                # Reorged while reading; read the range again
+                continue
+
+            events = [event for event in (self._decode(log) for log in logs) if event is not None]
+            self.store.add(events, (to_block, block_hash))
+            self._ranges += 1
+            indexed += len(events)
+            last = to_block
+
+        self._indexed += indexed
+        self.store.prune_checkpoints(head - self.reorg_depth)
+        return indexed
+
+    def owned_by(self, owner: str) -> List[Dict[str, Any]]:
+        """Get the contents currently owned by an address.
+
+        Args:
+            owner: Owner address
+
+        Returns:
+            Latest event of every owned content, oldest first
+        """
+        return self.store.owned_by(self.web3.to_checksum_address(owner))
+
+    def history(self, content_hash: str) -> List[Dict[str, Any]]:
+        """Get the registration and transfers of a content.
+
+        Args:
+            content_hash: Content hash
+
+        Returns:
+            Events, oldest first
+        """
+        return self.store.history(content_hash)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get indexer statistics.
+
+        Returns:
+            Dictionary of indexer statistics
+        """
+        synced_block = self.store.last_block()
+        return {
+            "head": self._head,
+            "synced_block": synced_block,
+            "lag": self._head - synced_block if self._head is not None and synced_block is not None else None,
+            "events": self.store.count(),
+            "indexed": self._indexed,
+            "ranges": self._ranges,
+            "range_splits": self._splits,
+            "reorgs": self._reorgs,
+            "rolled_back": self._rolled_back,
+            "chunk_size": self.chunk_size,
+            "reorg_depth": self.reorg_depth
+        }
+
+    async def _run(self) -> None:
+        """Sync until stopped."""
+        while True:
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Event indexer sync failed: {str(e)}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _check_reorg(self, last: int) -> int:
+        """Roll the index back to the newest synced block still on the chain.
+
+        Args:
+            last: Last synced block, at most the head
+
+        Returns:
+            Block to resume after
+        """
+        checkpoints = self.store.checkpoints()
+        if checkpoints and checkpoints[0][0] == last and await self._block_hash(last) == checkpoints[0][1]:
+            return last
+
+        fork = self.start_block - 1
+        for number, block_hash in checkpoints:
+            if number <= last and await self._block_hash(number) == block_hash:
+                fork = number
+                break
+        else:
+            logger.warning(f"Reorg deeper than {self.reorg_depth} blocks; reindexing from block {self.start_block}")
+
+        removed = self.store.rollback(fork)
+        self._reorgs += 1
+        self._rolled_back += removed
+        logger.info(f"Reorg below block {last}: rolled back to block {fork}, removing {removed} events")
+        return fork
+
+    async def _block_hash(self, block_number: int) -> Optional[str]:
+        """Hash of the canonical block at a height, or None past the head."""
+        from web3.exceptions import BlockNotFound
+
+        try:
+            block = await self.web3.eth.get_block(block_number)
+        except BlockNotFound:
+            return None
+        return self.web3.to_hex(block["hash"])
+
+    async def _get_logs(self, from_block: int, to_block: int) -> List[Any]:
+        """Get the indexed events of a block range, splitting ranges the node refuses."""
+        try:
+            return await self.web3.eth.get_logs({
+                "address": self.contract.address,
+                "fromBlock": from_block,
+                "toBlock": to_block,
+                "topics": [list(self._events)]
+            })
+        except Exception as e:
+            if from_block == to_block:
+                raise
+            # Nodes cap the blocks or results per request
+            logger.debug(f"Splitting logs of blocks {from_block}-{to_block}: {str(e)}")
+            self._splits += 1
+            middle = (from_block + to_block) // 2
+            return await self._get_logs(from_block, middle) + await self._get_logs(middle + 1, to_block)
+
+    def _decode(self, log: Any) -> Optional[Dict[str, Any]]:
+        """Event row of a log, or None if it can't be decoded."""
+        event = self._events.get(bytes(log["topics"][0]))
+        try:
+            decoded = event.process_log(log)
+        except Exception as e:
+            logger.warning(f"Undecodable content event: {str(e)}")
+            return None
+
+        args = decoded["args"]
+        content_hash = args["contentHash"]
+        if isinstance(content_hash, (bytes, bytearray)):
+            content_hash = self.web3.to_hex(content_hash)
+        metadata = args.get("metadata")
+        if metadata is not None and not isinstance(metadata, str):
+            metadata = json.dumps(metadata)
+        return {
+            "block_number": decoded["blockNumber"],
+            "log_index": decoded["logIndex"],
+            "block_hash": self.web3.to_hex(decoded["blockHash"]),
+            "tx_hash": self.web3.to_hex(decoded["transactionHash"]),
+            "event": decoded["event"],
+            "content_hash": content_hash,
+            "owner": args.get("owner", args.get("newOwner")),
+            "previous_owner": args.get("previousOwner"),
+            "metadata": metadata
+        }
@@ -0,0 +1,281 @@
+"""
+Local nonce allocation and pipelined transaction submission.
+"""
+
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional
+import asyncio
+
+from ..core.logging import get_logger
+from ..core.metrics import timed, track_queue
+from .fees import FeeOracle
+from .signer import Signer
+
+if TYPE_CHECKING:
+    from web3 import AsyncWeb3
+
+logger = get_logger(__name__)
+
+# Node error messages meaning the nonce we used is stale
+_NONCE_ERRORS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid transaction nonce",
+    "replacement transaction underpriced"
+)
+
+# Node error messages meaning this exact transaction is already in the pool
+_KNOWN_ERRORS = ("already known", "known transaction")
+
+def is_nonce_error(error: Exception) -> bool:
+    """Whether a send failed because the nonce was out of sync with the node."""
+    message = str(error).lower()
+    return any(pattern in message for pattern in _NONCE_ERRORS)
+
+class NonceManager:
+    """Hands out nonces per account without asking the node each time.
+
+    The first reservation for an account reads its pending transaction
+    count; later ones count up locally. Nonces are handed out at once, so
+    transactions of one account are signed and sent concurrently. If the
+    ``async with`` body fails, its nonce is taken back when it is still the
+    latest one handed out, and otherwise the local count is dropped, so the
+    next reservation asks the node and fills the gap. ``resync`` drops the
+    local count after the node reports a nonce error.
+
+    Counts are kept for the ``max_accounts`` most recently used accounts;
+    an evicted account asks the node again on its next reservation. An
+    account's lock, held while its count is read from the node, only
+    exists while reservations wait for it.
+    """
+
+    def __init__(self, web3: "AsyncWeb3", max_accounts: int = 10000):
+        """Initialize the nonce manager.
+
+        Args:
+            web3: AsyncWeb3 instance
+            max_accounts: Number of accounts whose count is kept
+        """
+        self.web3 = web3
+        self.max_accounts = max(1, int(max_accounts))
+        self._next: "OrderedDict[str, int]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._waiters: Dict[str, int] = {}
+        self.syncs = 0
+
+    @asynccontextmanager
+    async def reserve(self, address: str) -> AsyncIterator[int]:
+        """Reserve the next nonce of an account.
+
+        Args:
+            address: Sending address
+
+        Yields:
+            The nonce, given back if the body exits with an error
+        """
+        key = address.lower()
+        nonce = await self._take(key, address)
+        try:
+            yield nonce
+        except BaseException:
+            if self._next.get(key) == nonce + 1:
+                self._next[key] = nonce
+            else:
+                self._next.pop(key, None)
+            raise
+
+    @property
+    def accounts(self) -> int:
+        """Number of accounts with a local count."""
+        return len(self._next)
+
+    async def _take(self, key: str, address: str) -> int:
+        """Hand out the next nonce of an account, reading its count from the node if needed."""
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            async with lock:
+                nonce = self._next.get(key)
+                if nonce is None:
+                    nonce = await self.web3.eth.get_transaction_count(address, "pending")
+                    self.syncs += 1
+                self._next[key] = nonce + 1
+                self._next.move_to_end(key)
+                while len(self._next) > self.max_accounts:
+                    self._next.popitem(last=False)
+                return nonce
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                del self._locks[key]
+
+    def resync(self, address: str) -> None:
+        """Forget the local count, so the next reservation asks the node.
+
+        Args:
+            address: Sending address
+        """
+        self._next.pop(address.lower(), None)
+
+class TransactionSubmitter:
+    """Signs and broadcasts transactions with locally allocated nonces.
+
+    Broadcasting takes one RPC call per transaction and doesn't wait for it
+    to be mined, so an account can have many transactions in flight. At most
+    ``max_concurrency`` submissions run at once, including several of one
+    account. Sends that fail on a stale nonce are resynced and retried up to
+    ``max_retries`` times. Missing fee
+    fields and gas limits come from the fee oracle, and transactions are
+    signed on the signer's pool rather than the event loop.
+    """
+
+    def __init__(
+        self,
+        web3: "AsyncWeb3",
+        nonce_manager: Optional[NonceManager] = None,
+        fee_oracle: Optional[FeeOracle] = None,
+        max_concurrency: int = 64,
+        max_retries: int = 3,
+        signer: Optional[Signer] = None
+    ):
+        """Initialize the submitter.
+
+        Args:
+            web3: AsyncWeb3 instance
+            nonce_manager: Optional shared nonce manager
+            fee_oracle: Optional shared fee oracle
+            max_concurrency: Maximum number of submissions running at once
+            max_retries: Retries of a send rejected for its nonce
+            signer: Optional shared signer
+        """
+        self.web3 = web3
+        self.nonces = nonce_manager or NonceManager(web3)
+        self.fees = fee_oracle or FeeOracle(web3)
+        self.signer = signer or Signer()
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_retries = max(0, int(max_retries))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._submitted = 0
+        self._retries = 0
+        track_queue("submitter", lambda: self._in_flight)
+
+    @classmethod
+    def from_config(
+        cls,
+        web3: "AsyncWeb3",
+        config: Dict[str, Any],
+        fee_oracle: Optional[FeeOracle] = None,
+        signer: Optional[Signer] = None
+    ) -> "TransactionSubmitter":
+        """Create a submitter from the ``blockchain.submitter`` configuration.
+
+        Args:
+            web3: AsyncWeb3 instance
+            config: Dictionary with optional ``max_concurrency``,
+                ``max_retries`` and ``max_accounts`` keys
+            fee_oracle: Optional shared fee oracle
+            signer: Optional shared signer
+
+        Returns:
+            TransactionSubmitter instance
+        """
+        return cls(
+            web3,
+            nonce_manager=NonceManager(web3, max_accounts=config.get("max_accounts", 10000)),
+            fee_oracle=fee_oracle,
+            max_concurrency=config.get("max_concurrency", 64),
+            max_retries=config.get("max_retries", 3),
+            signer=signer
+        )
+
+    async def submit(self, tx: Dict[str, Any], private_key: Optional[bytes] = None) -> str:
+        """Assign a nonce to a transaction, sign it and broadcast it.
+
+        Args:
+            tx: Transaction fields without ``nonce``; ``from`` is required,
+                fees and ``gas`` are filled in when missing
+            private_key: Key of the sender; if omitted the node signs for an
+                account it manages
+
+        Returns:
+            Transaction hash
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        sender = tx["from"]
+        async with self._semaphore:
+            self._in_flight += 1
+            try:
+                with timed("submitter", "prepare"):
+                    tx = await self.fees.prepare(tx)
+                for attempt in range(self.max_retries + 1):
+                    try:
+                        async with self.nonces.reserve(sender) as nonce:
+                            tx_hash = await self._send_in_order(dict(tx, nonce=nonce), private_key)
+                        self._submitted += 1
+                        self.fees.track(tx_hash, tx)
+                        return tx_hash
+                    except Exception as e:
+                        if not is_nonce_error(e) or attempt == self.max_retries:
+                            raise
+                        logger.warning(f"Resyncing nonce of {sender} after: {str(e)}")
+                        self.nonces.resync(sender)
+                        self._retries += 1
+            finally:
+                self._in_flight -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """Get submission counters.
+
+        Returns:
+            Dictionary of submitter statistics
+        """
+        return {
+            "submitted": self._submitted,
+            "in_flight": self._in_flight,
+            "retries": self._retries,
+            "nonce_syncs": self.nonces.syncs,
+            "nonce_accounts": self.nonces.accounts
+        }
+
+    async def _send_in_order(self, tx: Dict[str, Any], private_key: Optional[bytes]) -> str:
+        """Sign and broadcast one transaction, resending it if it reached the node early.
+
+        Transactions of one account are sent concurrently, so one can reach
+        the node before those with lower nonces. A node that rejects it for
+        that is asked for the account's count: while the nonce is still
+        ahead, the same transaction is resent after a short wait; once the
+        nonce is stale, the error is raised for the caller to resync.
+        """
+        if private_key is None:
+            send = lambda: self.web3.eth.send_transaction(tx)
+        else:
+            with timed("submitter", "sign"):
+                signed_tx = await self.signer.sign_transaction(tx, private_key)
+            send = lambda: self._broadcast(signed_tx)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                with timed("submitter", "send"):
+                    return self.web3.to_hex(await send())
+            except Exception as e:
+                if not is_nonce_error(e) or attempt == self.max_retries:
+                    raise
+                if await self.web3.eth.get_transaction_count(tx["from"], "pending") > tx["nonce"]:
+                    raise
+                self._retries += 1
+                await asyncio.sleep(0.01 * 2 ** attempt)
+
+    async def _broadcast(self, signed_tx: Any) -> Any:
+        """Broadcast a signed transaction, accepting one the node already has."""
+        try:
+            return await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        except Exception as e:
+            # A resend of a transaction the node already has went through
+            if not any(pattern in str(e).lower() for pattern in _KNOWN_ERRORS):
+                raise
+            return signed_tx.hash
@@ -0,0 +1,267 @@
+"""
+Shared asynchronous Web3 client with pooled RPC connections.
+"""
+
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import time
+
+from ..core.logging import get_logger
+from ..core.metrics import observe_rpc
+
+if TYPE_CHECKING:
+    from web3 import AsyncWeb3
+
+logger = get_logger(__name__)
+
+# Set while a call holds a concurrency permit, so calls the transport makes
+# while serving it don't wait for a permit of their own
+_holding_permit: ContextVar[bool] = ContextVar("skyrun_holding_permit", default=False)
+
+class RPCTimeoutError(TimeoutError):
+    """Raised when a JSON-RPC call takes longer than the configured timeout."""
+
+class RPCError(Exception):
+    """Error returned by the node for one call of a batch."""
+
+class Web3Provider:
+    """App-scoped ``AsyncWeb3`` client.
+
+    All requests go through one aiohttp session, so connections to the node
+    are kept alive and reused instead of opening a new TCP/TLS connection per
+    request. At most ``max_concurrency`` calls are in flight at once and each
+    call is bounded by ``timeout`` seconds. ``batch`` sends many calls as
+    JSON-RPC batches of up to ``batch_size`` calls, each counting as one.
+    """
+
+    def __init__(
+        self,
+        provider_url: str = "http://localhost:8545",
+        max_connections: int = 20,
+        max_concurrency: int = 32,
+        timeout: float = 10.0,
+        batch_size: int = 100,
+        web3: Optional["AsyncWeb3"] = None
+    ):
+        """Initialize the provider.
+
+        Args:
+            provider_url: HTTP JSON-RPC endpoint of the node
+            max_connections: Size of the keep-alive connection pool
+            max_concurrency: Maximum number of RPC calls in flight
+            timeout: Timeout of a single RPC call in seconds
+            batch_size: Maximum number of calls per JSON-RPC batch
+            web3: Optional ready-made ``AsyncWeb3`` to wrap instead, e.g. one
+                backed by ``AsyncEthereumTesterProvider``
+        """
+        self.provider_url = provider_url
+        self.max_connections = max(1, int(max_connections))
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.timeout = float(timeout)
+        self.batch_size = max(1, int(batch_size))
+        self._web3 = web3
+        self._session: Any = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._requests = 0
+        self._timeouts = 0
+        self._batches = 0
+        self._batched_calls = 0
+        if web3 is not None:
+            self._install_middleware(web3)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "Web3Provider":
+        """Create a provider from the ``blockchain`` configuration section.
+
+        Args:
+            config: Dictionary with ``provider_url`` and an optional ``rpc``
+                section with ``max_connections``, ``max_concurrency``,
+                ``timeout`` and ``batch_size``
+
+        Returns:
+            Web3Provider instance
+        """
+        rpc_config = config.get("rpc", {})
+        return cls(
+            provider_url=config.get("provider_url", "http://localhost:8545"),
+            max_connections=rpc_config.get("max_connections", 20),
+            max_concurrency=rpc_config.get("max_concurrency", 32),
+            timeout=rpc_config.get("timeout", 10.0),
+            batch_size=rpc_config.get("batch_size", 100)
+        )
+
+    @property
+    def web3(self) -> "AsyncWeb3":
+        """The shared client; ``connect`` must have been awaited."""
+        if self._web3 is None:
+            raise RuntimeError("Web3Provider is not connected")
+        return self._web3
+
+    async def connect(self) -> "AsyncWeb3":
+        """Create the pooled HTTP session and the client, once.
+
+        No request is made, so this succeeds even if the node is down.
+
+        Returns:
+            Shared ``AsyncWeb3`` client
+        """
+        if self._web3 is None:
+            import aiohttp
+            from web3 import AsyncHTTPProvider, AsyncWeb3
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.max_connections
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            provider = AsyncHTTPProvider(self.provider_url)
+            await provider.cache_async_session(self._session)
+            web3 = AsyncWeb3(provider)
+            self._install_middleware(web3)
+            self._web3 = web3
+            logger.info(f"Connected Web3 provider to {self.provider_url}")
+        return self._web3
+
+    def stats(self) -> Dict[str, int]:
+        """Get request counters.
+
+        Returns:
+            Dictionary of provider statistics
+        """
+        return {
+            "requests": self._requests,
+            "in_flight": self._in_flight,
+            "timeouts": self._timeouts,
+            "batches": self._batches,
+            "batched_calls": self._batched_calls,
+            "max_concurrency": self.max_concurrency
+        }
+
+    async def batch(self, calls: Sequence[Tuple[str, Any]]) -> List[Any]:
+        """Send many JSON-RPC calls in as few requests as possible.
+
+        Results are the node's raw JSON values, without web3's formatting.
+        A call that fails, alone or with its whole batch, gets the exception
+        in its place instead of failing the others. A wrapped client without
+        an HTTP session, e.g. the tester, runs the calls one by one.
+
+        Args:
+            calls: Pairs of method name and parameter list
+
+        Returns:
+            Result or exception of every call, in order
+        """
+        calls = list(calls)
+        if self._session is None:
+            return await asyncio.gather(
+                *(self.web3.manager.coro_request(method, params) for method, params in calls),
+                return_exceptions=True
+            )
+
+        chunks = [calls[i:i + self.batch_size] for i in range(0, len(calls), self.batch_size)]
+        results = await asyncio.gather(*(self._send_batch(chunk) for chunk in chunks))
+        return [result for chunk_results in results for result in chunk_results]
+
+    def round_trips(self, count: int) -> int:
+        """Number of requests ``batch`` sends for ``count`` calls.
+
+        Args:
+            count: Number of JSON-RPC calls
+
+        Returns:
+            Number of requests sent to the node
+        """
+        if self._session is None:
+            return count
+        return -(-count // self.batch_size)
+
+    async def close(self) -> None:
+        """Close the pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._web3 = None
+
+    async def _send_batch(self, calls: List[Tuple[str, Any]]) -> List[Any]:
+        """POST one JSON-RPC batch, within the concurrency and time limits."""
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            self._in_flight += 1
+            self._requests += 1
+            self._batches += 1
+            self._batched_calls += len(calls)
+            start = time.perf_counter()
+            failed = True
+            try:
+                async with self._session.post(self.provider_url, json=payload) as response:
+                    response.raise_for_status()
+                    replies = await response.json(content_type=None)
+                failed = False
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                error = RPCTimeoutError(f"Batch of {len(calls)} calls timed out after {self.timeout}s")
+                return [error] * len(calls)
+            except Exception as e:
+                return [e] * len(calls)
+            finally:
+                self._in_flight -= 1
+                observe_rpc("batch", time.perf_counter() - start, failed)
+
+        if not isinstance(replies, list):
+            # Nodes without batch support answer with a single error
+            error = RPCError(str(replies.get("error", replies)) if isinstance(replies, dict) else replies)
+            return [error] * len(calls)
+        by_id = {reply.get("id"): reply for reply in replies}
+        results: List[Any] = []
+        for i in range(len(calls)):
+            reply = by_id.get(i)
+            if reply is None:
+                results.append(RPCError("No reply for batched call"))
+            elif "error" in reply:
+                results.append(RPCError(reply["error"].get("message", str(reply["error"]))))
+            else:
+                results.append(reply.get("result"))
+        return results
+
+    def _install_middleware(self, web3: "AsyncWeb3") -> None:
+        """Bound the concurrency and duration of every call made by ``web3``.
+
+        The limits sit in the innermost layer, next to the transport, so
+        calls that other middleware makes while handling a request don't
+        wait for permits held by that same request.
+        """
+        web3.middleware_onion.inject(self._limit_middleware, name="skyrun_limits", layer=0)
+
+    async def _limit_middleware(self, make_request: Callable, web3: "AsyncWeb3") -> Callable:
+        async def middleware(method: str, params: Any) -> Any:
+            if _holding_permit.get():
+                return await make_request(method, params)
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            async with self._semaphore:
+                self._in_flight += 1
+                self._requests += 1
+                token = _holding_permit.set(True)
+                start = time.perf_counter()
+                failed = True
+                try:
+                    response = await asyncio.wait_for(make_request(method, params), self.timeout)
+                    failed = isinstance(response, dict) and "error" in response
+                    return response
+                except asyncio.TimeoutError:
+                    self._timeouts += 1
+                    raise RPCTimeoutError(f"{method} timed out after {self.timeout}s")
+                finally:
+                    _holding_permit.reset(token)
+                    self._in_flight -= 1
+                    observe_rpc(method, time.perf_counter() - start, failed)
+        return middleware
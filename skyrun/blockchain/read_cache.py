@@ -0,0 +1,296 @@
+"""
+Block-aware cache of ContentRegistry view calls.
+"""
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+import asyncio
+
+from ..core.logging import get_logger
+
+if TYPE_CHECKING:
+    from web3 import AsyncWeb3
+
+logger = get_logger(__name__)
+
+# Contract events carrying this argument invalidate the cached reads of that hash
+HASH_ARGUMENT = "contentHash"
+
+class ContentReadCache:
+    """Read-through LRU cache of per-content view calls.
+
+    Entries are keyed by function name and arguments, whose first argument
+    is the content hash. A background loop follows the chain head; every
+    event of the contract with a ``contentHash`` argument drops the entries
+    of that hash, and entries read more than ``max_block_age`` blocks ago
+    expire. Until the head is known nothing is served from the cache.
+
+    A read that started before an invalidation of its hash isn't stored, so
+    a value from before the event can't replace the dropped one.
+    """
+
+    def __init__(
+        self,
+        web3: "AsyncWeb3",
+        contract_address: str,
+        contract_abi: List[Dict],
+        max_entries: int = 10000,
+        max_block_age: int = 64,
+        poll_interval: float = 2.0
+    ):
+        """Initialize the read cache.
+
+        Args:
+            web3: AsyncWeb3 instance
+            contract_address: Address of the deployed contract
+            contract_abi: Contract ABI
+            max_entries: Maximum number of cached reads
+            max_block_age: Blocks after which a cached read expires
+            poll_interval: Seconds between block number reads
+        """
+        from eth_utils import event_abi_to_log_topic
+
+        self.web3 = web3
+        self.contract = web3.eth.contract(address=contract_address, abi=contract_abi)
+        self.max_entries = max(1, int(max_entries))
+        self.max_block_age = max(1, int(max_block_age))
+        self.poll_interval = float(poll_interval)
+
+        # Events with a contentHash argument, by topic
+        self._events: Dict[bytes, Any] = {}
+        self._indexed_hash = False
+        for abi in contract_abi:
+            if abi.get("type") != "event":
+                continue
+            hash_inputs = [i for i in abi.get("inputs", []) if i.get("name") == HASH_ARGUMENT]
+            if hash_inputs:
+                self._events[event_abi_to_log_topic(abi)] = self.contract.events[abi["name"]]()
+                self._indexed_hash = self._indexed_hash or hash_inputs[0].get("indexed", False)
+
+        # (fn_name, args) -> (block read at, value)
+        self._entries: "OrderedDict[Tuple, Tuple[int, Any]]" = OrderedDict()
+        self._keys_by_hash: Dict[str, Set[Tuple]] = {}
+        # An indexed string is logged as its keccak hash; kept for hashes with entries
+        self._hashes_by_topic: Dict[bytes, str] = {}
+        # Recent invalidations: hash -> generation, oldest first
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._generation = 0
+        # Newest generation dropped from that history
+        self._forgotten = 0
+        self._head: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._expirations = 0
+        self._evictions = 0
+        self._discarded = 0
+
+    @classmethod
+    def from_config(
+        cls,
+        web3: "AsyncWeb3",
+        contract_address: str,
+        contract_abi: List[Dict],
+        config: Dict[str, Any]
+    ) -> "ContentReadCache":
+        """Create a read cache from the ``blockchain.read_cache`` configuration.
+
+        Args:
+            web3: AsyncWeb3 instance
+            contract_address: Address of the deployed contract
+            contract_abi: Contract ABI
+            config: Dictionary with optional ``max_entries``,
+                ``max_block_age`` and ``poll_interval`` keys
+
+        Returns:
+            ContentReadCache instance
+        """
+        return cls(
+            web3,
+            contract_address,
+            contract_abi,
+            max_entries=config.get("max_entries", 10000),
+            max_block_age=config.get("max_block_age", 64),
+            poll_interval=config.get("poll_interval", 2.0)
+        )
+
+    @property
+    def synced(self) -> bool:
+        """Whether the chain head is known, so entries can be served."""
+        return self._head is not None
+
+    async def start(self) -> None:
+        """Start following the chain head."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop following the chain head and drop every entry."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.clear()
+        self._head = None
+
+    async def refresh(self) -> None:
+        """Read the head once and apply the events of the blocks since the last read."""
+        head = await self.web3.eth.block_number
+        if self._head is None:
+            self._head = head
+            return
+        if head <= self._head:
+            return
+
+        if self._events:
+            logs = await self.web3.eth.get_logs({
+                "address": self.contract.address,
+                "fromBlock": self._head + 1,
+                "toBlock": head,
+                "topics": [list(self._events)]
+            })
+            for log in logs:
+                content_hash = self._content_hash(log)
+                if content_hash is not None:
+                    self.invalidate(content_hash)
+        self._head = head
+
+    def begin(self) -> int:
+        """Get a token to pass to ``put`` for a read that's about to start."""
+        return self._generation
+
+    def get(self, fn_name: str, args: Sequence[Any]) -> Tuple[bool, Any]:
+        """Look up a cached read.
+
+        Args:
+            fn_name: Contract function name
+            args: Call arguments, the content hash first
+
+        Returns:
+            Whether it was a hit, and the cached value
+        """
+        key = (fn_name, tuple(args))
+        entry = self._entries.get(key)
+        if entry is not None and self._head is not None:
+            block, value = entry
+            if self._head - block < self.max_block_age:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return True, value
+            self._remove(key)
+            self._expirations += 1
+        self._misses += 1
+        return False, None
+
+    def put(self, fn_name: str, args: Sequence[Any], value: Any, token: int) -> None:
+        """Store a read, unless its hash was invalidated since ``begin``.
+
+        Args:
+            fn_name: Contract function name
+            args: Call arguments, the content hash first
+            value: Call result
+            token: Value returned by ``begin`` before the read
+        """
+        if self._head is None:
+            return
+        content_hash = args[0]
+        if self._invalidated.get(content_hash, 0) > token or self._forgotten > token:
+            # Invalidated during the read, or possibly and no longer known
+            self._discarded += 1
+            return
+
+        key = (fn_name, tuple(args))
+        self._entries[key] = (self._head, value)
+        self._entries.move_to_end(key)
+        self._keys_by_hash.setdefault(content_hash, set()).add(key)
+        if self._indexed_hash:
+            self._hashes_by_topic[bytes(self.web3.keccak(text=content_hash))] = content_hash
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def invalidate(self, content_hash: str) -> None:
+        """Drop every cached read of a content hash.
+
+        Args:
+            content_hash: Content hash whose state changed
+        """
+        self._generation += 1
+        self._invalidated.pop(content_hash, None)
+        self._invalidated[content_hash] = self._generation
+        while len(self._invalidated) > self.max_entries:
+            self._forgotten = self._invalidated.popitem(last=False)[1]
+
+        for key in self._keys_by_hash.pop(content_hash, ()):
+            if self._entries.pop(key, None) is not None:
+                self._invalidations += 1
+        self._forget_topic(content_hash)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self._keys_by_hash.clear()
+        self._hashes_by_topic.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters.
+
+        Returns:
+            Dictionary of cache statistics
+        """
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "invalidations": self._invalidations,
+            "expirations": self._expirations,
+            "evictions": self._evictions,
+            "discarded": self._discarded,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "max_block_age": self.max_block_age,
+            "head": self._head
+        }
+
+    async def _run(self) -> None:
+        """Refresh until stopped."""
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Entries can't be trusted without the events that were missed
+                logger.warning(f"Read cache refresh failed, clearing it: {str(e)}")
+                self.clear()
+                self._head = None
+            await asyncio.sleep(self.poll_interval)
+
+    def _content_hash(self, log: Any) -> Optional[str]:
+        """Content hash named by an event log, if it can be decoded."""
+        event = self._events.get(bytes(log["topics"][0]))
+        try:
+            value = event.process_log(log)["args"][HASH_ARGUMENT]
+        except Exception as e:
+            logger.warning(f"Undecodable content event: {str(e)}")
+            return None
+        if isinstance(value, (bytes, bytearray)):
+            return self._hashes_by_topic.get(bytes(value))
+        return value
+
+    def _remove(self, key: Tuple) -> None:
+        """Remove one entry and its index record."""
+        self._entries.pop(key, None)
+        keys = self._keys_by_hash.get(key[1][0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_hash[key[1][0]]
+                self._forget_topic(key[1][0])
+
+    def _forget_topic(self, content_hash: str) -> None:
+        """Stop decoding a hash's events once it has no entries left."""
+        if self._indexed_hash:
+            self._hashes_by_topic.pop(bytes(self.web3.keccak(text=content_hash)), None)
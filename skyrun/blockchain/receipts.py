@@ -0,0 +1,306 @@
+"""
+Block-driven tracking of receipts for pending transactions.
+"""
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set
+import asyncio
+import time
+
+from ..core.logging import get_logger
+
+if TYPE_CHECKING:
+    from web3 import AsyncWeb3
+
+logger = get_logger(__name__)
+
+def _hash_key(tx_hash: Any) -> str:
+    """Normalize a transaction hash given as hex string or bytes."""
+    if isinstance(tx_hash, str):
+        return tx_hash.lower() if tx_hash.startswith("0x") else "0x" + tx_hash.lower()
+    return "0x" + bytes(tx_hash).hex()
+
+class ReceiptTracker:
+    """Resolves the receipts of many pending transactions from one block watcher.
+
+    A single background loop reads the block number every ``poll_interval``
+    seconds. When blocks are new and transactions are pending, it fetches
+    each new block's receipts in one ``eth_getBlockReceipts`` call, or where
+    the node lacks that method, the block's transaction hashes and then only
+    the receipts of tracked ones. A receipt is handed to its waiters once its
+    block has ``confirmations`` confirmations and is still canonical.
+
+    Hashes tracked before the first block number is known are checked
+    individually once, since they may be mined in a block before it.
+    """
+
+    def __init__(
+        self,
+        web3: "AsyncWeb3",
+        confirmations: int = 1,
+        poll_interval: float = 1.0,
+        timeout: float = 300.0,
+        on_receipt: Optional[Callable[[Any], None]] = None
+    ):
+        """Initialize the receipt tracker.
+
+        Args:
+            web3: AsyncWeb3 instance
+            confirmations: Blocks, including its own, a receipt waits for
+            poll_interval: Seconds between block number reads
+            timeout: Seconds after which an unmined transaction is dropped
+                and its waiters fail
+            on_receipt: Optional callback for every confirmed receipt
+        """
+        self.web3 = web3
+        self.confirmations = max(1, int(confirmations))
+        self.poll_interval = float(poll_interval)
+        self.timeout = float(timeout)
+        self.on_receipt = on_receipt
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._tracked_at: Dict[str, float] = {}
+        self._unchecked: Set[str] = set()
+        # Mined but not yet confirmed: hash -> receipt
+        self._mined: Dict[str, Any] = {}
+        self._cursor: Optional[int] = None
+        self._head: Optional[int] = None
+        self._block_receipts = True
+        self._task: Optional[asyncio.Task] = None
+        self._polls = 0
+        self._blocks_scanned = 0
+        self._rpc_calls = 0
+        self._confirmed = 0
+        self._reorged = 0
+        self._timed_out = 0
+
+    @classmethod
+    def from_config(
+        cls,
+        web3: "AsyncWeb3",
+        config: Dict[str, Any],
+        on_receipt: Optional[Callable[[Any], None]] = None
+    ) -> "ReceiptTracker":
+        """Create a tracker from the ``blockchain`` configuration section.
+
+        Args:
+            web3: AsyncWeb3 instance
+            config: Dictionary with ``confirmations`` and an optional
+                ``receipts`` section with ``poll_interval`` and ``timeout``
+            on_receipt: Optional callback for every confirmed receipt
+
+        Returns:
+            ReceiptTracker instance
+        """
+        receipts_config = config.get("receipts", {})
+        return cls(
+            web3,
+            confirmations=config.get("confirmations", 1),
+            poll_interval=receipts_config.get("poll_interval", 1.0),
+            timeout=receipts_config.get("timeout", 300.0),
+            on_receipt=on_receipt
+        )
+
+    async def start(self) -> None:
+        """Start watching blocks; tracking a hash also starts it."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop watching blocks and fail the remaining waiters."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for future in self._futures.values():
+            if not future.done():
+                future.cancel()
+        self._futures.clear()
+        self._tracked_at.clear()
+        self._unchecked.clear()
+        self._mined.clear()
+
+    def track(self, tx_hash: Any) -> "asyncio.Future":
+        """Start tracking a transaction.
+
+        Args:
+            tx_hash: Transaction hash
+
+        Returns:
+            Future resolved with the confirmed receipt; shared by every
+            caller tracking the same hash
+        """
+        key = _hash_key(tx_hash)
+        future = self._futures.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._futures[key] = future
+            self._tracked_at[key] = time.monotonic()
+            if self._cursor is None:
+                self._unchecked.add(key)
+            if self._task is None:
+                self._task = asyncio.ensure_future(self._run())
+        return future
+
+    async def wait(self, tx_hash: Any, timeout: Optional[float] = None) -> Any:
+        """Wait for the confirmed receipt of a transaction.
+
+        Timing out only stops this caller waiting; the transaction stays
+        tracked.
+
+        Args:
+            tx_hash: Transaction hash
+            timeout: Optional maximum time to wait in seconds
+
+        Returns:
+            Transaction receipt
+
+        Raises:
+            asyncio.TimeoutError: If the receipt isn't confirmed in time
+        """
+        return await asyncio.wait_for(asyncio.shield(self.track(tx_hash)), timeout)
+
+    async def poll(self) -> None:
+        """Check for new blocks once and resolve what they confirm."""
+        self._polls += 1
+        self._expire()
+        idle = not self._futures
+        head = await self._call(self.web3.eth.block_number)
+        self._head = head
+
+        if self._unchecked:
+            await self._check_unchecked()
+        if idle and not self._futures:
+            # Nothing was sent before this head; skip its blocks
+            self._cursor = head
+            return
+        if self._cursor is None:
+            self._cursor = head
+        elif head > self._cursor:
+            await self._scan(range(self._cursor + 1, head + 1))
+            self._cursor = head
+        await self._confirm(head)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get tracker statistics.
+
+        Returns:
+            Dictionary of tracker statistics
+        """
+        return {
+            "pending": len(self._futures),
+            "awaiting_confirmations": len(self._mined),
+            "confirmations": self.confirmations,
+            "head": self._head,
+            "polls": self._polls,
+            "blocks_scanned": self._blocks_scanned,
+            "rpc_calls": self._rpc_calls,
+            "confirmed": self._confirmed,
+            "reorged": self._reorged,
+            "timed_out": self._timed_out,
+            "block_receipts": self._block_receipts
+        }
+
+    async def _run(self) -> None:
+        """Poll until stopped."""
+        while True:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Receipt tracker poll failed: {str(e)}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _call(self, awaitable: Any) -> Any:
+        """Await one RPC call, counting it."""
+        self._rpc_calls += 1
+        return await awaitable
+
+    async def _check_unchecked(self) -> None:
+        """Look up hashes that were tracked before a block number was known."""
+        from web3.exceptions import TransactionNotFound
+
+        keys, self._unchecked = list(self._unchecked), set()
+
+        async def fetch(key: str) -> None:
+            try:
+                self._mined[key] = await self._call(self.web3.eth.get_transaction_receipt(key))
+            except TransactionNotFound:
+                pass
+
+        await asyncio.gather(*(fetch(key) for key in keys if key in self._futures))
+
+    async def _scan(self, block_numbers: Iterable[int]) -> None:
+        """Collect the receipts of tracked transactions from new blocks."""
+        receipt_lists = await asyncio.gather(*(self._tracked_receipts(n) for n in block_numbers))
+        for receipts in receipt_lists:
+            self._blocks_scanned += 1
+            for receipt in receipts:
+                self._mined[_hash_key(receipt["transactionHash"])] = receipt
+
+    async def _tracked_receipts(self, block_number: int) -> List[Any]:
+        """Receipts of the tracked transactions in one block."""
+        if self._block_receipts:
+            try:
+                receipts = await self._call(self._get_block_receipts(block_number))
+                return [r for r in receipts if _hash_key(r["transactionHash"]) in self._futures]
+            except Exception as e:
+                # Not every node serves eth_getBlockReceipts
+                logger.info(f"Falling back to per-transaction receipts: {str(e)}")
+                self._block_receipts = False
+
+        block = await self._call(self.web3.eth.get_block(block_number))
+        keys = [_hash_key(tx_hash) for tx_hash in block["transactions"]]
+        return await asyncio.gather(*(
+            self._call(self.web3.eth.get_transaction_receipt(key)) for key in keys if key in self._futures
+        ))
+
+    async def _get_block_receipts(self, block_number: int) -> List[Any]:
+        """Call ``eth_getBlockReceipts``, which this web3 version doesn't wrap."""
+        from web3._utils.method_formatters import receipt_formatter
+
+        receipts = await self.web3.manager.coro_request("eth_getBlockReceipts", [hex(block_number)])
+        return [receipt_formatter(receipt) for receipt in receipts or []]
+
+    async def _confirm(self, head: int) -> None:
+        """Resolve receipts with enough confirmations whose block is still canonical."""
+        ready = {
+            key: receipt for key, receipt in self._mined.items()
+            if head - receipt["blockNumber"] + 1 >= self.confirmations
+        }
+        if not ready:
+            return
+
+        if self.confirmations > 1:
+            block_numbers = sorted({receipt["blockNumber"] for receipt in ready.values()})
+            blocks = await asyncio.gather(*(self._call(self.web3.eth.get_block(n)) for n in block_numbers))
+            canonical = {block["number"]: block["hash"] for block in blocks}
+            for key, receipt in list(ready.items()):
+                if canonical[receipt["blockNumber"]] != receipt["blockHash"]:
+                    # Reorged out; rescan from its old block to find it again
+                    del ready[key]
+                    del self._mined[key]
+                    self._cursor = min(self._cursor, receipt["blockNumber"] - 1)
+                    self._reorged += 1
+
+        for key, receipt in ready.items():
+            del self._mined[key]
+            self._tracked_at.pop(key, None)
+            future = self._futures.pop(key, None)
+            self._confirmed += 1
+            if self.on_receipt is not None:
+                try:
+                    self.on_receipt(receipt)
+                except Exception as e:
+                    logger.warning(f"Receipt callback failed: {str(e)}")
+            if future is not None and not future.done():
+                future.set_result(receipt)
+
+    def _expire(self) -> None:
+        """Drop transactions that haven't been mined within the timeout."""
+        deadline = time.monotonic() - self.timeout
+        for key in [k for k, t in self._tracked_at.items() if t < deadline and k not in self._mined]:
+            del self._tracked_at[key]
+            future = self._futures.pop(key)
+            self._timed_out += 1
+            if not future.done():
+                future.set_exception(asyncio.TimeoutError(f"Transaction {key} not mined in {self.timeout}s"))
@@ -0,0 +1,408 @@
+"""
+Off-loop signing with a cache of unlocked keystores.
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import asyncio
+import functools
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+
+from ..core.logging import get_logger
+from ..core.metrics import observe
+
+logger = get_logger(__name__)
+
+class SignedTransaction(NamedTuple):
+    """A signed transaction, ready for ``eth_sendRawTransaction``."""
+
+    raw_transaction: bytes
+    hash: bytes
+
+def _account() -> Any:
+    """Import ``eth_account.Account`` on first use."""
+    from eth_account import Account
+    return Account
+
+def signable_message(message: str) -> Any:
+    """The EIP-191 message signed for ``message``: the keccak hash of its text."""
+    from eth_account.messages import encode_defunct
+    from eth_utils import keccak
+    return encode_defunct(primitive=keccak(text=message))
+
+def sign_message(message: str, private_key: bytes) -> Dict[str, int]:
+    """Sign a message on the calling thread.
+
+    Args:
+        message: Message to sign
+        private_key: Key of the signer
+
+    Returns:
+        Dictionary with the ``r``, ``s`` and ``v`` signature components
+    """
+    signature = _account().sign_message(signable_message(message), private_key=private_key)
+    return {"r": signature.r, "s": signature.s, "v": signature.v}
+
+def _sign_transactions(txs: Sequence[Dict[str, Any]], private_key: bytes) -> List[Tuple[bool, Any]]:
+    """Sign a chunk of transactions in a worker, as ``(success, result or error)`` pairs."""
+    account = _account()
+    results = []
+    for tx in txs:
+        try:
+            signed = account.sign_transaction(tx, private_key)
+            results.append((True, SignedTransaction(bytes(signed.rawTransaction), bytes(signed.hash))))
+        except Exception as e:
+            results.append((False, str(e)))
+    return results
+
+def _sign_messages(messages: Sequence[str], private_key: bytes) -> List[Tuple[bool, Any]]:
+    """Sign a chunk of messages in a worker, as ``(success, result or error)`` pairs."""
+    results = []
+    for message in messages:
+        try:
+            results.append((True, sign_message(message, private_key)))
+        except Exception as e:
+            results.append((False, str(e)))
+    return results
+
+def _decrypt(keyfile_json: Dict[str, Any], password: str) -> bytes:
+    """Decrypt a keystore in a worker."""
+    return bytes(_account().decrypt(keyfile_json, password))
+
+class _UnlockedKey:
+    """A decrypted key held by the signer until it expires."""
+
+    __slots__ = ("key", "salt", "password_digest", "expires")
+
+    def __init__(self, key: bytes, password: str, expires: float):
+        self.key = bytearray(key)
+        self.salt = secrets.token_bytes(16)
+        self.password_digest = self._digest(password)
+        self.expires = expires
+
+    def _digest(self, password: str) -> bytes:
+        return hashlib.blake2b(password.encode(), key=self.salt).digest()
+
+    def matches(self, password: str) -> bool:
+        """Whether ``password`` is the one the key was unlocked with."""
+        return hmac.compare_digest(self.password_digest, self._digest(password))
+
+    def wipe(self) -> None:
+        """Overwrite the cached key."""
+        for i in range(len(self.key)):
+            self.key[i] = 0
+
+class Signer:
+    """App-scoped service that unlocks keystores and signs off the event loop.
+
+    Keystore decryption is deliberately slow, so each keystore is decrypted
+    once and its key kept in memory for ``unlock_ttl`` seconds. A later
+    unlock with the same password is served from the cache; any other
+    password is checked by decrypting again. Expired and evicted keys are
+    overwritten in place, which protects the cache's copy only: keys
+    returned to callers are theirs to manage.
+
+    Signing runs on a pool of ``workers`` threads or processes. Batches are
+    split into chunks of ``chunk_size`` items, one pool job per chunk.
+    """
+
+    KINDS = ("thread", "process")
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        workers: int = 2,
+        unlock_ttl: float = 900.0,
+        max_keys: int = 64,
+        chunk_size: int = 64
+    ):
+        """Initialize the signer.
+
+        Args:
+            kind: ``thread`` or ``process``
+            workers: Number of signing threads or processes
+            unlock_ttl: Seconds an unlocked key is kept
+            max_keys: Number of unlocked keys kept
+            chunk_size: Items signed per pool job in bulk calls
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown signer kind: {kind}")
+
+        self.kind = kind
+        self.workers = max(1, int(workers))
+        self.unlock_ttl = float(unlock_ttl)
+        self.max_keys = max(1, int(max_keys))
+        self.chunk_size = max(1, int(chunk_size))
+        self._pool: Optional[Executor] = None
+        self._keys: Dict[Tuple[str, int], _UnlockedKey] = {}
+        self._keys_lock = threading.Lock()
+        self._unlock_locks: Dict[Tuple[str, int], asyncio.Lock] = {}
+        self._unlocks = 0
+        self._unlock_hits = 0
+        self._signed_transactions = 0
+        self._signed_messages = 0
+        self._failures = 0
+        self._sign_time = 0.0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "Signer":
+        """Create a signer from the ``blockchain.signer`` configuration.
+
+        Args:
+            config: Dictionary with optional ``kind``, ``workers``,
+                ``unlock_ttl``, ``max_keys`` and ``chunk_size`` keys
+
+        Returns:
+            Signer instance
+        """
+        return cls(
+            kind=config.get("kind", "thread"),
+            workers=config.get("workers", 2),
+            unlock_ttl=config.get("unlock_ttl", 900.0),
+            max_keys=config.get("max_keys", 64),
+            chunk_size=config.get("chunk_size", 64)
+        )
+
+    async def unlock(self, keyfile_path: str, password: str) -> bytes:
+        """Get the key of a keystore, decrypting it on the pool if it isn't cached.
+
+        Concurrent unlocks of one keystore share a single decryption.
+
+        Args:
+            keyfile_path: Path to the keyfile
+            password: Password to decrypt the keyfile
+
+        Returns:
+            Private key
+
+        Raises:
+            ValueError: If the password is wrong
+        """
+        cache_key = self._cache_key(keyfile_path)
+        key = self._cached(cache_key, password)
+        if key is not None:
+            return key
+
+        lock = self._unlock_locks.setdefault(cache_key, asyncio.Lock())
+        async with lock:
+            key = self._cached(cache_key, password)
+            if key is None:
+                keyfile_json = self._read_keyfile(keyfile_path)
+                key = await self._run(_decrypt, keyfile_json, password)
+                self._store(cache_key, key, password)
+            return key
+
+    def unlock_blocking(self, keyfile_path: str, password: str) -> bytes:
+        """Get the key of a keystore, decrypting it on the calling thread if it isn't cached.
+
+        Args:
+            keyfile_path: Path to the keyfile
+            password: Password to decrypt the keyfile
+
+        Returns:
+            Private key
+        """
+        cache_key = self._cache_key(keyfile_path)
+        key = self._cached(cache_key, password)
+        if key is None:
+            keyfile_json = self._read_keyfile(keyfile_path)
+            key = _decrypt(keyfile_json, password)
+            self._store(cache_key, key, password)
+        return key
+
+    def lock(self, keyfile_path: Optional[str] = None) -> None:
+        """Wipe and drop unlocked keys.
+
+        Args:
+            keyfile_path: Keyfile to lock; all keys if omitted
+        """
+        with self._keys_lock:
+            if keyfile_path is None:
+                cache_keys = list(self._keys)
+            else:
+                path = os.path.realpath(keyfile_path)
+                cache_keys = [cache_key for cache_key in self._keys if cache_key[0] == path]
+            for cache_key in cache_keys:
+                self._keys.pop(cache_key).wipe()
+
+    async def sign_transaction(self, tx: Dict[str, Any], private_key: bytes) -> SignedTransaction:
+        """Sign one prepared transaction on the pool.
+
+        Args:
+            tx: Transaction with nonce, fees and gas filled in
+            private_key: Key of the sender
+
+        Returns:
+            Signed transaction
+
+        Raises:
+            ValueError: If the transaction can't be signed
+        """
+        [(success, result)] = await self._sign(_sign_transactions, [tx], private_key)
+        if not success:
+            raise ValueError(result)
+        return result
+
+    async def sign_transactions(self, txs: List[Dict[str, Any]], private_key: bytes) -> List[Dict[str, Any]]:
+        """Sign a batch of prepared transactions across the pool.
+
+        Args:
+            txs: Transactions with nonce, fees and gas filled in
+            private_key: Key of the sender
+
+        Returns:
+            For every transaction, in order, a dictionary with ``success`` and
+            either the ``SignedTransaction`` as ``result`` or an ``error``
+        """
+        return self._to_items(await self._sign(_sign_transactions, txs, private_key))
+
+    async def sign_message(self, message: str, private_key: bytes) -> Dict[str, int]:
+        """Sign one message on the pool.
+
+        Args:
+            message: Message to sign
+            private_key: Key of the signer
+
+        Returns:
+            Dictionary with the ``r``, ``s`` and ``v`` signature components
+        """
+        [(success, result)] = await self._sign(_sign_messages, [message], private_key)
+        if not success:
+            raise ValueError(result)
+        return result
+
+    async def sign_messages(self, messages: List[str], private_key: bytes) -> List[Dict[str, Any]]:
+        """Sign a batch of messages across the pool.
+
+        Args:
+            messages: Messages to sign
+            private_key: Key of the signer
+
+        Returns:
+            For every message, in order, a dictionary with ``success`` and
+            either the signature components as ``result`` or an ``error``
+        """
+        return self._to_items(await self._sign(_sign_messages, messages, private_key))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get signer statistics.
+
+        Returns:
+            Dictionary of signer statistics
+        """
+        with self._keys_lock:
+            unlocked = sum(1 for entry in self._keys.values() if entry.expires > time.monotonic())
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "unlocked_keys": unlocked,
+            "unlocks": self._unlocks,
+            "unlock_cache_hits": self._unlock_hits,
+            "signed_transactions": self._signed_transactions,
+            "signed_messages": self._signed_messages,
+            "failures": self._failures,
+            "sign_time": self._sign_time
+        }
+
+    async def close(self) -> None:
+        """Wipe unlocked keys and stop the workers."""
+        self.lock()
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.get_running_loop().run_in_executor(None, pool.shutdown)
+
+    def _get_pool(self) -> Executor:
+        """Create the underlying pool on first use."""
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="signer")
+            logger.info(f"Started {self.kind} signer with {self.workers} workers")
+        return self._pool
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking callable on the pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), functools.partial(fn, *args))
+
+    async def _sign(
+        self,
+        fn: Callable[[Sequence[Any], bytes], List[Tuple[bool, Any]]],
+        items: Sequence[Any],
+        private_key: bytes
+    ) -> List[Tuple[bool, Any]]:
+        """Sign items in chunks, one pool job per chunk."""
+        if not items:
+            return []
+        private_key = bytes(private_key)
+        start = time.perf_counter()
+        chunks = await asyncio.gather(*(
+            self._run(fn, list(items[i:i + self.chunk_size]), private_key)
+            for i in range(0, len(items), self.chunk_size)
+        ))
+        elapsed = time.perf_counter() - start
+        self._sign_time += elapsed
+        observe("signer", fn.__name__.lstrip("_"), elapsed)
+
+        results = [result for chunk in chunks for result in chunk]
+        failures = sum(1 for success, _ in results if not success)
+        self._failures += failures
+        if fn is _sign_transactions:
+            self._signed_transactions += len(results) - failures
+        else:
+            self._signed_messages += len(results) - failures
+        return results
+
+    @staticmethod
+    def _to_items(results: List[Tuple[bool, Any]]) -> List[Dict[str, Any]]:
+        """Per-item result dictionaries, like those of bulk reads."""
+        return [
+            {"success": True, "result": result} if success else {"success": False, "error": result}
+            for success, result in results
+        ]
+
+    @staticmethod
+    def _cache_key(keyfile_path: str) -> Tuple[str, int]:
+        """Cache key of a keyfile: its real path and modification time."""
+        path = os.path.realpath(keyfile_path)
+        return path, os.stat(path).st_mtime_ns
+
+    @staticmethod
+    def _read_keyfile(keyfile_path: str) -> Dict[str, Any]:
+        with open(keyfile_path) as f:
+            return json.load(f)
+
+    def _cached(self, cache_key: Tuple[str, int], password: str) -> Optional[bytes]:
+        """The cached key of a keyfile, if unlocked with the same password and not expired."""
+        with self._keys_lock:
+            entry = self._keys.get(cache_key)
+            if entry is None:
+                return None
+            if entry.expires <= time.monotonic():
+                self._keys.pop(cache_key).wipe()
+                return None
+            if not entry.matches(password):
+                return None
+            self._unlock_hits += 1
+            return bytes(entry.key)
+
+    def _store(self, cache_key: Tuple[str, int], key: bytes, password: str) -> None:
+        """Cache a decrypted key, evicting expired keys and then the oldest ones."""
+        entry = _UnlockedKey(key, password, time.monotonic() + self.unlock_ttl)
+        with self._keys_lock:
+            self._unlocks += 1
+            now = time.monotonic()
+            for stale_key in [k for k, e in self._keys.items() if e.expires <= now or k[0] == cache_key[0]]:
+                # Also drops keys of an older version of the same keyfile
+                self._keys.pop(stale_key).wipe()
+            while len(self._keys) >= self.max_keys:
+                oldest = min(self._keys, key=lambda k: self._keys[k].expires)
+                self._keys.pop(oldest).wipe()
+            self._keys[cache_key] = entry
@@ -2,30 +2,61 @@
 Transaction implementation for blockchain interactions.
 """
 
-from typing import Dict, Optional
-from web3 import Web3
-from eth_account import Account
+from typing import TYPE_CHECKING, Dict, Optional, Union
+import asyncio
 import json
 from datetime import datetime
 
+from ..core.metrics import timed
+
+if TYPE_CHECKING:
+    from web3 import AsyncWeb3, Web3
+    from .receipts import ReceiptTracker
+
 class Transaction:
-    """Transaction class for managing blockchain transactions."""
+    """Transaction class for managing blockchain transactions.
+    
+    The receipt is fetched on first use rather than on creation. Built on an
+    ``AsyncWeb3`` instance, it is only fetched by the ``*_async`` methods,
+    through the shared receipt tracker when one is given.
+    """
     
-    def __init__(self, web3: Web3, tx_hash: Optional[str] = None):
+    def __init__(
+        self,
+        web3: Union["Web3", "AsyncWeb3"],
+        tx_hash: Optional[str] = None,
+        tracker: Optional["ReceiptTracker"] = None
+    ):
         """Initialize the transaction.
         
         Args:
-            web3: Web3 instance
+            web3: Web3 or AsyncWeb3 instance
             tx_hash: Optional transaction hash
+            tracker: Optional shared receipt tracker for the async methods
         """
         self.web3 = web3
         self.tx_hash = tx_hash
-        self.tx_receipt = None
-        if tx_hash:
-            self.tx_receipt = self.web3.eth.get_transaction_receipt(tx_hash)
+        self.tracker = tracker
+        self._tx_receipt: Optional[Dict] = None
+        
+    @property
+    def tx_receipt(self) -> Optional[Dict]:
+        """The receipt, or None while pending; a blocking client fetches it here."""
+        if self._tx_receipt is None and self.tx_hash and not getattr(self.web3.eth, "is_async", False):
+            from web3.exceptions import TransactionNotFound
             
+            try:
+                self._tx_receipt = self.web3.eth.get_transaction_receipt(self.tx_hash)
+            except TransactionNotFound:
+                pass
+        return self._tx_receipt
+        
+    @tx_receipt.setter
+    def tx_receipt(self, receipt: Optional[Dict]) -> None:
+        self._tx_receipt = receipt
+        
     @classmethod
-    def from_receipt(cls, web3: Web3, receipt: Dict) -> 'Transaction':
+    def from_receipt(cls, web3: "Web3", receipt: Dict) -> 'Transaction':
         """Create a transaction from a receipt.
         
         Args:
@@ -138,4 +169,55 @@ class Transaction:
                 self.tx_hash,
                 timeout=timeout
             )
-        return self.tx_receipt 
\ No newline at end of file
+        return self.tx_receipt
+        
+    async def get_receipt_async(self) -> Optional[Dict]:
+        """Fetch the receipt once without blocking.
+        
+        Returns:
+            Transaction receipt, or None while the transaction is pending
+        """
+        from web3.exceptions import TransactionNotFound
+        
+        if not self._tx_receipt:
+            try:
+                with timed("transaction", "get_receipt"):
+                    self._tx_receipt = await self.web3.eth.get_transaction_receipt(self.tx_hash)
+            except TransactionNotFound:
+                return None
+        return self._tx_receipt
+        
+    async def wait_for_receipt_async(self, timeout: float = 300, poll_interval: float = 0.5) -> Dict:
+        """Wait for the transaction receipt without blocking the event loop.
+        
+        With a tracker, the wait costs no RPC calls of its own and the
+        receipt has the configured number of confirmations.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+            poll_interval: Time between receipt polls in seconds, without a
+                tracker
+            
+        Returns:
+            Transaction receipt
+            
+        Raises:
+            asyncio.TimeoutError: If the receipt isn't available, or a
+                tracked receipt isn't confirmed, in time
+        """
+        from web3.exceptions import TimeExhausted
+        
+        if not self._tx_receipt:
+            with timed("transaction", "wait_for_receipt"):
+                if self.tracker is not None:
+                    self._tx_receipt = await self.tracker.wait(self.tx_hash, timeout)
+                else:
+                    try:
+                        self._tx_receipt = await self.web3.eth.wait_for_transaction_receipt(
+                            self.tx_hash,
+                            timeout=timeout,
+                            poll_latency=poll_interval
+                        )
+                    except TimeExhausted as e:
+                        raise asyncio.TimeoutError(str(e)) from e
+        return self._tx_receipt
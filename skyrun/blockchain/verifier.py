@@ -0,0 +1,250 @@
+"""
+Bulk signature verification on a process pool.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import functools
+import multiprocessing
+import os
+import time
+
+from ..core.logging import get_logger
+from ..core.metrics import observe
+from .signer import signable_message
+
+logger = get_logger(__name__)
+
+# (message, v, r, s)
+_Key = Tuple[str, int, int, int]
+
+def _recover_addresses(items: Sequence[_Key]) -> List[Tuple[bool, str]]:
+    """Recover the signers of a chunk of messages in a worker, as ``(success, address or error)`` pairs."""
+    from eth_account import Account
+
+    results = []
+    for message, v, r, s in items:
+        try:
+            results.append((True, Account.recover_message(signable_message(message), vrs=(v, r, s))))
+        except Exception as e:
+            results.append((False, str(e)))
+    return results
+
+def recover_address(message: str, signature: Dict[str, Any]) -> str:
+    """Recover the signer of a message on the calling thread.
+
+    Args:
+        message: Original message
+        signature: Signature components
+
+    Returns:
+        Checksummed address of the signer
+    """
+    [(success, result)] = _recover_addresses([_key(message, signature)])
+    if not success:
+        raise ValueError(result)
+    return result
+
+def _key(message: str, signature: Dict[str, Any]) -> _Key:
+    """Cache key of a signed message."""
+    return message, int(signature["v"]), int(signature["r"]), int(signature["s"])
+
+class SignatureVerifier:
+    """App-scoped verifier of signed messages in bulk.
+
+    Address recovery is CPU bound and holds the GIL, so batches are split
+    into chunks of ``chunk_size`` and recovered on a pool of ``workers``
+    processes. Recovered signers of recent ``(message, signature)`` pairs
+    are kept in an LRU of ``cache_size`` entries, and a pair repeated
+    within a batch is recovered once.
+
+    Worker processes are spawned rather than forked, since the server
+    process already runs model, executor and logging threads whose locks a
+    forked child would inherit. ``start`` creates them ahead of the first
+    batch.
+    """
+
+    KINDS = ("thread", "process")
+
+    def __init__(
+        self,
+        kind: str = "process",
+        workers: int = 0,
+        chunk_size: int = 256,
+        cache_size: int = 10000
+    ):
+        """Initialize the verifier.
+
+        Args:
+            kind: ``process`` or ``thread``
+            workers: Number of workers, 0 for one per CPU core
+            chunk_size: Signatures recovered per pool job
+            cache_size: Number of recovered signers kept
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown verifier kind: {kind}")
+
+        self.kind = kind
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.chunk_size = max(1, int(chunk_size))
+        self.cache_size = max(0, int(cache_size))
+        self._pool: Optional[Executor] = None
+        self._cache: "OrderedDict[_Key, str]" = OrderedDict()
+        self._verified = 0
+        self._invalid = 0
+        self._failures = 0
+        self._recoveries = 0
+        self._cache_hits = 0
+        self._recover_time = 0.0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "SignatureVerifier":
+        """Create a verifier from the ``blockchain.verifier`` configuration.
+
+        Args:
+            config: Dictionary with optional ``kind``, ``workers``,
+                ``chunk_size`` and ``cache_size`` keys
+
+        Returns:
+            SignatureVerifier instance
+        """
+        return cls(
+            kind=config.get("kind", "process"),
+            workers=config.get("workers", 0),
+            chunk_size=config.get("chunk_size", 256),
+            cache_size=config.get("cache_size", 10000)
+        )
+
+    async def start(self) -> None:
+        """Create the workers and load the signature code in each of them."""
+        pool = self._get_pool()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(pool, _recover_addresses, []) for _ in range(self.workers)
+        ))
+
+    async def recover_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Recover the signers of many messages.
+
+        Args:
+            items: ``(message, signature)`` pairs, signatures as returned by
+                ``Wallet.sign_message``
+
+        Returns:
+            For every pair, in order, a dictionary with ``success`` and
+            either the signer's address as ``result`` or an ``error``
+        """
+        keys: List[Optional[_Key]] = []
+        results: List[Optional[Dict[str, Any]]] = []
+        missing: "OrderedDict[_Key, None]" = OrderedDict()
+        for message, signature in items:
+            try:
+                key = _key(message, signature)
+            except (KeyError, TypeError, ValueError) as e:
+                keys.append(None)
+                results.append({"success": False, "error": f"Malformed signature: {str(e)}"})
+                continue
+            keys.append(key)
+            address = self._cache.get(key)
+            if address is None:
+                missing[key] = None
+                results.append(None)
+            else:
+                self._cache.move_to_end(key)
+                self._cache_hits += 1
+                results.append({"success": True, "result": address})
+
+        recovered = await self._recover(list(missing))
+        for i, key in enumerate(keys):
+            if results[i] is None:
+                success, result = recovered[key]
+                results[i] = {"success": True, "result": result} if success else {"success": False, "error": result}
+        self._failures += sum(1 for result in results if not result["success"])
+        return results
+
+    async def verify_batch(self, items: List[Tuple[str, Dict[str, Any], str]]) -> List[Dict[str, Any]]:
+        """Check that many messages were signed by the given addresses.
+
+        Args:
+            items: ``(message, signature, address)`` triples
+
+        Returns:
+            For every triple, in order, a dictionary with ``success`` and
+            either whether the signature is valid as ``result`` or an
+            ``error``; ``signer`` holds the recovered address
+        """
+        recovered = await self.recover_batch([(message, signature) for message, signature, _ in items])
+        results = []
+        for (_, _, address), item in zip(items, recovered):
+            if not item["success"]:
+                results.append(item)
+                continue
+            valid = item["result"].lower() == address.lower()
+            self._verified += 1
+            self._invalid += 0 if valid else 1
+            results.append({"success": True, "result": valid, "signer": item["result"]})
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """Get verifier statistics.
+
+        Returns:
+            Dictionary of verifier statistics
+        """
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "verified": self._verified,
+            "invalid": self._invalid,
+            "failures": self._failures,
+            "recoveries": self._recoveries,
+            "cache_hits": self._cache_hits,
+            "cache_size": len(self._cache),
+            "recover_time": self._recover_time
+        }
+
+    async def close(self) -> None:
+        """Stop the workers."""
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.get_running_loop().run_in_executor(None, pool.shutdown)
+
+    def _get_pool(self) -> Executor:
+        """Create the underlying pool on first use."""
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="verifier")
+            logger.info(f"Started {self.kind} verifier with {self.workers} workers")
+        return self._pool
+
+    async def _recover(self, keys: List[_Key]) -> Dict[_Key, Tuple[bool, str]]:
+        """Recover signers in chunks, one pool job per chunk, and cache them."""
+        if not keys:
+            return {}
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        start = time.perf_counter()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(pool, functools.partial(_recover_addresses, keys[i:i + self.chunk_size]))
+            for i in range(0, len(keys), self.chunk_size)
+        ))
+        elapsed = time.perf_counter() - start
+        self._recover_time += elapsed
+        observe("verifier", "recover", elapsed)
+        self._recoveries += len(keys)
+
+        recovered = dict(zip(keys, (result for chunk in chunks for result in chunk)))
+        if self.cache_size:
+            for key, (success, address) in recovered.items():
+                if success:
+                    self._cache[key] = address
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return recovered
@@ -2,47 +2,115 @@
 Wallet implementation for blockchain interactions.
 """
 
-from typing import Dict, Optional
-from web3 import Web3
-from eth_account import Account
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 import json
 import os
 
+from ..core.metrics import timed
+from .bulk import BulkReader
+from .nonce import TransactionSubmitter
+from .signer import Signer, sign_message
+from .verifier import SignatureVerifier, recover_address
+
+if TYPE_CHECKING:
+    from web3 import AsyncWeb3, Web3
+
+def _account() -> Any:
+    """Import ``eth_account.Account`` on first use."""
+    from eth_account import Account
+    return Account
+
 class Wallet:
-    """Wallet class for managing blockchain accounts and transactions."""
+    """Wallet class for managing blockchain accounts and transactions.
     
-    def __init__(self, web3: Web3, private_key: Optional[str] = None):
+    Built on an ``AsyncWeb3`` instance, use the ``*_async`` methods for
+    anything that talks to the node.
+    """
+    
+    def __init__(
+        self,
+        web3: Union["Web3", "AsyncWeb3"],
+        private_key: Optional[str] = None,
+        submitter: Optional[TransactionSubmitter] = None,
+        reader: Optional[BulkReader] = None,
+        signer: Optional[Signer] = None,
+        verifier: Optional[SignatureVerifier] = None
+    ):
         """Initialize the wallet.
         
         Args:
-            web3: Web3 instance
+            web3: Web3 or AsyncWeb3 instance
             private_key: Optional private key for the wallet
+            submitter: Optional shared transaction submitter for the async
+                methods, so nonces are allocated across instances
+            reader: Optional shared bulk reader for ``get_balance_bulk_async``
+            signer: Optional shared signer for the async signing methods
+            verifier: Optional shared verifier for ``verify_signatures_async``
         """
         self.web3 = web3
+        self.submitter = submitter
+        self.reader = reader
+        self.signer = signer
+        self.verifier = verifier
         self.account = None
         if private_key:
-            self.account = Account.from_key(private_key)
+            self.account = _account().from_key(private_key)
         else:
-            self.account = Account.create()
+            self.account = _account().create()
             
     @classmethod
-    def from_keyfile(cls, web3: Web3, keyfile_path: str, password: str) -> 'Wallet':
+    def from_keyfile(
+        cls,
+        web3: "Web3",
+        keyfile_path: str,
+        password: str,
+        signer: Optional[Signer] = None
+    ) -> 'Wallet':
         """Create a wallet from a keyfile.
         
         Args:
             web3: Web3 instance
             keyfile_path: Path to the keyfile
             password: Password to decrypt the keyfile
+            signer: Optional signer whose unlocked keys are reused, so the
+                keyfile is only decrypted once
             
         Returns:
             Wallet instance
         """
+        if signer is not None:
+            return cls(web3, signer.unlock_blocking(keyfile_path, password).hex(), signer=signer)
+        
         with open(keyfile_path) as f:
             keyfile_json = json.load(f)
             
-        private_key = Account.decrypt(keyfile_json, password)
+        private_key = _account().decrypt(keyfile_json, password)
         return cls(web3, private_key.hex())
         
+    @classmethod
+    async def from_keyfile_async(
+        cls,
+        web3: "AsyncWeb3",
+        keyfile_path: str,
+        password: str,
+        signer: Signer,
+        **kwargs: Any
+    ) -> 'Wallet':
+        """Create a wallet from a keyfile, decrypting it off the event loop.
+        
+        Args:
+            web3: AsyncWeb3 instance
+            keyfile_path: Path to the keyfile
+            password: Password to decrypt the keyfile
+            signer: Signer that unlocks the keyfile and caches its key
+            **kwargs: Further arguments for the wallet, e.g. ``submitter``
+            
+        Returns:
+            Wallet instance
+        """
+        private_key = await signer.unlock(keyfile_path, password)
+        return cls(web3, private_key.hex(), signer=signer, **kwargs)
+        
     def save_keyfile(self, keyfile_path: str, password: str) -> None:
         """Save the wallet's private key to a keyfile.
         
@@ -50,7 +118,7 @@ class Wallet:
             keyfile_path: Path to save the keyfile
             password: Password to encrypt the keyfile
         """
-        keyfile_json = Account.encrypt(self.account.key, password)
+        keyfile_json = _account().encrypt(self.account.key, password)
         
         os.makedirs(os.path.dirname(keyfile_path), exist_ok=True)
         with open(keyfile_path, 'w') as f:
@@ -64,6 +132,29 @@ class Wallet:
         """
         return self.web3.eth.get_balance(self.account.address)
         
+    async def get_balance_async(self) -> int:
+        """Get the wallet's balance in wei without blocking.
+        
+        Returns:
+            Balance in wei
+        """
+        with timed("wallet", "get_balance"):
+            return await self.web3.eth.get_balance(self.account.address)
+        
+    async def get_balance_bulk_async(self, addresses: List[str]) -> List[Dict[str, Any]]:
+        """Get the balances of many addresses in batched requests.
+        
+        Args:
+            addresses: Addresses to look up
+            
+        Returns:
+            For every address, in order, a dictionary with ``success`` and
+            either the balance in wei as ``result`` or an ``error``
+        """
+        if self.reader is None:
+            self.reader = BulkReader(self.web3)
+        return await self.reader.get_balances(addresses)
+        
     def send_transaction(self, to_address: str, amount: int, data: Optional[bytes] = None) -> str:
         """Send a transaction.
         
@@ -90,6 +181,30 @@ class Wallet:
         
         return self.web3.to_hex(tx_hash)
         
+    async def send_transaction_async(self, to_address: str, amount: int, data: Optional[bytes] = None) -> str:
+        """Send a transaction without blocking.
+        
+        Args:
+            to_address: Recipient address
+            amount: Amount to send in wei
+            data: Optional transaction data
+            
+        Returns:
+            Transaction hash
+        """
+        # Fees and the gas limit are added by the submitter
+        tx = {
+            'from': self.account.address,
+            'to': to_address,
+            'value': amount,
+            'data': data or b''
+        }
+        
+        if self.submitter is None:
+            self.submitter = TransactionSubmitter(self.web3, signer=self.signer)
+        with timed("wallet", "send_transaction"):
+            return await self.submitter.submit(tx, self.account.key)
+        
     def sign_message(self, message: str) -> Dict:
         """Sign a message.
         
@@ -99,17 +214,31 @@ class Wallet:
         Returns:
             Dictionary containing signature components
         """
-        message_hash = self.web3.keccak(text=message)
-        signature = self.web3.eth.account.sign_message(
-            message_hash,
-            private_key=self.account.key
-        )
-        
-        return {
-            'r': signature.r,
-            's': signature.s,
-            'v': signature.v
-        }
+        return sign_message(message, self.account.key)
+        
+    async def sign_message_async(self, message: str) -> Dict:
+        """Sign a message on the signer's pool.
+        
+        Args:
+            message: Message to sign
+            
+        Returns:
+            Dictionary containing signature components
+        """
+        with timed("wallet", "sign_message"):
+            return await self._get_signer().sign_message(message, self.account.key)
+        
+    async def sign_messages_async(self, messages: List[str]) -> List[Dict[str, Any]]:
+        """Sign many messages across the signer's pool.
+        
+        Args:
+            messages: Messages to sign
+            
+        Returns:
+            For every message, in order, a dictionary with ``success`` and
+            either the signature components as ``result`` or an ``error``
+        """
+        return await self._get_signer().sign_messages(messages, self.account.key)
         
     def verify_signature(self, message: str, signature: Dict) -> bool:
         """Verify a message signature.
@@ -121,10 +250,30 @@ class Wallet:
         Returns:
             True if signature is valid, False otherwise
         """
-        message_hash = self.web3.keccak(text=message)
-        recovered_address = self.web3.eth.account.recover_message(
-            message_hash,
-            signature=signature
-        )
+        recovered_address = recover_address(message, signature)
+        
+        return recovered_address.lower() == self.account.address.lower()
+        
+    async def verify_signatures_async(self, messages: List[str], signatures: List[Dict]) -> List[Dict[str, Any]]:
+        """Verify that many messages were signed by this wallet, on the verifier's pool.
+        
+        Args:
+            messages: Original messages
+            signatures: Signature components, one per message
+            
+        Returns:
+            For every message, in order, a dictionary with ``success`` and
+            either whether the signature is valid as ``result`` or an ``error``
+        """
+        if self.verifier is None:
+            self.verifier = SignatureVerifier()
+        return await self.verifier.verify_batch([
+            (message, signature, self.account.address)
+            for message, signature in zip(messages, signatures)
+        ])
         
-        return recovered_address.lower() == self.account.address.lower() 
\ No newline at end of file
+    def _get_signer(self) -> Signer:
+        """The shared signer, or one of the wallet's own."""
+        if self.signer is None:
+            self.signer = Signer()
+        return self.signer
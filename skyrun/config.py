@@ -18,6 +18,7 @@ class Settings(BaseSettings):
     WEB3_PROVIDER: str = "http://localhost:8545"
     CONTRACT_ADDRESS: str = "0x..."  # Would be properly configured
     CONTRACT_ABI: list = []  # Would be properly loaded
+    ANCHOR_PRIVATE_KEY: str = ""  # Key registering Merkle roots; the node signs for the configured owner if empty
     
     # Model Settings
     CREATIVE_MODEL: str = "gpt2"
@@ -30,6 +31,9 @@ class Settings(BaseSettings):
     # Storage Settings
     STORAGE_PATH: str = "data"
     
+    # Profiling Settings
+    PROFILE_TOKEN: str = ""  # X-Profile value that profiles a request; header disabled if empty
+    
     class Config:
         """Pydantic config."""
         env_file = ".env"
@@ -1,11 +1,11 @@
 """
 Core configuration management for SkyRun.
 """
+import functools
 import os
 from pathlib import Path
 from typing import Dict, Any
 
-import yaml
 from pydantic import BaseSettings
 
 class Settings(BaseSettings):
@@ -39,6 +39,16 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
 
+def _deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Recursively merge ``override`` into a copy of ``base``."""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
 class ConfigManager:
     """Configuration manager for loading and managing config files."""
     
@@ -54,13 +64,44 @@ class ConfigManager:
         if not config_file.exists():
             config_file = self.settings.CONFIG_DIR / "default.yaml"
         
+        self.config = self._load_file(config_file)
+    
+    def _load_file(self, config_file: Path) -> Dict[str, Any]:
+        """Load a YAML file, resolving its ``_extends`` parent first.
+        
+        Args:
+            config_file: Path to the YAML file
+        
+        Returns:
+            Merged configuration dictionary
+        """
+        import yaml
+        
         with open(config_file) as f:
-            self.config = yaml.safe_load(f)
+            data = yaml.safe_load(f) or {}
+        
+        parent = data.pop("_extends", None)
+        if parent:
+            return _deep_merge(self._load_file(config_file.parent / parent), data)
+        return data
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value."""
         return self.config.get(key, default)
 
-# Global config instance
-config = ConfigManager(env=os.getenv("ENV", "dev"))
+@functools.lru_cache(maxsize=None)
+def get_config() -> ConfigManager:
+    """Get the global config instance, loading the YAML files on first use.
+    
+    Returns:
+        ConfigManager for the ``ENV`` environment
+    """
+    return ConfigManager(env=os.getenv("ENV", "dev"))
+
+def __getattr__(name: str) -> Any:
+    # ``config`` is created lazily so importing this module doesn't parse YAML
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 settings = Settings() 
\ No newline at end of file
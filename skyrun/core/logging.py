@@ -1,68 +1,233 @@
 """
 Logging configuration for SkyRun.
+
+Records are put on a bounded queue by the thread that logs them and written
+by a background listener, so logging never blocks on I/O. When the queue is
+full, records are dropped and counted rather than waited for.
 """
+import atexit
+import contextvars
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+import re
 import sys
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Union
 
 from .config import settings
 
+# Request ID of the request being handled, attached to every record logged for it
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+_SIZE_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+
+def parse_size(size: Union[int, str]) -> int:
+    """Parse a size such as ``100MB`` into bytes.
+
+    Args:
+        size: Number of bytes, or a number with a B/KB/MB/GB suffix
+
+    Returns:
+        Size in bytes
+    """
+    if isinstance(size, int):
+        return size
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*", str(size).upper())
+    if not match:
+        raise ValueError(f"Invalid size: {size}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+class RequestIdFilter(logging.Filter):
+    """Sets ``record.request_id`` from the current request's context."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None)
+        }
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full.
+
+    The number of dropped records is kept in ``dropped`` and reported by a
+    warning record once the queue has room again.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._reported = 0
+        self._lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        with self._lock:
+            try:
+                if self.dropped > self._reported:
+                    self.queue.put_nowait(self._drop_report(self.dropped - self._reported))
+                    self._reported = self.dropped
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the arguments into the message, leaving the rest of the formatting to the listener.
+
+        The queue never leaves the process, so the exception is kept for the
+        listener's formatter instead of being formatted into the message on
+        the thread that logged it.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    @staticmethod
+    def _drop_report(count: int) -> logging.LogRecord:
+        """A record counting the drops since the last report."""
+        record = logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0,
+            f"Dropped {count} log records while the logging queue was full", None, None
+        )
+        record.request_id = None
+        return record
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+
 def setup_logging(
     level: int = logging.INFO,
     log_file: Optional[Path] = None,
-    format_string: Optional[str] = None
+    format_string: Optional[str] = None,
+    rotate: bool = True,
+    max_bytes: int = 100 * 1024 ** 2,
+    backup_count: int = 5,
+    json_format: bool = False,
+    queue_size: int = 10000
 ) -> None:
     """Setup logging configuration.
-    
+
+    Replaces the handlers of an earlier call, so it can be called again to
+    reconfigure logging.
+
     Args:
         level: Logging level
         log_file: Path to log file
         format_string: Custom format string for logs
+        rotate: Whether the log file is rotated once it reaches ``max_bytes``
+        max_bytes: Size at which the log file is rotated
+        backup_count: Number of rotated files kept
+        json_format: Whether records are written as JSON lines
+        queue_size: Records waiting to be written before new ones are dropped
     """
+    global _listener, _queue_handler
+
     if format_string is None:
         format_string = (
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
             if not settings.DEBUG
             else "%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s"
         )
-    
+
     # Create formatter
-    formatter = logging.Formatter(format_string)
-    
-    # Setup root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(level)
-    
+    formatter = JsonFormatter() if json_format else logging.Formatter(format_string)
+
     # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
-    
+    handlers = [logging.StreamHandler(sys.stdout)]
+
     # File handler (if log_file is provided)
     if log_file:
         log_file.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(str(log_file))
-        file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
-    
+        if rotate:
+            handlers.append(logging.handlers.RotatingFileHandler(
+                str(log_file), maxBytes=max_bytes, backupCount=backup_count
+            ))
+        else:
+            handlers.append(logging.FileHandler(str(log_file)))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # Setup root logger; callers only enqueue, the listener thread does the writing
+    stop_logging()
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=max(1, queue_size)))
+    _queue_handler.addFilter(RequestIdFilter())
+    root_logger.addHandler(_queue_handler)
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
     # Disable propagation for third-party loggers
     for logger_name in ["urllib3", "requests"]:
         logging.getLogger(logger_name).propagate = False
 
+def stop_logging() -> None:
+    """Write the queued records and stop the background listener."""
+    global _listener, _queue_handler
+
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(stop_logging)
+
+def dropped_records() -> int:
+    """Number of records dropped because the logging queue was full."""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance.
-    
+
     Args:
         name: Logger name
-    
+
     Returns:
         Logger instance
     """
     return logging.getLogger(name)
 
-# Setup default logging
-setup_logging(
-    level=logging.DEBUG if settings.DEBUG else logging.INFO,
-    log_file=settings.PROJECT_ROOT / "logs" / "skyrun.log"
-) 
\ No newline at end of file
+def setup_default_logging() -> None:
+    """Setup logging from the ``logging`` section of the configuration.
+
+    Called by the entry points rather than on import, so that importing a
+    SkyRun module never touches the root logger or the file system.
+    """
+    from .config import get_config
+
+    logging_config = get_config().get("logging", {})
+    level = logging_config.get("level", "DEBUG" if settings.DEBUG else "INFO")
+    log_file = Path(logging_config.get("file", "logs/skyrun.log"))
+    if not log_file.is_absolute():
+        log_file = settings.PROJECT_ROOT / log_file
+
+    setup_logging(
+        level=logging.getLevelName(str(level).upper()),
+        log_file=log_file,
+        format_string=logging_config.get("format"),
+        rotate=logging_config.get("rotate", True),
+        max_bytes=parse_size(logging_config.get("max_size", "100MB")),
+        backup_count=logging_config.get("backup_count", 5),
+        json_format=logging_config.get("json", False),
+        queue_size=logging_config.get("queue_size", 10000)
+    )
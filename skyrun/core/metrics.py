@@ -0,0 +1,172 @@
+"""
+Prometheus metrics for the generate/review/register pipeline.
+
+``prometheus_client`` is optional: without it every metric is a no-op.
+Labelled children are created once and reused, so recording a sample on the
+hot path is a dictionary lookup and an ``observe`` or ``inc`` call. Queue
+depths are read from their owners when Prometheus scrapes, at no cost to
+the code that fills the queues.
+"""
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+import time
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover - depends on the environment
+    prometheus_client = None
+
+# Latency buckets from 1 ms to 2 minutes, covering tokenization through to waiting for a block
+_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+class _NoOp:
+    """Stands in for a metric and its children without prometheus_client."""
+
+    def labels(self, *args: Any, **kwargs: Any) -> "_NoOp":
+        return self
+
+    def observe(self, value: float) -> None:
+        pass
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        pass
+
+def _metric(kind: str, name: str, documentation: str, labelnames: Tuple[str, ...], **kwargs: Any) -> Any:
+    """Create a metric, or a no-op without prometheus_client."""
+    if prometheus_client is None:
+        return _NoOp()
+    return getattr(prometheus_client, kind)(name, documentation, labelnames, **kwargs)
+
+STAGE_SECONDS = _metric(
+    "Histogram", "skyrun_stage_seconds",
+    "Duration of a pipeline stage", ("component", "stage"), buckets=_BUCKETS
+)
+STAGE_ERRORS = _metric(
+    "Counter", "skyrun_stage_errors_total",
+    "Pipeline stages that raised", ("component", "stage")
+)
+RPC_SECONDS = _metric(
+    "Histogram", "skyrun_rpc_seconds",
+    "Duration of JSON-RPC calls to the node", ("method",), buckets=_BUCKETS
+)
+RPC_ERRORS = _metric(
+    "Counter", "skyrun_rpc_errors_total",
+    "JSON-RPC calls that failed or timed out", ("method",)
+)
+TOKENS = _metric(
+    "Counter", "skyrun_generated_tokens_total",
+    "Tokens generated", ("agent",)
+)
+TOKENS_PER_SECOND = _metric(
+    "Gauge", "skyrun_tokens_per_second",
+    "Generation throughput of the latest generate call", ("agent",)
+)
+BATCH_SIZE = _metric(
+    "Gauge", "skyrun_batch_size",
+    "Size of the latest batch run by a batcher", ("batcher",)
+)
+QUEUE_DEPTH = _metric(
+    "Gauge", "skyrun_queue_depth",
+    "Items waiting or in flight in a queue", ("queue",)
+)
+
+_stages: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+_rpc_methods: Dict[str, Tuple[Any, Any]] = {}
+_server_port: Optional[int] = None
+
+def _stage(component: str, stage: str) -> Tuple[Any, Any]:
+    """The latency histogram and error counter children of a stage."""
+    children = _stages.get((component, stage))
+    if children is None:
+        children = (STAGE_SECONDS.labels(component, stage), STAGE_ERRORS.labels(component, stage))
+        _stages[(component, stage)] = children
+    return children
+
+@contextmanager
+def timed(component: str, stage: str) -> Iterator[None]:
+    """Record the duration of a block, and count it as an error if it raises.
+
+    Args:
+        component: Component running the stage, e.g. ``creative``
+        stage: Stage name, e.g. ``generate``
+    """
+    seconds, errors = _stage(component, stage)
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        errors.inc()
+        raise
+    finally:
+        seconds.observe(time.perf_counter() - start)
+
+def observe(component: str, stage: str, duration: float) -> None:
+    """Record the duration of a stage timed by the caller.
+
+    Args:
+        component: Component running the stage
+        stage: Stage name
+        duration: Duration in seconds
+    """
+    _stage(component, stage)[0].observe(duration)
+
+def observe_rpc(method: str, duration: float, failed: bool = False) -> None:
+    """Record a JSON-RPC call.
+
+    Args:
+        method: JSON-RPC method, or ``batch`` for a batch request
+        duration: Duration in seconds
+        failed: Whether the call failed or timed out
+    """
+    children = _rpc_methods.get(method)
+    if children is None:
+        children = (RPC_SECONDS.labels(method), RPC_ERRORS.labels(method))
+        _rpc_methods[method] = children
+    children[0].observe(duration)
+    if failed:
+        children[1].inc()
+
+def track_queue(name: str, depth: Callable[[], float]) -> None:
+    """Report a queue's depth, read from ``depth`` whenever metrics are scraped.
+
+    Registering a name again replaces its callback.
+
+    Args:
+        name: Queue name
+        depth: Callable returning the current depth
+    """
+    QUEUE_DEPTH.labels(name).set_function(depth)
+
+def start_metrics_server(port: int) -> bool:
+    """Export the metrics over HTTP on a background thread, once per process.
+
+    Args:
+        port: Port to listen on
+
+    Returns:
+        Whether the metrics are being exported
+    """
+    global _server_port
+
+    if prometheus_client is None:
+        logger.warning("prometheus_client is not installed; metrics are not exported")
+        return False
+    if _server_port is None:
+        try:
+            prometheus_client.start_http_server(port)
+        except OSError as e:
+            logger.warning(f"Metrics not exported on port {port}: {str(e)}")
+            return False
+        _server_port = port
+        logger.info(f"Exporting metrics on port {port}")
+    return True
@@ -0,0 +1,47 @@
+# pragma version ^0.4.0
+# Minimal content registry used by the blockchain tests.
+# Rebuild the artifact with:
+#   vyper -f abi,bytecode --evm-version cancun ContentRegistry.vy
+# and store both outputs in ContentRegistry.json.
+
+event ContentRegistered:
+    owner: indexed(address)
+    contentHash: String[64]
+    metadata: String[1024]
+
+event OwnershipTransferred:
+    previousOwner: indexed(address)
+    newOwner: indexed(address)
+    contentHash: String[64]
+
+owners: HashMap[String[64], address]
+metadata: HashMap[String[64], String[1024]]
+
+@external
+def registerContent(contentHash: String[64], owner: address, metadata: String[1024]):
+    assert self.owners[contentHash] == empty(address), "already registered"
+    self.owners[contentHash] = owner
+    self.metadata[contentHash] = metadata
+    log ContentRegistered(owner=owner, contentHash=contentHash, metadata=metadata)
+
+@external
+def transferOwnership(contentHash: String[64], newOwner: address):
+    previous: address = self.owners[contentHash]
+    assert previous == msg.sender, "not the owner"
+    self.owners[contentHash] = newOwner
+    log OwnershipTransferred(previousOwner=previous, newOwner=newOwner, contentHash=contentHash)
+
+@view
+@external
+def getContentOwner(contentHash: String[64]) -> address:
+    return self.owners[contentHash]
+
+@view
+@external
+def getContentMetadata(contentHash: String[64]) -> String[1024]:
+    return self.metadata[contentHash]
+
+@view
+@external
+def verifyOwnership(contentHash: String[64], owner: address) -> bool:
+    return self.owners[contentHash] == owner
@@ -0,0 +1,37 @@
+# pragma version ^0.4.0
+# Subset of Multicall3 (aggregate3 and getEthBalance) with the same ABI,
+# used by the blockchain tests. Rebuild the artifact with:
+#   vyper -f abi,bytecode --evm-version cancun Multicall3.vy
+# and store both outputs in Multicall3.json.
+
+struct Call3:
+    target: address
+    allowFailure: bool
+    callData: Bytes[512]
+
+struct Result:
+    success: bool
+    returnData: Bytes[1280]
+
+@view
+@external
+def aggregate3(calls: DynArray[Call3, 128]) -> DynArray[Result, 128]:
+    results: DynArray[Result, 128] = []
+    for call: Call3 in calls:
+        success: bool = False
+        data: Bytes[1280] = b""
+        success, data = raw_call(
+            call.target,
+            call.callData,
+            max_outsize=1280,
+            revert_on_failure=False,
+            is_static_call=True
+        )
+        assert success or call.allowFailure, "Multicall3: call failed"
+        results.append(Result(success=success, returnData=data))
+    return results
+
+@view
+@external
+def getEthBalance(addr: address) -> uint256:
+    return addr.balance
@@ -2,11 +2,15 @@
 Tests for the agents module.
 """
 
+import asyncio
+import threading
 import pytest
 import torch
 from unittest.mock import Mock, patch
+from transformers import BatchEncoding
 
-from skyrun.agents import CreativeAgent, ReviewerAgent, CoordinatorAgent
+from skyrun.agents import AgentRegistry, CreativeAgent, ReviewerAgent, CoordinatorAgent
+from skyrun.agents.executor import InferenceExecutor, InferenceQueueFullError
 
 @pytest.fixture
 def mock_model():
@@ -20,6 +24,10 @@ def mock_tokenizer():
     """Create a mock tokenizer for testing."""
     tokenizer = Mock()
     tokenizer.eos_token_id = 50256
+    tokenizer.return_value = BatchEncoding({
+        "input_ids": torch.tensor([[1, 2]]),
+        "attention_mask": torch.tensor([[1, 1]])
+    })
     return tokenizer
 
 @pytest.mark.asyncio
@@ -108,4 +116,368 @@ async def test_coordinator_agent_process():
     })
     
     assert "best_result" in result
-    assert "workflow_summary" in result 
\ No newline at end of file
+    assert "workflow_summary" in result
+
+
+@pytest.mark.asyncio
+async def test_agent_registry_loads_models_once(mock_model, mock_tokenizer):
+    """Test the agent registry shares one set of models across callers."""
+    with patch("skyrun.agents.creative.AutoModelForCausalLM.from_pretrained", return_value=mock_model) as creative_load, \
+         patch("skyrun.agents.reviewer.AutoModelForSequenceClassification.from_pretrained", return_value=mock_model) as reviewer_load, \
+         patch("skyrun.agents.creative.AutoTokenizer.from_pretrained", return_value=mock_tokenizer), \
+         patch("skyrun.agents.reviewer.AutoTokenizer.from_pretrained", return_value=mock_tokenizer):
+        
+        registry = AgentRegistry({"creative_model": "test_model", "reviewer_model": "test_model"})
+        first, second = await asyncio.gather(
+            registry.get_coordinator(),
+            registry.get_coordinator()
+        )
+        
+        assert first is second
+        assert first.creative_agent is registry.creative_agent
+        assert first.reviewer_agent is registry.reviewer_agent
+        assert creative_load.call_count == 1
+        assert reviewer_load.call_count == 1
+        
+        await registry.cleanup()
+        assert not registry.is_initialized
+        assert first.creative_agent.model is None
+
+@pytest.mark.asyncio
+async def test_creative_agent_batches_concurrent_requests(mock_model, mock_tokenizer):
+    """Test concurrent requests with equal parameters share one generate call."""
+    def tokenize(prompts, **kwargs):
+        return BatchEncoding({
+            "input_ids": torch.ones((len(prompts), 2), dtype=torch.long),
+            "attention_mask": torch.ones((len(prompts), 2), dtype=torch.long)
+        })
+    
+    mock_tokenizer.side_effect = tokenize
+    mock_tokenizer.decode.return_value = "Generated content"
+    mock_model.generate.side_effect = lambda input_ids, **kwargs: torch.ones((input_ids.shape[0], 4), dtype=torch.long)
+    
+    with patch("skyrun.agents.creative.AutoModelForCausalLM.from_pretrained", return_value=mock_model), \
+         patch("skyrun.agents.creative.AutoTokenizer.from_pretrained", return_value=mock_tokenizer):
+        
+        agent = CreativeAgent("test_creative", "test_model", {"batch_size": 4, "batch_timeout_ms": 5})
+        await agent.initialize()
+        
+        results = await asyncio.gather(
+            agent.process({"prompt": "a", "temperature": 0.7}),
+            agent.process({"prompt": "b", "temperature": 0.7}),
+            agent.process({"prompt": "c", "temperature": 0.7}),
+            agent.process({"prompt": "d", "temperature": 1.0})
+        )
+        
+        assert mock_model.generate.call_count == 2
+        assert [r["metadata"]["batch_size"] for r in results] == [3, 3, 3, 1]
+        assert results[3]["metadata"]["temperature"] == 1.0
+        await agent.cleanup()
+
+@pytest.mark.asyncio
+async def test_inference_executor_runs_off_loop_and_bounds_queue():
+    """Test the inference executor uses worker threads and rejects overflow."""
+    executor = InferenceExecutor("test", workers=1, max_queue_size=1)
+    release = threading.Event()
+    
+    first = asyncio.ensure_future(executor.run(lambda: (release.wait(5), threading.get_ident())[1]))
+    await asyncio.sleep(0.01)
+    
+    assert executor.queue_depth == 1
+    with pytest.raises(InferenceQueueFullError):
+        await executor.run(lambda: None)
+    
+    release.set()
+    assert await first != threading.get_ident()
+    assert executor.queue_depth == 0
+    
+    # A job keeps its slot after its caller is cancelled, until it finishes
+    release.clear()
+    started = threading.Event()
+    running = asyncio.ensure_future(executor.run(lambda: (started.set(), release.wait(5))))
+    await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+    running.cancel()
+    await asyncio.gather(running, return_exceptions=True)
+    assert executor.queue_depth == 1
+    with pytest.raises(InferenceQueueFullError):
+        await executor.run(lambda: None)
+    
+    release.set()
+    for _ in range(100):
+        if executor.queue_depth == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert executor.queue_depth == 0
+    await executor.run(lambda: None)
+    await executor.close()
+
+@pytest.mark.asyncio
+async def test_reviewer_agent_process_batch(mock_model, mock_tokenizer):
+    """Test reviewer agent scores many contents and aspects in one pass."""
+    mock_tokenizer.return_value = BatchEncoding({
+        "input_ids": torch.ones((2, 3), dtype=torch.long),
+        "attention_mask": torch.ones((2, 3), dtype=torch.long)
+    })
+    mock_model.return_value.logits = torch.tensor([[2.0, 0.0, -2.0], [-2.0, 0.0, 2.0]])
+    
+    with patch("skyrun.agents.reviewer.AutoModelForSequenceClassification.from_pretrained", return_value=mock_model), \
+         patch("skyrun.agents.reviewer.AutoTokenizer.from_pretrained", return_value=mock_tokenizer):
+        
+        agent = ReviewerAgent("test_reviewer", "test_model")
+        await agent.initialize()
+        
+        results = await agent.process_batch(["first", "second"], ["quality", "creativity"])
+        
+        assert mock_model.call_count == 1
+        assert results[0]["feedback"]["quality"]["score"] > results[0]["feedback"]["creativity"]["score"]
+        assert results[1]["feedback"]["quality"]["score"] < results[1]["feedback"]["creativity"]["score"]
+        assert "relevance" not in results[0]["feedback"]
+        
+        with pytest.raises(ValueError):
+            await agent.process_batch(["first"], ["originality"])
+        await agent.cleanup()
+
+@pytest.mark.asyncio
+async def test_reviewer_agent_cache(mock_model, mock_tokenizer, tmp_path):
+    """Test repeated reviews are served from the cache, including from disk."""
+    mock_model.return_value.logits = torch.tensor([[2.0, 0.0, -2.0]])
+    cache_config = {"cache": {"ttl": 60, "max_entries": 10, "disk_path": tmp_path / "reviews.db"}}
+    
+    with patch("skyrun.agents.reviewer.AutoModelForSequenceClassification.from_pretrained", return_value=mock_model), \
+         patch("skyrun.agents.reviewer.AutoTokenizer.from_pretrained", return_value=mock_tokenizer):
+        
+        agent = ReviewerAgent("test_reviewer", "test_model", cache_config)
+        await agent.initialize()
+        first = await agent.process({"content": "Test content", "review_aspects": ["quality"]})
+        second = await agent.process({"content": "Test content", "review_aspects": ["creativity"]})
+        await agent.cleanup()
+        
+        assert mock_model.call_count == 1
+        assert second["feedback"]["creativity"]["score"] < first["feedback"]["quality"]["score"]
+        
+        restarted = ReviewerAgent("test_reviewer", "test_model", cache_config)
+        await restarted.initialize()
+        await restarted.process({"content": "Test content"})
+        
+        assert mock_model.call_count == 1
+        assert restarted.cache.stats()["disk_hits"] == 1
+        await restarted.cleanup()
+
+@pytest.mark.asyncio
+async def test_creative_agent_stream(mock_model, mock_tokenizer):
+    """Test creative agent yields decoded text before the final result."""
+    def generate(**kwargs):
+        streamer = kwargs["streamer"]
+        streamer.put(torch.tensor([[1, 2]]))  # prompt, skipped
+        streamer.put(torch.tensor([3]))
+        streamer.end()
+    
+    mock_model.generate.side_effect = generate
+    mock_tokenizer.decode.return_value = "Generated content"
+    
+    with patch("skyrun.agents.creative.AutoModelForCausalLM.from_pretrained", return_value=mock_model), \
+         patch("skyrun.agents.creative.AutoTokenizer.from_pretrained", return_value=mock_tokenizer):
+        
+        agent = CreativeAgent("test_creative", "test_model")
+        await agent.initialize()
+        
+        events = [event async for event in agent.stream({"prompt": "Test prompt "})]
+        
+        assert [e["text"] for e in events if e["type"] == "token"] == ["Generated ", "content"]
+        assert events[-1]["type"] == "done"
+        assert events[-1]["generated_content"] == "Test prompt Generated content"
+        assert events[-1]["metadata"]["time_to_first_token_ms"] <= events[-1]["metadata"]["total_time_ms"]
+        await agent.cleanup()
+
+@pytest.mark.asyncio
+async def test_creative_agent_stream_fails_when_executor_is_full(mock_model, mock_tokenizer):
+    """Test a stream rejected by a full executor raises instead of hanging."""
+    with patch("skyrun.agents.creative.AutoModelForCausalLM.from_pretrained", return_value=mock_model), \
+         patch("skyrun.agents.creative.AutoTokenizer.from_pretrained", return_value=mock_tokenizer):
+        
+        agent = CreativeAgent("test_creative", "test_model", {"executor": {"max_queue_size": 1}})
+        await agent.initialize()
+        release = threading.Event()
+        busy = asyncio.ensure_future(agent.run_in_executor(release.wait, 5))
+        await asyncio.sleep(0.01)
+        
+        async def consume():
+            return [event async for event in agent.stream({"prompt": "Test prompt "})]
+        
+        with pytest.raises(InferenceQueueFullError):
+            await asyncio.wait_for(consume(), timeout=3)
+        
+        release.set()
+        await busy
+        await agent.cleanup()
+
+@pytest.mark.asyncio
+async def test_coordinator_parallel_candidates_early_exit():
+    """Test the coordinator stops at the first candidate clearing the threshold."""
+    delays = iter([0.01, 0.02, 5.0])
+    cancelled = []
+    
+    async def generate(params):
+        delay = next(delays)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return {"generated_content": f"candidate {delay}"}
+    
+    async def review(contents, aspects):
+        return [
+            {"feedback": {aspect: {"score": 0.9 if "0.02" in content else 0.3} for aspect in aspects}}
+            for content in contents
+        ]
+    
+    creative, reviewer = Mock(), Mock()
+    creative.process.side_effect = generate
+    reviewer.process_batch.side_effect = review
+    coordinator = CoordinatorAgent("test_coordinator", creative_agent=creative, reviewer_agent=reviewer)
+    
+    result = await coordinator.process({
+        "prompt": "Test prompt",
+        "num_candidates": 3,
+        "min_quality_score": 0.7
+    })
+    
+    assert result["best_result"]["content"] == "candidate 0.02"
+    assert result["workflow_summary"]["candidates_generated"] == 2
+    assert result["workflow_summary"]["total_iterations"] == 0
+    assert cancelled == [5.0]
+
+def test_prefix_cache_reuses_longest_prefix():
+    """Test prompt-prefix caches are reused, copied and evicted by size."""
+    from transformers import GPT2Config, GPT2LMHeadModel
+    from skyrun.agents.prefix_cache import PrefixCache
+
+    torch.manual_seed(0)
+    model = GPT2LMHeadModel(GPT2Config(n_layer=1, n_head=2, n_embd=16, vocab_size=50)).eval()
+
+    def prompt_cache(token_ids):
+        with torch.no_grad():
+            return model(torch.tensor([token_ids]), use_cache=True).past_key_values
+
+    cache = PrefixCache(max_bytes=1024 * 1024)
+    assert cache.lookup([1, 2, 3]) == (0, None)
+
+    cache.put([1, 2, 3, 4], prompt_cache([1, 2, 3, 4]))
+    length, past_key_values = cache.lookup([1, 2, 3, 9, 9])
+    assert length == 3
+    assert past_key_values.get_seq_length() == 3
+
+    # The returned copy can be extended without touching the stored entry
+    with torch.no_grad():
+        model(torch.tensor([[9]]), past_key_values=past_key_values, use_cache=True)
+    length, past_key_values = cache.lookup([1, 2, 3, 4, 5])
+    assert length == 4
+    assert past_key_values.get_seq_length() == 4
+
+    # An identical prompt keeps its last token to generate from
+    length, _ = cache.lookup([1, 2, 3, 4])
+    assert length == 3
+    assert cache.stats()["hits"] == 3
+
+    # Entries beyond the budget evict the least recently used ones
+    cache = PrefixCache(max_bytes=cache.size_bytes)
+    cache.put([1, 2, 3, 4], prompt_cache([1, 2, 3, 4]))
+    cache.put([5, 6, 7, 8], prompt_cache([5, 6, 7, 8]))
+    assert cache.stats()["entries"] == 1
+    assert cache.lookup([1, 2, 3, 4, 5]) == (0, None)
+
+@pytest.mark.parametrize("backend, tolerance", [("fp32", 0.0), ("bf16", 0.05), ("int8", 0.05)])
+def test_backend_parity_with_fp32(tmp_path, backend, tolerance):
+    """Test each cpu backend's logits stay close to the fp32 reference."""
+    from transformers import AutoModelForCausalLM, GPT2Config, GPT2LMHeadModel
+    from skyrun.agents.backends import load_model, resolve_backend
+
+    torch.manual_seed(0)
+    GPT2LMHeadModel(GPT2Config(n_layer=2, n_head=2, n_embd=32, vocab_size=100)).save_pretrained(tmp_path)
+    input_ids = torch.randint(0, 100, (2, 8))
+
+    reference = load_model(AutoModelForCausalLM, str(tmp_path), "fp32", "cpu")
+    assert resolve_backend({"device": "cpu", "backend": backend}) == (backend, "cpu")
+    model = load_model(AutoModelForCausalLM, str(tmp_path), backend, "cpu")
+
+    with torch.no_grad():
+        expected = torch.softmax(reference(input_ids).logits, dim=-1)
+        actual = torch.softmax(model(input_ids).logits.float(), dim=-1)
+    assert (actual - expected).abs().max() <= tolerance
+    assert model.generate(input_ids[:1], max_length=12, do_sample=False, pad_token_id=0).shape == (1, 12)
+
+def test_torchscript_classifier_parity():
+    """Test a traced classifier matches the eager model on other batch shapes."""
+    from transformers import BertConfig, BertForSequenceClassification
+    from skyrun.agents.backends import trace_classifier
+
+    torch.manual_seed(0)
+    model = BertForSequenceClassification(BertConfig(
+        num_hidden_layers=1, hidden_size=32, num_attention_heads=2,
+        intermediate_size=64, vocab_size=100, num_labels=3
+    )).eval()
+
+    def batch(lengths):
+        width = max(lengths)
+        return {
+            "input_ids": torch.randint(1, 100, (len(lengths), width)),
+            "token_type_ids": torch.zeros(len(lengths), width, dtype=torch.long),
+            "attention_mask": torch.tensor([[1] * n + [0] * (width - n) for n in lengths])
+        }
+
+    traced = trace_classifier(model, batch([4, 6]))
+    inputs = batch([9, 3, 7])
+    with torch.no_grad():
+        assert torch.allclose(traced(**inputs).logits, model(**inputs).logits, atol=1e-5)
+
+def test_resolve_backend_rejects_unsupported():
+    """Test backends are validated against the agent and device."""
+    from skyrun.agents.backends import resolve_backend
+
+    assert resolve_backend({"device": "cpu"}) == ("fp32", "cpu")
+    assert resolve_backend({"device": "cuda"}) == ("fp16", "cuda")
+    with pytest.raises(ValueError):
+        resolve_backend({"device": "cuda", "backend": "int8"})
+    with pytest.raises(ValueError):
+        resolve_backend({"device": "cpu", "backend": "torchscript"}, CreativeAgent.BACKENDS)
+    with pytest.raises(ValueError):
+        resolve_backend({"backend": "fp8"})
+
+@pytest.mark.asyncio
+async def test_agent_registry_loads_concurrently_and_warms_up(mock_model, mock_tokenizer):
+    """Test both models load at the same time and warmup marks the registry ready."""
+    both_loading = threading.Barrier(2, timeout=5)
+
+    def load(*args, **kwargs):
+        # Only returns once the other model has started loading as well
+        both_loading.wait()
+        return mock_model
+
+    mock_model.generate.return_value = torch.tensor([[1, 2, 3]])
+    mock_model.return_value = Mock(logits=torch.tensor([[0.5, 0.5, 0.5]]))
+    mock_tokenizer.decode.return_value = "Warm content"
+
+    with patch("skyrun.agents.creative.AutoModelForCausalLM.from_pretrained", side_effect=load), \
+         patch("skyrun.agents.reviewer.AutoModelForSequenceClassification.from_pretrained", side_effect=load), \
+         patch("skyrun.agents.creative.AutoTokenizer.from_pretrained", return_value=mock_tokenizer), \
+         patch("skyrun.agents.reviewer.AutoTokenizer.from_pretrained", return_value=mock_tokenizer):
+
+        registry = AgentRegistry({
+            "creative_model": "test_model",
+            "reviewer_model": "test_model",
+            "warmup": {"prompts": ["Warm", "Up"], "max_length": 8}
+        })
+        assert registry.readiness()["status"] == "loading"
+
+        await registry.initialize()
+        assert registry.readiness()["status"] == "warming_up"
+
+        await registry.warmup()
+        state = registry.readiness()
+        assert state["status"] == "ready"
+        assert state["load_time"] is not None and state["warmup_time"] is not None
+        assert mock_model.generate.call_count == 2
+
+        await registry.cleanup()
+        assert not registry.is_ready
@@ -0,0 +1,217 @@
+"""
+Tests for the API module.
+"""
+
+import asyncio
+import subprocess
+import sys
+import pytest
+
+from skyrun.api.jobs import JobManager, JobStore
+
+async def wait_for_status(manager, job_id, status):
+    """Poll a job until it reaches the given status."""
+    for _ in range(200):
+        job = await manager.get(job_id)
+        if job["status"] == status:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job stayed {job['status']}")
+
+@pytest.mark.asyncio
+async def test_job_manager_runs_jobs(tmp_path):
+    """Test submitted jobs run in the background and record timings."""
+    async def run_job(request):
+        return {
+            "best_result": {"content": request["prompt"], "metadata": {}},
+            "workflow_summary": {"total_iterations": 2}
+        }
+
+    manager = JobManager(JobStore(tmp_path / "jobs.db"), run_job, workers=2)
+    await manager.start()
+
+    job = await manager.submit({"prompt": "Test prompt"})
+    assert job["status"] == "queued"
+
+    job = await wait_for_status(manager, job["id"], "succeeded")
+    assert job["result"]["best_result"]["content"] == "Test prompt"
+    assert job["iterations"] == 2
+    assert job["queue_time"] >= 0 and job["run_time"] >= 0
+
+    await manager.stop()
+
+@pytest.mark.asyncio
+async def test_job_manager_cancel_and_recover(tmp_path):
+    """Test running jobs can be cancelled and queued jobs survive a restart."""
+    started = asyncio.Event()
+
+    async def run_job(request):
+        started.set()
+        await asyncio.sleep(60)
+
+    store = JobStore(tmp_path / "jobs.db")
+    manager = JobManager(store, run_job, workers=1)
+    await manager.start()
+
+    running = await manager.submit({"prompt": "first"})
+    waiting = await manager.submit({"prompt": "second"})
+    await started.wait()
+
+    job = await manager.cancel(running["id"])
+    assert job["status"] == "cancelled"
+
+    await wait_for_status(manager, waiting["id"], "running")
+    await manager.stop()
+    store.close()
+
+    # A new process picks up the job interrupted by the shutdown
+    async def finish_job(request):
+        return {"workflow_summary": {"total_iterations": 1}}
+
+    manager = JobManager(JobStore(tmp_path / "jobs.db"), finish_job)
+    await manager.start()
+    job = await wait_for_status(manager, waiting["id"], "succeeded")
+    assert job["request"]["prompt"] == "second"
+    await manager.stop()
+
+@pytest.mark.asyncio
+async def test_job_manager_cancel_races_worker_pickup(tmp_path):
+    """Test a job cancelled while a worker picks it up never runs, and finished jobs stay finished."""
+    import threading
+
+    class PausingStore(JobStore):
+        """Pauses the worker between reading a queued job and starting it."""
+
+        armed = False
+        picked = threading.Event()
+        release = threading.Event()
+
+        def get(self, job_id):
+            job = super().get(job_id)
+            if self.armed and job["status"] == "queued":
+                self.armed = False
+                self.picked.set()
+                self.release.wait(5)
+            return job
+
+    ran = []
+
+    async def run_job(request):
+        ran.append(request["prompt"])
+        return {"workflow_summary": {"total_iterations": 1}}
+
+    store = PausingStore(tmp_path / "jobs.db")
+    manager = JobManager(store, run_job, workers=1)
+    await manager.start()
+
+    job = await manager.submit({"prompt": "raced"})
+    store.armed = True
+    await asyncio.get_running_loop().run_in_executor(None, store.picked.wait, 5)
+    assert (await manager.cancel(job["id"]))["status"] == "cancelled"
+    store.release.set()
+
+    done = await manager.submit({"prompt": "next"})
+    await wait_for_status(manager, done["id"], "succeeded")
+    assert ran == ["next"]
+    assert (await manager.get(job["id"]))["status"] == "cancelled"
+
+    # Cancelling a finished job leaves its outcome alone
+    job = await manager.cancel(done["id"])
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"workflow_summary": {"total_iterations": 1}}
+    await manager.stop()
+    store.close()
+
+HEAVY_MODULES = {"torch", "transformers", "web3", "eth_account", "yaml"}
+
+@pytest.mark.parametrize("module", ["skyrun", "skyrun.api.server", "skyrun.blockchain", "skyrun.agents"])
+def test_import_does_not_load_heavy_dependencies(module):
+    """Test importing SkyRun modules leaves model and chain libraries unloaded."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    imported = {
+        line.rsplit("|", 1)[1].strip().split(".")[0]
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+    assert not imported & HEAVY_MODULES
+
+@pytest.mark.asyncio
+async def test_ready_endpoint_reports_startup_state():
+    """Test /ready answers 503 until the agents are warmed up."""
+    import httpx
+    from fastapi import FastAPI
+    from skyrun.agents.registry import AgentRegistry
+    from skyrun.api.routes import router
+
+    registry = AgentRegistry()
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    app.state.agent_registry = registry
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/v1/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "loading"
+
+        registry.coordinator = object()
+        registry.warmed_up = True
+        response = await client.get("/api/v1/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+        registry.startup_error = "out of memory"
+        response = await client.get("/api/v1/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "failed"
+
+@pytest.mark.asyncio
+async def test_request_profiler_writes_collapsed_stacks(tmp_path):
+    """Test requests with the profiling token are sampled into a .folded file."""
+    import time
+    import httpx
+    from fastapi import FastAPI
+    from skyrun.api.profiling import RequestProfiler
+
+    def busy():
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline:
+            pass
+
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        await asyncio.get_running_loop().run_in_executor(None, busy)
+        return {"ok": True}
+
+    profiler = RequestProfiler(str(tmp_path), token="secret", interval_ms=1)
+    app.middleware("http")(profiler.middleware)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/work")
+        assert "X-Profile" not in response.headers
+
+        response = await client.get("/work", headers={"X-Profile": "wrong"})
+        assert "X-Profile" not in response.headers
+
+        response = await client.get("/work", headers={"X-Profile": "café".encode("latin-1")})
+        assert response.status_code == 200
+        assert "X-Profile" not in response.headers
+
+        response = await client.get("/work", headers={"X-Profile": "secret"})
+        assert response.status_code == 200
+
+    profile = tmp_path / response.headers["X-Profile"]
+    lines = profile.read_text().splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+    assert any("test_api:test_request_profiler_writes_collapsed_stacks.<locals>.busy" in line for line in lines)
+    assert profiler.stats()["profiles"] == 1
@@ -0,0 +1,667 @@
+"""
+Tests for the blockchain module.
+"""
+
+import asyncio
+import json
+import os
+import pytest
+import pytest_asyncio
+
+pytest.importorskip("eth_tester")
+
+from web3 import AsyncWeb3
+from web3.providers.eth_tester import AsyncEthereumTesterProvider
+
+from skyrun.blockchain import (
+    AnchorStore,
+    BulkReader,
+    ContentAnchor,
+    ContentReadCache,
+    ContentRegistry,
+    EventIndexer,
+    EventStore,
+    FeeOracle,
+    NonceManager,
+    ReceiptTracker,
+    RPCError,
+    SignatureVerifier,
+    Signer,
+    Transaction,
+    TransactionSubmitter,
+    Wallet,
+    Web3Provider
+)
+
+from skyrun.blockchain.anchor import build_merkle_tree, verify_merkle_proof
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+@pytest_asyncio.fixture
+async def provider():
+    """Create a provider backed by an in-memory test chain."""
+    provider = Web3Provider(web3=AsyncWeb3(AsyncEthereumTesterProvider()), max_concurrency=2)
+    await provider.connect()
+    yield provider
+    await provider.close()
+
+async def funded_wallet(web3, amount=10 ** 18):
+    """Create a wallet and fund it from a node-managed test account."""
+    wallet = Wallet(web3)
+    accounts = await web3.eth.accounts
+    tx_hash = await web3.eth.send_transaction({
+        "from": accounts[0],
+        "to": wallet.account.address,
+        "value": amount
+    })
+    await web3.eth.wait_for_transaction_receipt(tx_hash)
+    return wallet
+
+async def deploy(web3, name):
+    """Deploy a test contract from tests/fixtures, returning its address and ABI."""
+    with open(os.path.join(FIXTURES, f"{name}.json")) as f:
+        artifact = json.load(f)
+    accounts = await web3.eth.accounts
+    factory = web3.eth.contract(abi=artifact["abi"], bytecode=artifact["bytecode"])
+    tx_hash = await factory.constructor().transact({"from": accounts[0]})
+    receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
+    return receipt["contractAddress"], artifact["abi"]
+
+async def deploy_registry(web3, submitter=None, reader=None):
+    """Deploy the test ContentRegistry contract from a node-managed account."""
+    address, abi = await deploy(web3, "ContentRegistry")
+    return ContentRegistry(web3, address, abi, submitter=submitter, reader=reader)
+
+@pytest.mark.asyncio
+async def test_wallet_and_transaction_async(provider):
+    """Test async wallet transfers and receipts over the shared provider."""
+    web3 = provider.web3
+    wallet = await funded_wallet(web3)
+    assert await wallet.get_balance_async() == 10 ** 18
+
+    accounts = await web3.eth.accounts
+    tx_hash = await wallet.send_transaction_async(accounts[1], 1000)
+
+    tx = Transaction(web3, tx_hash)
+    assert tx.get_status() == "pending"
+    receipt = await tx.wait_for_receipt_async(timeout=10, poll_interval=0.01)
+    assert receipt["status"] == 1
+    assert tx.get_status() == "success"
+    assert (await Transaction(web3, tx_hash).get_receipt_async())["blockNumber"] == tx.get_block_number()
+
+    # Without a tracker, web3's timeout is raised as asyncio's like the tracker's
+    with pytest.raises(asyncio.TimeoutError):
+        await Transaction(web3, "0x" + "ab" * 32).wait_for_receipt_async(timeout=0.05, poll_interval=0.01)
+
+@pytest.mark.asyncio
+async def test_provider_bounds_concurrency(provider):
+    """Test concurrent calls share the provider and respect its limit."""
+    peak = 0
+
+    async def slow_node(make_request, web3):
+        async def middleware(method, params):
+            nonlocal peak
+            peak = max(peak, provider.stats()["in_flight"])
+            await asyncio.sleep(0.01)
+            return await make_request(method, params)
+        return middleware
+
+    # Innermost, so it runs inside the provider's limits like a real transport
+    provider.web3.middleware_onion.inject(slow_node, layer=0)
+    requests_before = provider.stats()["requests"]
+    await asyncio.gather(*(provider.web3.eth.block_number for _ in range(10)))
+
+    stats = provider.stats()
+    assert stats["requests"] - requests_before == 10
+    assert peak == stats["max_concurrency"] == 2
+    assert stats["in_flight"] == 0
+
+@pytest.mark.asyncio
+async def test_submitter_pipelines_nonces(provider):
+    """Test concurrent sends from one account get consecutive local nonces."""
+    web3 = provider.web3
+    wallet = await funded_wallet(web3)
+    wallet.submitter = TransactionSubmitter(web3, max_concurrency=8)
+    accounts = await web3.eth.accounts
+
+    tx_hashes = await asyncio.gather(*(
+        wallet.send_transaction_async(accounts[1], value) for value in range(1, 21)
+    ))
+
+    nonces = sorted([(await web3.eth.get_transaction(tx_hash))["nonce"] for tx_hash in tx_hashes])
+    assert nonces == list(range(20))
+    stats = wallet.submitter.stats()
+    assert stats["submitted"] == 20
+    assert stats["nonce_syncs"] == 1
+    assert stats["in_flight"] == 0
+
+@pytest.mark.asyncio
+async def test_submitter_overlaps_sends_of_one_account(provider):
+    """Test sends from one account run concurrently and a failed send gives its nonce back."""
+    web3 = provider.web3
+    wallet = await funded_wallet(web3)
+    submitter = TransactionSubmitter(web3)
+    wallet.submitter = submitter
+    accounts = await web3.eth.accounts
+    active, peak = 0, 0
+    send = submitter._send_in_order
+
+    async def slow_send(tx, private_key):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        if tx["value"] == 0:
+            raise ValueError("rejected")
+        return await send(tx, private_key)
+
+    submitter._send_in_order = slow_send
+    tx_hashes = await asyncio.gather(*(
+        wallet.send_transaction_async(accounts[1], value) for value in range(1, 6)
+    ))
+    assert peak == 5
+
+    # The last nonce handed out is reused after its send fails
+    with pytest.raises(ValueError):
+        await wallet.send_transaction_async(accounts[1], 0)
+    tx_hashes.append(await wallet.send_transaction_async(accounts[1], 6))
+
+    nonces = sorted([(await web3.eth.get_transaction(tx_hash))["nonce"] for tx_hash in tx_hashes])
+    assert nonces == list(range(6))
+    assert submitter.stats()["nonce_syncs"] == 1
+
+@pytest.mark.asyncio
+async def test_nonce_manager_bounds_senders(provider):
+    """Test one-off senders don't grow the nonce manager without limit."""
+    web3 = provider.web3
+    nonces = NonceManager(web3, max_accounts=10)
+
+    for _ in range(50):
+        async with nonces.reserve(web3.eth.account.create().address) as nonce:
+            assert nonce == 0
+
+    assert nonces.accounts == 10
+    assert not nonces._locks and not nonces._waiters
+
+    # Concurrent reservations of one account get distinct nonces
+    address = web3.eth.account.create().address
+
+    async def reserve():
+        async with nonces.reserve(address) as nonce:
+            await asyncio.sleep(0.01)
+            return nonce
+
+    assert sorted(await asyncio.gather(*(reserve() for _ in range(5)))) == list(range(5))
+    assert not nonces._locks
+
+@pytest.mark.asyncio
+async def test_submitter_resyncs_after_external_send(provider):
+    """Test a nonce used outside the submitter is detected and skipped."""
+    web3 = provider.web3
+    wallet = await funded_wallet(web3)
+    wallet.submitter = TransactionSubmitter(web3)
+    accounts = await web3.eth.accounts
+
+    await wallet.send_transaction_async(accounts[1], 1)
+
+    # Another process sends from the same account
+    external = web3.eth.account.sign_transaction({
+        "to": accounts[1], "value": 1, "nonce": 1, "gas": 21000, "gasPrice": await web3.eth.gas_price
+    }, wallet.account.key)
+    await web3.eth.send_raw_transaction(external.rawTransaction)
+
+    tx_hash = await wallet.send_transaction_async(accounts[1], 1)
+    assert (await web3.eth.get_transaction(tx_hash))["nonce"] == 2
+    assert wallet.submitter.stats()["retries"] == 1
+
+@pytest.mark.asyncio
+async def test_fee_oracle_caches_fees_and_gas(provider):
+    """Test transactions share cached fees and a memoized gas estimate."""
+    web3 = provider.web3
+    wallet = await funded_wallet(web3)
+    oracle = FeeOracle(web3, ttl=60, gas_margin=1.2)
+    registry = await deploy_registry(web3, TransactionSubmitter(web3, fee_oracle=oracle))
+
+    tx_hashes = []
+    for i in range(3):
+        tx_hashes.append(await registry.register_content_async(
+            f"{i:064x}", wallet.account.address, '{"title": "x"}', private_key=wallet.account.key
+        ))
+    for tx_hash in tx_hashes:
+        receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
+        assert receipt["status"] == 1
+        assert receipt["type"] == 2
+        oracle.observe(receipt)
+
+    assert await registry.get_content_owner_async(f"{2:064x}") == wallet.account.address
+    stats = oracle.stats()
+    assert stats["fee_refreshes"] == 1
+    assert stats["fee_cache_hits"] == 2
+    assert stats["gas_estimates"] == 1
+    assert stats["gas_estimate_cache_hits"] == 2
+    assert stats["observed_receipts"] == 3
+    assert 0.7 < stats["gas_used_ratio"]["mean"] < 1.0
+    assert "maxFeePerGas" in stats["fees"]
+
+@pytest.mark.asyncio
+async def test_fee_oracle_drops_estimate_after_out_of_gas(provider):
+    """Test an out-of-gas receipt invalidates the memoized gas limit."""
+    web3 = provider.web3
+    accounts = await web3.eth.accounts
+    oracle = FeeOracle(web3, ttl=0)
+    tx = {"from": accounts[0], "to": accounts[1], "value": 1}
+
+    gas = await oracle.estimate_gas(tx)
+    assert gas == int(21000 * oracle.gas_margin)
+    oracle.track("0x01", dict(tx, gas=gas))
+    oracle.observe({"transactionHash": "0x01", "gasUsed": gas, "status": 0})
+
+    assert oracle.stats()["out_of_gas"] == 1
+    await oracle.estimate_gas(tx)
+    assert oracle.stats()["gas_estimates"] == 2
+
+    await oracle.fee_fields()
+    await oracle.fee_fields()
+    assert oracle.stats()["fee_refreshes"] == 2
+
+@pytest.mark.asyncio
+async def test_receipt_tracker_resolves_block_at_once(provider):
+    """Test one block scan resolves every waiter of the transactions it holds."""
+    web3 = provider.web3
+    chain = web3.provider.ethereum_tester
+    wallets = [await funded_wallet(web3) for _ in range(10)]
+    accounts = await web3.eth.accounts
+    observed = []
+    tracker = ReceiptTracker(web3, poll_interval=0.01, on_receipt=observed.append)
+    await tracker.start()
+
+    # The test chain only queues transactions with the next nonce, so each
+    # wallet sends one
+    chain.disable_auto_mine_transactions()
+    tx_hashes = [await wallet.send_transaction_async(accounts[1], 1) for wallet in wallets]
+    waiters = asyncio.gather(*(
+        Transaction(web3, tx_hash, tracker=tracker).wait_for_receipt_async(timeout=10)
+        for tx_hash in tx_hashes
+    ))
+    await asyncio.sleep(0.05)
+    assert tracker.stats()["pending"] == 10
+    chain.mine_blocks(1)
+
+    receipts = await waiters
+    await tracker.stop()
+    assert [r["status"] for r in receipts] == [1] * 10
+    assert len({r["blockNumber"] for r in receipts}) == 1
+    assert len(observed) == 10
+    stats = tracker.stats()
+    assert stats["blocks_scanned"] == 1
+    assert stats["pending"] == 0
+
+@pytest.mark.asyncio
+async def test_receipt_tracker_waits_for_confirmations(provider):
+    """Test a receipt is only handed out after the configured confirmations."""
+    web3 = provider.web3
+    chain = web3.provider.ethereum_tester
+    wallet = await funded_wallet(web3)
+    accounts = await web3.eth.accounts
+    tracker = ReceiptTracker(web3, confirmations=3, poll_interval=0.01)
+
+    tx_hash = await wallet.send_transaction_async(accounts[1], 1)
+    waiter = asyncio.ensure_future(tracker.wait(tx_hash, timeout=10))
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+    assert tracker.stats()["awaiting_confirmations"] == 1
+
+    chain.mine_blocks(2)
+    receipt = await waiter
+    assert receipt["blockNumber"] + 2 == await web3.eth.block_number
+    await tracker.stop()
+
+def test_transaction_receipt_is_lazy():
+    """Test a blocking Transaction only asks for its receipt when used."""
+    from web3 import Web3
+    from web3.providers.eth_tester import EthereumTesterProvider
+
+    web3 = Web3(EthereumTesterProvider())
+    tx = Transaction(web3, "0x" + "00" * 32)
+    assert tx._tx_receipt is None
+    assert tx.get_status() == "pending"
+
+    tx_hash = web3.eth.send_transaction({"from": web3.eth.accounts[0], "to": web3.eth.accounts[1], "value": 1})
+    assert Transaction(web3, tx_hash.hex()).get_status() == "success"
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("multicall", [False, True])
+async def test_bulk_reads_report_partial_failures(provider, multicall):
+    """Test bulk reads return every item in order, with failures in place."""
+    web3 = provider.web3
+    accounts = await web3.eth.accounts
+    multicall_address = (await deploy(web3, "Multicall3"))[0] if multicall else None
+    reader = BulkReader(web3, provider=provider, multicall_address=multicall_address, chunk_size=2)
+    registry = await deploy_registry(web3, reader=reader)
+    for i in range(3):
+        await registry.register_content_async(f"{i:064x}", accounts[i], f"metadata {i}")
+
+    # Longer than the contract's String[64], so that call reverts
+    hashes = [f"{i:064x}" for i in range(4)] + ["f" * 65]
+    owners = await registry.get_content_owner_bulk_async(hashes)
+    assert [owner.get("result") for owner in owners[:4]] == accounts[:3] + ["0x" + "00" * 20]
+    assert not owners[4]["success"] and owners[4]["error"]
+
+    verified = await registry.verify_ownership_bulk_async(hashes[:3], accounts[1])
+    assert [item["result"] for item in verified] == [False, True, False]
+    metadata = await registry.get_content_metadata_bulk_async(hashes[:2])
+    assert [item["result"] for item in metadata] == ["metadata 0", "metadata 1"]
+
+    # The tester runs calls from accounts[0] and charges it for gas inside them
+    balances = await Wallet(web3, reader=reader).get_balance_bulk_async(accounts[1:4])
+    assert [item["result"] for item in balances] == [await web3.eth.get_balance(a) for a in accounts[1:4]]
+
+    stats = reader.stats()
+    assert stats["items"] == 5 + 3 + 2 + 3
+    # One aggregate3 call per chunk of two instead of one call per item
+    assert stats["calls"] == (3 + 2 + 1 + 2 if multicall else stats["items"])
+    # The tester has no HTTP session to batch over, so every call is a request
+    assert stats["rpc_calls"] == stats["calls"]
+
+@pytest.mark.asyncio
+async def test_read_cache_invalidates_on_contract_events(provider):
+    """Test cached reads are served until an event for their hash is mined."""
+    web3 = provider.web3
+    accounts = await web3.eth.accounts
+    # Writes through a registry without the cache, as another server would
+    writer = await deploy_registry(web3)
+    cache = ContentReadCache(web3, writer.contract.address, writer.contract.abi)
+    registry = ContentRegistry(web3, writer.contract.address, writer.contract.abi, cache=cache)
+    content_hash = "ab" * 32
+    await writer.register_content_async(content_hash, accounts[0], "metadata")
+
+    # Nothing is stored until the head is known
+    assert await registry.get_content_owner_async(content_hash) == accounts[0]
+    assert cache.stats()["size"] == 0
+    await cache.refresh()
+
+    for _ in range(3):
+        assert await registry.get_content_owner_async(content_hash) == accounts[0]
+        assert await registry.verify_ownership_async(content_hash, accounts[0])
+    stats = cache.stats()
+    assert (stats["hits"], stats["size"]) == (4, 2)
+
+    tx_hash = await writer.transfer_ownership_async(content_hash, accounts[0], accounts[1])
+    await web3.eth.wait_for_transaction_receipt(tx_hash)
+    # Still the cached owner until the new block's events are read
+    assert await registry.get_content_owner_async(content_hash) == accounts[0]
+    await cache.refresh()
+    assert cache.stats()["invalidations"] == 2
+    assert await registry.get_content_owner_async(content_hash) == accounts[1]
+    assert not await registry.verify_ownership_async(content_hash, accounts[0])
+
+    # Bulk reads only fetch the misses
+    reader = BulkReader(web3, provider=provider)
+    registry.reader = reader
+    owners = await registry.get_content_owner_bulk_async([content_hash, "cd" * 32])
+    assert [owner["result"] for owner in owners] == [accounts[1], "0x" + "00" * 20]
+    assert reader.stats()["items"] == 1
+
+@pytest.mark.asyncio
+async def test_read_cache_expires_by_block_age(provider):
+    """Test cached reads expire, are evicted and are dropped on local writes."""
+    web3 = provider.web3
+    accounts = await web3.eth.accounts
+    address, abi = await deploy(web3, "ContentRegistry")
+    cache = ContentReadCache(web3, address, abi, max_entries=2, max_block_age=2)
+    registry = ContentRegistry(web3, address, abi, cache=cache)
+    await cache.refresh()
+
+    for i in range(3):
+        await registry.get_content_metadata_async(f"{i:064x}")
+    assert cache.stats()["evictions"] == 1
+
+    await registry.get_content_metadata_async(f"{2:064x}")
+    web3.provider.ethereum_tester.mine_blocks(2)
+    await cache.refresh()
+    await registry.get_content_metadata_async(f"{2:064x}")
+    stats = cache.stats()
+    assert (stats["hits"], stats["expirations"]) == (1, 1)
+
+    # A transaction sent through the cached registry drops the hash at once
+    await registry.get_content_owner_async(f"{2:064x}")
+    tx_hash = await registry.register_content_async(f"{2:064x}", accounts[0], "metadata")
+    assert cache.stats()["size"] == 0
+    await web3.eth.wait_for_transaction_receipt(tx_hash)
+    assert await registry.get_content_metadata_async(f"{2:064x}") == "metadata"
+
+    await cache.stop()
+    assert not cache.synced
+
+@pytest.mark.asyncio
+async def test_read_cache_forgets_topics_of_dropped_hashes(provider):
+    """Test the topic index of an indexed hash shrinks with the cache."""
+    web3 = provider.web3
+    address, abi = await deploy(web3, "ContentRegistry")
+    abi = json.loads(json.dumps(abi))
+    for item in abi:
+        for arg in item.get("inputs", []) if item.get("type") == "event" else []:
+            if arg.get("name") == "contentHash":
+                arg["indexed"] = True
+    cache = ContentReadCache(web3, address, abi, max_entries=2)
+    await cache.refresh()
+
+    for i in range(10):
+        cache.put("getContentMetadata", [f"{i:064x}"], "metadata", cache.begin())
+    assert len(cache._hashes_by_topic) == 2
+
+    cache.invalidate(f"{9:064x}")
+    assert list(cache._hashes_by_topic.values()) == [f"{8:064x}"]
+
+@pytest.mark.asyncio
+async def test_event_indexer_resumes_and_rolls_back_reorgs(provider, tmp_path):
+    """Test the indexer answers ownership queries and follows reorgs."""
+    web3 = provider.web3
+    tester = web3.provider.ethereum_tester
+    accounts = await web3.eth.accounts
+    registry = await deploy_registry(web3)
+    for i in range(3):
+        await registry.register_content_async(f"{i:064x}", accounts[0], f"metadata {i}")
+    tx_hash = await registry.transfer_ownership_async(f"{1:064x}", accounts[0], accounts[1])
+    await web3.eth.wait_for_transaction_receipt(tx_hash)
+
+    store = EventStore(tmp_path / "events.db")
+    indexer = EventIndexer(web3, registry.contract.address, registry.contract.abi, store, chunk_size=2)
+    assert await indexer.sync() == 4
+    assert [e["content_hash"] for e in indexer.owned_by(accounts[0].lower())] == [f"{i:064x}" for i in (0, 2)]
+    history = indexer.history(f"{1:064x}")
+    assert [(e["event"], e["owner"], e["previous_owner"]) for e in history] == [
+        ("ContentRegistered", accounts[0], None),
+        ("OwnershipTransferred", accounts[1], accounts[0])
+    ]
+    assert history[0]["metadata"] == "metadata 1"
+    store.close()
+
+    # A new indexer on the same file resumes after the synced block
+    store = EventStore(tmp_path / "events.db")
+    indexer = EventIndexer(web3, registry.contract.address, registry.contract.abi, store, reorg_depth=4)
+    assert await indexer.sync() == 0
+    assert indexer.stats()["ranges"] == 0
+
+    snapshot = tester.take_snapshot()
+    tx_hash = await registry.transfer_ownership_async(f"{2:064x}", accounts[0], accounts[2])
+    await web3.eth.wait_for_transaction_receipt(tx_hash)
+    tester.mine_blocks(2)
+    assert await indexer.sync() == 1
+    assert [e["content_hash"] for e in indexer.owned_by(accounts[2])] == [f"{2:064x}"]
+
+    # Replace those blocks with a chain where the transfer went elsewhere
+    tester.revert_to_snapshot(snapshot)
+    tx_hash = await registry.transfer_ownership_async(f"{2:064x}", accounts[0], accounts[3])
+    await web3.eth.wait_for_transaction_receipt(tx_hash)
+    tester.mine_blocks(3)
+    assert await indexer.sync() == 1
+    assert indexer.owned_by(accounts[2]) == []
+    assert [e["content_hash"] for e in indexer.owned_by(accounts[3])] == [f"{2:064x}"]
+    stats = indexer.stats()
+    assert (stats["reorgs"], stats["rolled_back"], stats["events"]) == (1, 1, 5)
+    assert stats["synced_block"] == await web3.eth.block_number
+    store.close()
+
+@pytest.mark.parametrize("size", [1, 2, 5, 8, 13])
+def test_merkle_proofs_verify_every_leaf(size):
+    """Test every leaf's proof leads to the root and other hashes' don't."""
+    hashes = [f"{i:064x}" for i in range(size)]
+    root, proofs = build_merkle_tree(hashes)
+    for content_hash, proof in zip(hashes, proofs):
+        assert verify_merkle_proof(content_hash, proof, root)
+        assert not verify_merkle_proof("f" * 64, proof, root)
+    assert max(len(proof) for proof in proofs) == (size - 1).bit_length()
+
+@pytest.mark.asyncio
+async def test_anchor_registers_one_root_per_batch(provider):
+    """Test queued hashes are anchored in batches and their proofs verify on chain."""
+    web3 = provider.web3
+    accounts = await web3.eth.accounts
+    registry = await deploy_registry(web3)
+    store = AnchorStore(":memory:")
+    anchor = ContentAnchor(registry, store, accounts[0], batch_size=3)
+    hashes = [f"{i:064x}" for i in range(7)]
+    assert anchor.add(hashes) == 7
+
+    batches = await anchor.flush()
+    assert [batch["size"] for batch in batches] == [3, 3, 1]
+    for batch in batches:
+        await web3.eth.wait_for_transaction_receipt(batch["tx_hash"])
+    stats = anchor.stats()
+    assert (stats["batches"], stats["anchored"], stats["queued"], stats["transactions"]) == (3, 7, 0, 3)
+
+    (record,) = anchor.proofs(hashes[4])
+    assert (record["root"], record["leaf_index"]) == (batches[1]["root"], 1)
+    result = await anchor.verify(hashes[4], record["proof"], record["root"])
+    assert (result["valid"], result["anchored"], result["owner"]) == (True, True, accounts[0])
+    assert not (await anchor.verify(hashes[0], record["proof"], record["root"]))["valid"]
+    unanchored = await anchor.verify(hashes[4], record["proof"], "ab" * 32)
+    assert (unanchored["valid"], unanchored["anchored"]) == (False, False)
+
+    # A batch left unsent by a stopped process is queued again on start
+    anchor.add(["aa" * 32])
+    store.create_batch("bb" * 32, [(item_id, []) for item_id, _ in store.queued(10)])
+    assert anchor.stats()["queued"] == 0
+    await anchor.start()
+    assert anchor.stats()["queued"] == 1
+    await anchor.stop()
+    store.close()
+
+@pytest.mark.asyncio
+async def test_provider_sends_json_rpc_batches():
+    """Test batches are chunked and failures stay with their calls."""
+    from aiohttp import web
+
+    batch_sizes = []
+
+    async def node(request):
+        calls = await request.json()
+        batch_sizes.append(len(calls))
+        if any(call["params"] == ["down"] for call in calls):
+            return web.Response(status=500)
+        return web.json_response([
+            {"jsonrpc": "2.0", "id": call["id"], "error": {"code": 3, "message": "execution reverted"}}
+            if call["params"] == ["revert"] else
+            {"jsonrpc": "2.0", "id": call["id"], "result": hex(len(call["params"][0]))}
+            for call in reversed(calls)
+        ])
+
+    app = web.Application()
+    app.router.add_post("/", node)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    provider = Web3Provider(f"http://127.0.0.1:{port}/", batch_size=2)
+    await provider.connect()
+    try:
+        results = await provider.batch([
+            ("eth_call", ["a"]), ("eth_call", ["revert"]), ("eth_call", ["abc"]),
+            ("eth_call", ["abcd"]), ("eth_call", ["down"])
+        ])
+    finally:
+        await provider.close()
+        await runner.cleanup()
+
+    assert batch_sizes == [2, 2, 1]
+    assert results[0] == "0x1" and results[2] == "0x3" and results[3] == "0x4"
+    assert isinstance(results[1], RPCError) and "reverted" in str(results[1])
+    # The whole batch holding this call failed
+    assert isinstance(results[4], Exception)
+    assert provider.stats()["batches"] == 3
+
+@pytest.mark.asyncio
+async def test_signer_unlocks_once_and_signs_in_bulk(provider, tmp_path):
+    """Test a keystore is decrypted once and batches are signed off the loop."""
+    from eth_account import Account
+
+    web3 = provider.web3
+    wallet = await funded_wallet(web3)
+    keyfile = tmp_path / "key.json"
+    keyfile.write_text(json.dumps(Account.encrypt(wallet.account.key, "secret", kdf="pbkdf2", iterations=2)))
+
+    signer = Signer(workers=2, chunk_size=2)
+    keys = await asyncio.gather(*(signer.unlock(str(keyfile), "secret") for _ in range(3)))
+    assert all(key == bytes(wallet.account.key) for key in keys)
+    with pytest.raises(ValueError):
+        await signer.unlock(str(keyfile), "wrong")
+    unlocked = await Wallet.from_keyfile_async(web3, str(keyfile), "secret", signer)
+    assert unlocked.account.address == wallet.account.address
+    assert (signer.stats()["unlocks"], signer.stats()["unlock_cache_hits"]) == (1, 3)
+
+    signatures = await unlocked.sign_messages_async(["a", "b", "c"])
+    assert all(wallet.verify_signature(m, s["result"]) for m, s in zip("abc", signatures))
+    assert not wallet.verify_signature("b", signatures[0]["result"])
+
+    accounts = await web3.eth.accounts
+    nonce = await web3.eth.get_transaction_count(wallet.account.address)
+    txs = [
+        {"to": accounts[1], "value": 1, "nonce": nonce + i, "gas": 21000,
+         "gasPrice": await web3.eth.gas_price, "chainId": await web3.eth.chain_id}
+        for i in range(3)
+    ] + [{"to": "not an address"}]
+    signed = await signer.sign_transactions(txs, keys[0])
+    assert [item["success"] for item in signed] == [True, True, True, False]
+    for item in signed[:3]:
+        tx_hash = await web3.eth.send_raw_transaction(item["result"].raw_transaction)
+        assert (await web3.eth.wait_for_transaction_receipt(tx_hash))["status"] == 1
+
+    stats = signer.stats()
+    assert (stats["signed_transactions"], stats["signed_messages"], stats["failures"]) == (3, 3, 1)
+    await signer.close()
+    assert signer.stats()["unlocked_keys"] == 0
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["thread", "process"])
+async def test_verifier_checks_batches_and_caches_signers(kind):
+    """Test bulk verification keeps order, reports bad items and reuses recoveries."""
+    wallet, other = Wallet(None), Wallet(None)
+    messages = [f"message {i}" for i in range(5)]
+    signatures = [wallet.sign_message(message) for message in messages]
+    items = [(message, signature, wallet.account.address) for message, signature in zip(messages, signatures)]
+    items += [
+        (messages[0], signatures[0], wallet.account.address),
+        (messages[1], signatures[1], other.account.address),
+        (messages[2], {"r": 1}, wallet.account.address)
+    ]
+
+    verifier = SignatureVerifier(kind=kind, workers=2, chunk_size=2)
+    await verifier.start()
+    if kind == "process":
+        assert verifier._pool._mp_context.get_start_method() == "spawn"
+    results = await verifier.verify_batch(items)
+    assert [item.get("result") for item in results] == [True] * 6 + [False, None]
+    assert results[6]["signer"] == wallet.account.address
+    assert not results[7]["success"] and results[7]["error"]
+    # Repeated pairs were recovered once
+    assert verifier.stats()["recoveries"] == 5
+
+    wallet.verifier = verifier
+    assert [item["result"] for item in await wallet.verify_signatures_async(messages, signatures)] == [True] * 5
+    stats = verifier.stats()
+    assert (stats["recoveries"], stats["cache_hits"], stats["invalid"], stats["failures"]) == (5, 5, 1, 1)
+    await verifier.close()
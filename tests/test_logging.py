@@ -0,0 +1,79 @@
+"""
+Tests for the logging pipeline.
+"""
+
+import json
+import logging
+import queue
+
+from skyrun.core.logging import (
+    DroppingQueueHandler,
+    parse_size,
+    request_id_var,
+    setup_logging,
+    stop_logging
+)
+
+def test_parse_size():
+    """Test configured sizes are read as bytes."""
+    assert parse_size("100MB") == 100 * 1024 ** 2
+    assert parse_size("1.5 kb") == 1536
+    assert parse_size(42) == 42
+
+def test_queue_handler_drops_and_reports_when_full():
+    """Test a full queue drops records without blocking and reports the count later."""
+    log_queue = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(log_queue)
+    logger = logging.getLogger("skyrun.test.drops")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(5):
+            logger.warning("record %d", i)
+        assert handler.dropped == 3
+
+        log_queue.get_nowait()
+        log_queue.get_nowait()
+        logger.warning("after")
+        messages = [log_queue.get_nowait().getMessage() for _ in range(2)]
+        assert messages == ["Dropped 3 log records while the logging queue was full", "after"]
+    finally:
+        logger.removeHandler(handler)
+
+def test_json_records_rotate_off_thread(tmp_path):
+    """Test records are written as JSON lines with their request ID and the file rotates."""
+    log_file = tmp_path / "skyrun.log"
+    setup_logging(log_file=log_file, max_bytes=2000, backup_count=2, json_format=True)
+
+    logger = logging.getLogger("skyrun.test.json")
+    token = request_id_var.set("req-1")
+    try:
+        for i in range(100):
+            logger.info("line %d", i)
+    finally:
+        request_id_var.reset(token)
+        stop_logging()
+
+    record = json.loads(log_file.read_text().splitlines()[-1])
+    assert record["message"] == "line 99"
+    assert record["request_id"] == "req-1"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["skyrun.log", "skyrun.log.1", "skyrun.log.2"]
+
+def test_json_records_keep_exceptions(tmp_path):
+    """Test tracebacks are written to their own JSON field by the listener."""
+    log_file = tmp_path / "skyrun.log"
+    setup_logging(log_file=log_file, json_format=True)
+
+    logger = logging.getLogger("skyrun.test.exceptions")
+    try:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed %s", "job")
+    finally:
+        stop_logging()
+
+    record = json.loads(log_file.read_text().splitlines()[-1])
+    assert record["message"] == "failed job"
+    assert record["level"] == "ERROR"
+    assert "ValueError: boom" in record["exc_info"]
@@ -0,0 +1,41 @@
+"""
+Tests for the pipeline metrics.
+"""
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+from prometheus_client import REGISTRY
+
+from skyrun.core.metrics import observe_rpc, timed, track_queue
+
+def sample(name, **labels):
+    """Current value of a sample in the default registry."""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+def test_timed_records_durations_and_errors():
+    """Test stage timings are observed and failures counted."""
+    labels = {"component": "test", "stage": "timed"}
+    with timed("test", "timed"):
+        pass
+    with pytest.raises(ValueError):
+        with timed("test", "timed"):
+            raise ValueError("boom")
+
+    assert sample("skyrun_stage_seconds_count", **labels) == 2
+    assert sample("skyrun_stage_errors_total", **labels) == 1
+
+def test_rpc_and_queue_metrics():
+    """Test RPC calls are labelled by method and queue depths are read on scrape."""
+    before = sample("skyrun_rpc_errors_total", method="eth_test")
+    observe_rpc("eth_test", 0.01)
+    observe_rpc("eth_test", 0.02, failed=True)
+    assert sample("skyrun_rpc_seconds_count", method="eth_test") == 2
+    assert sample("skyrun_rpc_errors_total", method="eth_test") == before + 1
+
+    queue = [1, 2, 3]
+    track_queue("test", lambda: len(queue))
+    assert sample("skyrun_queue_depth", queue="test") == 3
+    queue.pop()
+    assert sample("skyrun_queue_depth", queue="test") == 2